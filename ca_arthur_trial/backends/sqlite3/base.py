@@ -0,0 +1,60 @@
+"""
+SQLite backend tuned for a concurrently used web application database.
+
+Two extra keys of `DATABASES[...]['OPTIONS']` are understood on top of the
+stock `django.db.backends.sqlite3` ones:
+
+* `pragmas`: mapping of PRAGMA names to values applied to every new
+  connection, e.g. `{'journal_mode': 'WAL', 'synchronous': 'NORMAL'}`;
+* `transaction_mode`: `DEFERRED` (SQLite's default), `IMMEDIATE` or
+  `EXCLUSIVE`. `IMMEDIATE` takes the write lock when a transaction starts,
+  so concurrent writers wait for it through `busy_timeout` instead of
+  failing with "database is locked" when upgrading a read lock.
+
+Connections are reused across requests with the regular `CONN_MAX_AGE`
+setting.
+"""
+import re
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+PRAGMA_NAME_RE = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE_RE = re.compile(r'^-?[A-Za-z0-9_]+$')
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        # Not arguments of sqlite3.connect(), they are applied separately.
+        kwargs.pop('pragmas', None)
+        kwargs.pop('transaction_mode', None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.get_pragmas().items():
+            conn.execute('PRAGMA %s = %s' % (name, value))
+        return conn
+
+    def get_pragmas(self):
+        pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for name, value in pragmas.items():
+            if not PRAGMA_NAME_RE.match(name) or not PRAGMA_VALUE_RE.match(str(value)):
+                raise ImproperlyConfigured(
+                    'Invalid SQLite pragma %s = %r.' % (name, value)
+                )
+        return pragmas
+
+    def get_transaction_mode(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode', 'DEFERRED')
+        if mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                'Invalid SQLite transaction_mode %r, expected one of %s.'
+                % (mode, ', '.join(TRANSACTION_MODES))
+            )
+        return mode.upper()
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN %s' % self.get_transaction_mode())
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/3.0/ref/settings/
 
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -45,7 +46,25 @@ INSTALLED_APPS = [
     'evaluation'
 ]
 
+# Optional components that API workers may do without, to start faster:
+# the Swagger UI and OpenAPI schema under /api/docs/, and the admin site.
+# With the docs enabled, the drf_yasg package is loaded on startup as an
+# installed app, for its templates and static files, but its schema
+# generator and views are only imported when the docs are first requested
+# (see evaluation.schema_annotations). The admin registers every ModelAdmin
+# on startup.
+REVIEWS_DOCS_ENABLED = os.environ.get('REVIEWS_DOCS_ENABLED', '1') == '1'
+REVIEWS_ADMIN_ENABLED = os.environ.get('REVIEWS_ADMIN_ENABLED', '1') == '1'
+
+if not REVIEWS_DOCS_ENABLED:
+    INSTALLED_APPS.remove('drf_yasg')
+if not REVIEWS_ADMIN_ENABLED:
+    INSTALLED_APPS.remove('django.contrib.admin')
+
 MIDDLEWARE = [
+    'evaluation.middleware.MetricsMiddleware',
+    'evaluation.middleware.ServerTimingMiddleware',
+    'evaluation.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -80,10 +99,27 @@ WSGI_APPLICATION = 'ca_arthur_trial.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
 
+# The project backend extends django.db.backends.sqlite3 with per-connection
+# pragmas and a configurable transaction mode, see
+# ca_arthur_trial/backends/sqlite3/base.py. WAL lets readers proceed while a
+# write is in progress, and IMMEDIATE transactions make writers queue on
+# busy_timeout instead of failing with "database is locked".
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'ca_arthur_trial.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'cache_size': -65536,
+                'mmap_size': 268435456,
+                'busy_timeout': 5000,
+                'temp_store': 'MEMORY',
+            },
+        },
     }
 }
 
@@ -109,16 +145,206 @@ AUTH_PASSWORD_VALIDATORS = [
 # Django REST Framework configuration variables
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'evaluation.authentication.CachedJWTAuthentication',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'evaluation.pagination.ReviewCursorPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'evaluation.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'evaluation.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'PAGE_SIZE': 50,
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
 }
 
+# MessagePack (application/msgpack) requests and responses, offered when the
+# optional msgpack package is installed. JSON stays the default.
+if find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].insert(
+        1, 'evaluation.renderers.MessagePackRenderer'
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].insert(
+        1, 'evaluation.parsers.MessagePackParser'
+    )
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60)
 }
 
+# Process-local cache of the users resolved by CachedJWTAuthentication.
+# TTL (seconds) bounds how long other worker processes may keep serving a
+# user that was changed or deactivated. Set ENABLED to False, or use
+# rest_framework_simplejwt's JWTAuthentication, to query auth_user on
+# every request instead.
+REVIEWS_AUTH_USER_CACHE = {
+    'ENABLED': True,
+    'MAX_SIZE': 10000,
+    'TTL': 60,
+}
+
+# Process-local LRU of companies by name, used to resolve the company of new
+# reviews without a query.
+REVIEWS_COMPANY_CACHE = {
+    'MAX_SIZE': 10000,
+}
+
+# Maximum number of items accepted by POST /api/reviews/bulk/ and the number
+# of rows written per INSERT when they are stored.
+REVIEWS_BULK_MAX_ITEMS = 1000
+REVIEWS_BULK_BATCH_SIZE = 100
+
+# A review with the same normalized title, summary and company as one its
+# author stored in the last WINDOW seconds is a duplicate. POLICY 'reject'
+# answers it with 409 Conflict, 'collapse' with the stored review and 200.
+# A WINDOW of 0 disables the check.
+REVIEWS_DUPLICATES = {
+    'WINDOW': 24 * 60 * 60,
+    'POLICY': 'reject',
+}
+
+# Review summaries of at least MIN_SIZE bytes are stored zlib-compressed at
+# LEVEL, and decompressed when first read; see `manage.py
+# bench_summary_storage` for the trade-off. With ENABLED False new summaries
+# are stored uncompressed. Both forms are always readable.
+REVIEWS_SUMMARY_COMPRESSION = {
+    'ENABLED': True,
+    'LEVEL': 6,
+    'MIN_SIZE': 128,
+}
+
+# `manage.py archive_reviews` moves the reviews dated more than AGE_DAYS ago
+# to the archive table, BATCH_SIZE per transaction. GET /api/reviews/<id>/
+# and the export still find archived reviews; the list and search do not.
+REVIEWS_ARCHIVE = {
+    'AGE_DAYS': 365,
+    'BATCH_SIZE': 500,
+}
+
+# Number of rows fetched from the database per round trip while streaming
+# GET /api/reviews/export/.
+REVIEWS_EXPORT_CHUNK_SIZE = 2000
+
+# Cache used for review reads, and how long a user's serialized list pages
+# are kept in it. 0 disables the list cache; ETag/Last-Modified validation
+# of review reads is always on.
+REVIEWS_CACHE_ALIAS = 'default'
+REVIEWS_LIST_CACHE_TIMEOUT = 0
+
+# Asynchronous ingestion of POST /api/reviews/. When enabled, validated
+# reviews are appended to a spool file in SPOOL_DIR and answered with 202
+# and a ticket; `manage.py process_review_queue` stores them BATCH_SIZE per
+# transaction. FSYNC makes every accepted review durable before answering.
+REVIEWS_INGEST = {
+    'ENABLED': False,
+    'SPOOL_DIR': os.path.join(BASE_DIR, 'spool'),
+    'FSYNC': True,
+    'BATCH_SIZE': 500,
+}
+
+# Token-bucket throttling of review creation, review reads and the token
+# endpoints, per user (per posted username on login/) and per client IP.
+# Each bucket holds BURST requests and refills at RATE (per s, min, hour or
+# day). Buckets live in the CACHE_ALIAS cache: a local-memory cache throttles
+# every worker process separately, a shared cache all of them together.
+# Throttled requests get 429 with a Retry-After header. The IP buckets are
+# keyed on REMOTE_ADDR; behind NUM_PROXIES trusted reverse proxies, on the
+# X-Forwarded-For entry added by the outermost one instead.
+REVIEWS_THROTTLES = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'default',
+    'NUM_PROXIES': 0,
+    'SCOPES': {
+        'reviews_create': {
+            'user': {'RATE': '60/min', 'BURST': 30},
+            'ip': {'RATE': '120/min', 'BURST': 60},
+        },
+        'reviews_list': {
+            'user': {'RATE': '600/min', 'BURST': 100},
+            'ip': {'RATE': '1200/min', 'BURST': 200},
+        },
+        'token': {
+            'user': {'RATE': '10/min', 'BURST': 5},
+            'ip': {'RATE': '60/min', 'BURST': 20},
+        },
+    },
+}
+
+# Per-request timing breakdown (total, view, auth, db, serialize, render and
+# query count) of a SAMPLE_RATE fraction of the requests. HEADER adds it to
+# the response as a Server-Timing header, LOG writes it as a JSON line to the
+# `evaluation.timing` logger.
+REVIEWS_SERVER_TIMING = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 1.0,
+    'HEADER': True,
+    'LOG': True,
+}
+
+# gzip compression of the responses of clients sending Accept-Encoding: gzip.
+# Only responses of one of CONTENT_TYPES (prefixes of the media type) and of
+# at least MIN_SIZE bytes are compressed, at zlib LEVEL 1 (fastest) to 9
+# (smallest); level 3 saves nearly as much as 6 on review payloads for a
+# third of the CPU time (`manage.py bench_compression`). Streaming responses
+# are compressed as they are written. HTML pages, such as the admin and the
+# browsable API, are left out: they carry CSRF tokens, which compressing
+# next to reflected input exposes to BREACH. Responses using a CSRF token
+# are never compressed, whatever their type.
+REVIEWS_COMPRESSION = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,
+    'LEVEL': 3,
+    'CONTENT_TYPES': (
+        'application/json', 'application/x-ndjson', 'text/csv',
+    ),
+}
+
+# Prometheus metrics served at /metrics to logged-in staff users and to
+# requests sending `Authorization: Bearer <TOKEN>` (Prometheus' bearer_token);
+# anyone else gets 403. Under a multi-process WSGI server, set
+# MULTIPROCESS_DIR to a directory shared by the workers so /metrics reports
+# all of them; empty it before starting the server.
+REVIEWS_METRICS = {
+    'ENABLED': True,
+    'TOKEN': os.environ.get('REVIEWS_METRICS_TOKEN'),
+    'MULTIPROCESS_DIR': os.environ.get('REVIEWS_METRICS_DIR'),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'evaluation.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# OpenAPI schema served at /api/docs/openapi.json and shown by /api/docs/.
+# With PRECOMPUTED, it is read from FILE (written by `manage.py
+# generate_schema`) or generated on the first request of each process, and
+# clients may cache it for MAX_AGE seconds. It is regenerated when VERSION,
+# by default a hash of the sources, changes. Without PRECOMPUTED it is
+# generated on every request.
+REVIEWS_API_SCHEMA = {
+    'PRECOMPUTED': True,
+    'FILE': os.path.join(BASE_DIR, 'openapi.json'),
+    'VERSION': os.environ.get('REVIEWS_CODE_VERSION'),
+    'MAX_AGE': 86400,
+}
+
 SWAGGER_SETTINGS = {
+   'SPEC_URL': 'evaluation:schema-json',
    'SECURITY_DEFINITIONS': {
       'Bearer': {
             'type': 'apiKey',
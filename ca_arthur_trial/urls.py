@@ -13,10 +13,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.conf import settings
 from django.urls import include, path
+from evaluation.views import metrics_view
 
 urlpatterns = [
     path('api/', include('evaluation.urls')),
-    path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
 ]
+
+if settings.REVIEWS_ADMIN_ENABLED:
+    from django.contrib import admin
+
+    urlpatterns.append(path('admin/', admin.site.urls))
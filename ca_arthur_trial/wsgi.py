@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ca_arthur_trial.settings')
 
 application = get_wsgi_application()
+
+from evaluation import metrics  # noqa: E402
+
+metrics.register_worker()
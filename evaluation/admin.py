@@ -1,5 +1,208 @@
-from django.contrib import admin
-from evaluation.models import Review
+"""
+Admin of the reviews, usable on tables of millions of rows.
 
+The stock changelist counts every row twice, lists every distinct value of
+its filters and searches with `icontains` scans. `ReviewAdmin` instead
+filters on indexed columns, estimates large counts, searches the full-text
+index of `evaluation.search` and deletes in batches. Reviews are saved and
+deleted through `evaluation.services`, which keeps the rating summaries and
+cached list pages up to date.
+"""
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.utils import model_ngettext
+from django.core.paginator import Paginator
+from django.db import connections
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+from evaluation import services
+from evaluation.models import Company, CompanyRatingSummary, Review
+from evaluation.search import search_reviews
 
-admin.site.register(Review)
+
+def estimated_row_count(model, using):
+    """
+    Number of rows of `model`'s table according to the database statistics
+    (`ANALYZE`), or None if there are none.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(table)]
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute(
+                'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                [table]
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    try:
+        count = int(float(str(row[0]).split()[0]))
+    except (IndexError, ValueError):
+        return None
+    return count if count > 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator counting at most `exact_count_limit` rows. Beyond that, an
+    unfiltered list reports the table's estimated row count, and a filtered
+    one reports `exact_count_limit + 1`, so no page costs a full count.
+    """
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        count = queryset.order_by()[:self.exact_count_limit + 1].count()
+        if count <= self.exact_count_limit or queryset.query.has_filters():
+            return count
+        estimate = estimated_row_count(queryset.model, queryset.db)
+        return max(estimate or 0, count)
+
+
+class CompanyListFilter(admin.SimpleListFilter):
+    """
+    The companies with the most reviews, read from their rating summaries,
+    instead of every company. Any other one is selected with
+    `?company=<id>`, e.g. from a link.
+    """
+    title = 'company'
+    parameter_name = 'company'
+    limit = 20
+
+    def lookups(self, request, model_admin):
+        companies = [
+            (summary.company_id, summary.company)
+            for summary in CompanyRatingSummary.objects.select_related(
+                'company'
+            ).order_by('-count')[:self.limit]
+        ]
+        value = self.value()
+        if value and value.isdigit() and int(value) not in dict(companies):
+            companies.extend(Company.objects.filter(
+                pk=value
+            ).values_list('pk', 'name'))
+        return [(str(pk), str(name)) for pk, name in companies]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(company_id=self.value())
+        return queryset
+
+
+class RatingListFilter(admin.SimpleListFilter):
+    """The 1 to 5 stars ratings, without a DISTINCT scan of the table."""
+    title = 'rating'
+    parameter_name = 'rating'
+
+    def lookups(self, request, model_admin):
+        return [(str(rating), str(rating)) for rating in range(1, 6)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(rating=self.value())
+        return queryset
+
+
+@admin.register(Company)
+class CompanyAdmin(admin.ModelAdmin):
+    list_display = ('name',)
+    # Prefix search, which can use the index of the unique name.
+    search_fields = ('^name',)
+    ordering = ('name',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ('title', 'user', 'company', 'rating', 'date')
+    list_select_related = ('user', 'company')
+    # Each filter is served by an index ending with the date.
+    list_filter = (CompanyListFilter, RatingListFilter, 'date')
+    ordering = ('-date', '-id')
+    # Replaced by the full-text search of `get_search_results`.
+    search_fields = ('title',)
+    raw_id_fields = ('user', 'company')
+    readonly_fields = ('date',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['delete_selected_reviews']
+    delete_batch_size = 500
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # Replaced by delete_selected_reviews.
+        actions.pop('delete_selected', None)
+        return actions
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_reviews(queryset, search_term), False
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            services.update_review(obj)
+        else:
+            services.create_reviews([obj])
+
+    def delete_model(self, request, obj):
+        services.delete_reviews(Review.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        services.delete_reviews(queryset, batch_size=self.delete_batch_size)
+
+    def delete_selected_reviews(self, request, queryset):
+        """
+        Django's `delete_selected`, without listing and logging every
+        review: the confirmation page only counts them, and they are
+        deleted in batches by `services.delete_reviews`.
+        """
+        if request.POST.get('post'):
+            deleted = services.delete_reviews(
+                queryset, batch_size=self.delete_batch_size
+            )
+            self.message_user(
+                request, 'Successfully deleted %d %s.' % (
+                    deleted, model_ngettext(self.opts, deleted)
+                ), messages.SUCCESS
+            )
+            return None
+
+        count = queryset.count()
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Are you sure?',
+            'opts': self.opts,
+            'count': count,
+            'objects_name': model_ngettext(self.opts, count),
+            'preview': queryset[:10],
+            'select_across': request.POST.get('select_across', '0'),
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+            'media': self.media,
+        }
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request,
+            'admin/evaluation/review/delete_selected_confirmation.html',
+            context
+        )
+
+    delete_selected_reviews.allowed_permissions = ('delete',)
+    delete_selected_reviews.short_description = 'Delete selected reviews'
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class EvaluationConfig(AppConfig):
     name = 'evaluation'
+
+    def ready(self):
+        from evaluation import signals  # noqa: F401
@@ -0,0 +1,62 @@
+"""
+Archival of old reviews.
+
+Reads mostly touch recent reviews, so reviews dated more than
+`REVIEWS_ARCHIVE['AGE_DAYS']` ago are moved from `evaluation_review` to
+`evaluation_archivedreview` by `manage.py archive_reviews`. That keeps the
+live table, its indexes and the full-text search index small.
+
+Archived reviews keep their ids. `retrieve` and `export` fall back to the
+archive, while `list` and search only cover live reviews. Company rating
+summaries keep counting archived reviews.
+"""
+import datetime
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from evaluation import caching
+from evaluation.models import ArchivedReview, Review
+
+# Columns copied to the archive, by attribute name (e.g. `user_id`).
+ARCHIVED_FIELDS = tuple(
+    field.attname for field in Review._meta.concrete_fields
+)
+
+
+def archive_cutoff(age_days=None):
+    """The date before which reviews are archived."""
+    if age_days is None:
+        age_days = settings.REVIEWS_ARCHIVE['AGE_DAYS']
+    return timezone.now() - datetime.timedelta(days=age_days)
+
+
+def archive_reviews(cutoff, batch_size=None):
+    """
+    Move the reviews dated before `cutoff` to the archive, oldest first and
+    `batch_size` per transaction, so writers are never blocked for long.
+    Return how many were moved.
+    """
+    batch_size = batch_size or settings.REVIEWS_ARCHIVE['BATCH_SIZE']
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Review.objects.filter(date__lt=cutoff).order_by(
+                    'date', 'id'
+                ).values(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            ArchivedReview.objects.bulk_create(
+                [ArchivedReview(**row) for row in rows]
+            )
+            Review.objects.filter(
+                id__in=[row['id'] for row in rows]
+            ).only('id').delete()
+            transaction.on_commit(partial(
+                caching.invalidate_user_reviews,
+                {row['user_id'] for row in rows}
+            ))
+        moved += len(rows)
+    return moved
@@ -0,0 +1,87 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from evaluation import timing
+
+
+class UserCache:
+    """
+    Process-local LRU of authenticated users keyed by their token user id.
+
+    Size and entry lifetime come from `REVIEWS_AUTH_USER_CACHE`. Entries are
+    dropped by the `User` save/delete signals of this process; other worker
+    processes only see such changes once their entry expires, so the TTL
+    bounds how long a deactivated user may stay authenticated there.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        config = settings.REVIEWS_AUTH_USER_CACHE
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + config['TTL'], user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > config['MAX_SIZE']:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` that resolves the token's user from `user_cache`
+    instead of querying `auth_user` on every request. Only active users that
+    passed the regular lookup are cached.
+    """
+
+    def authenticate(self, request):
+        with timing.span('auth'):
+            return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if not settings.REVIEWS_AUTH_USER_CACHE['ENABLED']:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+
+        # Requests must not share (and mutate) the same instance.
+        return copy.copy(user)
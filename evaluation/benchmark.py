@@ -0,0 +1,204 @@
+"""
+Helpers shared by the `bench_*` management commands.
+
+Benchmarks run against a throwaway database created and migrated the same
+way the test runner does it, so they never touch the configured one, and
+with throttling disabled since all requests come from one client. Pass
+`database_file` to get an on-disk SQLite database instead of the default
+in-memory one, e.g. to measure contention between threads.
+"""
+import math
+import random
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment
+)
+from evaluation import search
+from evaluation.models import Company, CompanyRatingSummary, Review
+from evaluation.services import compute_company_ratings
+
+SEED_PASSWORD = 'Amvnfr213!'
+
+WORDS = (
+    'service', 'product', 'delivery', 'support', 'price', 'quality', 'fast',
+    'slow', 'great', 'poor', 'friendly', 'helpful', 'refund', 'order',
+    'shipping', 'warranty', 'recommend', 'experience', 'staff', 'value',
+)
+
+
+@contextmanager
+def benchmark_environment(database_file=None):
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    if database_file is not None:
+        test_settings['NAME'] = database_file
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    throttles = override_settings(
+        REVIEWS_THROTTLES=dict(settings.REVIEWS_THROTTLES, ENABLED=False)
+    )
+    throttles.enable()
+    try:
+        yield
+    finally:
+        throttles.disable()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        test_settings['NAME'] = old_test_name
+
+
+def seed_dataset(users, reviews, companies, seed=0, batch_size=5000):
+    """
+    Insert `users` users named `bench_user_<n>`, all with `SEED_PASSWORD`,
+    and `reviews` reviews spread over them and over `companies` companies,
+    with matching company rating summaries. The same arguments always
+    produce the same rows. Return the ids of the users.
+    """
+    rng = random.Random(seed)
+    password = make_password(SEED_PASSWORD)
+
+    def text(words):
+        return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+    with transaction.atomic():
+        User.objects.bulk_create([
+            User(username='bench_user_%d' % index, password=password)
+            for index in range(users)
+        ], batch_size=500)
+        user_ids = list(User.objects.filter(
+            username__startswith='bench_user_'
+        ).order_by('id').values_list('id', flat=True))
+        Company.objects.bulk_create([
+            Company(name='Company %d' % index) for index in range(companies)
+        ], batch_size=500)
+        company_list = list(Company.objects.filter(
+            name__startswith='Company '
+        ).order_by('id'))
+
+        last_id = search.last_review_id()
+        for start in range(0, reviews, batch_size):
+            batch = [
+                Review(
+                    user_id=rng.choice(user_ids),
+                    title=text(rng.randint(2, 6)).capitalize(),
+                    summary=text(rng.randint(10, 200)).capitalize(),
+                    rating=rng.randint(1, 5),
+                    company=rng.choice(company_list),
+                    ip_address='10.%d.%d.%d' % (
+                        rng.randrange(256), rng.randrange(256),
+                        rng.randrange(256)
+                    )
+                ) for _ in range(start, min(start + batch_size, reviews))
+            ]
+            for review in batch:
+                review.set_fingerprint()
+            Review.objects.bulk_create(batch)
+        search.index_reviews_after(last_id)
+
+        CompanyRatingSummary.objects.bulk_create(
+            compute_company_ratings().values(), batch_size=500
+        )
+    return user_ids
+
+
+def run_threads(target, threads):
+    """
+    Run `target(index)` in `threads` threads, each with its own database
+    connection, and return the wall-clock seconds until all finished.
+    """
+    def run(index):
+        try:
+            target(index)
+        finally:
+            connections.close_all()
+
+    workers = [
+        threading.Thread(target=run, args=(index,)) for index in range(threads)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a non-empty list of values."""
+    ordered = sorted(values)
+    rank = max(int(math.ceil(percent / 100.0 * len(ordered))), 1)
+    return ordered[rank - 1]
+
+
+def measure(call, iterations):
+    """
+    Call `call()` `iterations` times and return the duration in seconds and
+    the number of SQL queries of every call.
+    """
+    durations = []
+    queries = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            call()
+            durations.append(time.perf_counter() - started)
+        queries.append(len(context.captured_queries))
+    return durations, queries
+
+
+def summarize(durations, queries):
+    total = sum(durations)
+    return {
+        'requests': len(durations),
+        'mean_ms': statistics.mean(durations) * 1000,
+        'p50_ms': percentile(durations, 50) * 1000,
+        'p95_ms': percentile(durations, 95) * 1000,
+        'p99_ms': percentile(durations, 99) * 1000,
+        'throughput_rps': len(durations) / total if total else 0.0,
+        'queries_per_request': statistics.mean(queries),
+    }
+
+
+def compare_results(results, baseline, tolerance):
+    """
+    List the regressions of `results` against `baseline`, both mappings of
+    endpoint names to `summarize()` results. Latency and throughput may be
+    worse by a fraction `tolerance`; the number of queries may not grow.
+    """
+    regressions = []
+    for name, expected in sorted(baseline.items()):
+        actual = results.get(name)
+        if actual is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if actual[metric] > expected[metric] * (1 + tolerance):
+                regressions.append('%s %s %.3f > baseline %.3f' % (
+                    name, metric, actual[metric], expected[metric]
+                ))
+        if actual['throughput_rps'] < (
+            expected['throughput_rps'] / (1 + tolerance)
+        ):
+            regressions.append('%s throughput_rps %.1f < baseline %.1f' % (
+                name, actual['throughput_rps'], expected['throughput_rps']
+            ))
+        if actual['queries_per_request'] > expected['queries_per_request']:
+            regressions.append(
+                '%s queries_per_request %.2f > baseline %.2f' % (
+                    name, actual['queries_per_request'],
+                    expected['queries_per_request']
+                )
+            )
+    return regressions
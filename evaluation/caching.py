@@ -0,0 +1,115 @@
+"""
+Validators and response caching for review reads.
+
+Reviews cannot be edited through the API, so a user's reviews only change
+when one is created. Two cheap version stamps follow from that:
+
+* a review's `(id, date)` identifies the state of a single review;
+* the `(count, max id, max date)` of a user's reviews, read from the
+  `(user, date, id)` index, identifies the state of all of them.
+
+Both feed ETag/Last-Modified validators, so conditional requests are
+answered with a 304 without serializing anything. Optionally, serialized
+list pages are also kept in Django's cache under a per-user generation
+token that is replaced whenever reviews are created for the user.
+"""
+import hashlib
+import uuid
+from calendar import timegm
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+
+
+def get_cache():
+    return caches[settings.REVIEWS_CACHE_ALIAS]
+
+
+def list_cache_enabled():
+    return bool(settings.REVIEWS_LIST_CACHE_TIMEOUT)
+
+
+def make_etag(*parts):
+    return hashlib.md5(
+        ':'.join(str(part) for part in parts).encode('utf-8')
+    ).hexdigest()
+
+
+def timestamp(value):
+    if value is None:
+        return None
+    return timegm(value.utctimetuple())
+
+
+def list_validators(request, reviews):
+    """
+    Return `(etag, last_modified)` of a list response over `reviews`, the
+    user's unfiltered reviews. The request path and negotiated media type
+    are part of the ETag because they select a different representation.
+    """
+    stamp = reviews.order_by().aggregate(
+        count=Count('id'), max_id=Max('id'), max_date=Max('date')
+    )
+    etag = make_etag(
+        stamp['count'], stamp['max_id'], stamp['max_date'],
+        request.get_full_path(), request.accepted_media_type
+    )
+    return etag, timestamp(stamp['max_date'])
+
+
+def detail_validators(request, review_id, review_date):
+    etag = make_etag(
+        review_id, review_date, request.get_full_path(),
+        request.accepted_media_type
+    )
+    return etag, timestamp(review_date)
+
+
+def _generation_key(user_id):
+    return 'reviews:generation:%s' % user_id
+
+
+def get_generation(user_id):
+    """
+    Return the user's current cache generation token. A fresh random token
+    is used whenever none is stored, so entries written under an evicted
+    token can never be read again.
+    """
+    cache = get_cache()
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(key, generation, timeout=None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def list_cache_key(request, user_id):
+    return 'reviews:list:%s:%s:%s' % (
+        user_id,
+        get_generation(user_id),
+        make_etag(request.get_full_path(), request.accepted_media_type)
+    )
+
+
+def get_cached_list(request, user_id):
+    """Return the cached `(etag, last_modified, data)` of a list page."""
+    return get_cache().get(list_cache_key(request, user_id))
+
+
+def set_cached_list(request, user_id, etag, last_modified, data):
+    get_cache().set(
+        list_cache_key(request, user_id),
+        (etag, last_modified, data),
+        settings.REVIEWS_LIST_CACHE_TIMEOUT
+    )
+
+
+def invalidate_user_reviews(user_ids):
+    """Drop every cached list page of the given users."""
+    if not list_cache_enabled():
+        return
+    get_cache().set_many({
+        _generation_key(user_id): uuid.uuid4().hex for user_id in user_ids
+    }, timeout=None)
@@ -0,0 +1,108 @@
+"""
+Interning of company names into the `Company` table.
+
+Reviews point at their company by id. Creating one resolves the submitted
+name to its `Company` through `company_cache`, a process-local LRU, so
+naming a known company costs no query. Companies are never renamed or
+deleted, so entries only go stale when the database itself is replaced,
+e.g. flushed between tests, which clears the cache through `post_migrate`.
+"""
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+from evaluation.models import Company
+
+# Names per query, below SQLite's limit on query parameters.
+QUERY_CHUNK_SIZE = 500
+
+
+def normalize_name(name):
+    """Apply NFKC and collapse runs of whitespace, keeping the case."""
+    return ' '.join(unicodedata.normalize('NFKC', name).split())
+
+
+class CompanyCache:
+    """
+    Process-local LRU of companies keyed by their normalized name, sized by
+    `REVIEWS_COMPANY_CACHE['MAX_SIZE']`.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            company = self._entries.get(name)
+            if company is not None:
+                self._entries.move_to_end(name)
+            return company
+
+    def set_many(self, companies):
+        max_size = settings.REVIEWS_COMPANY_CACHE['MAX_SIZE']
+        with self._lock:
+            for company in companies:
+                self._entries[company.name] = company
+                self._entries.move_to_end(company.name)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+company_cache = CompanyCache()
+
+
+def _fetch(names):
+    names = list(names)
+    companies = {}
+    for start in range(0, len(names), QUERY_CHUNK_SIZE):
+        companies.update(
+            (company.name, company) for company in Company.objects.filter(
+                name__in=names[start:start + QUERY_CHUNK_SIZE]
+            )
+        )
+    return companies
+
+
+def get_companies(names):
+    """
+    Map the normalized form of each of `names` to its `Company`, creating
+    the missing ones. Names that are not cached cost one query, and one
+    insert and query more if some of them are new. Companies only enter the
+    cache once the transaction that read or created them is committed.
+    """
+    companies = {}
+    missing = set()
+    for name in {normalize_name(name) for name in names}:
+        company = company_cache.get(name)
+        if company is None:
+            missing.add(name)
+        else:
+            companies[name] = company
+    if not missing:
+        return companies
+
+    found = _fetch(missing)
+    new = missing.difference(found)
+    if new:
+        # Concurrent requests may insert the same names, keep theirs.
+        Company.objects.bulk_create(
+            [Company(name=name) for name in new], ignore_conflicts=True
+        )
+        found.update(_fetch(new))
+    transaction.on_commit(
+        partial(company_cache.set_many, list(found.values()))
+    )
+    companies.update(found)
+    return companies
+
+
+def get_company(name):
+    """The `Company` named `name`, created if needed."""
+    return get_companies([name])[normalize_name(name)]
@@ -0,0 +1,57 @@
+"""
+gzip compression of responses, negotiated with `Accept-Encoding`.
+
+Review lists and exports repeat the same keys in every object and compress
+several times over. Regular responses are compressed in one go; streaming
+responses are compressed chunk by chunk as they are written, so an export
+is never held in memory as a whole.
+"""
+import re
+import zlib
+
+# zlib window bits producing a gzip header and trailer.
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+_CODING_RE = re.compile(r'^\s*([^\s;]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+
+def accepts_gzip(header):
+    """
+    Whether an `Accept-Encoding` header value allows gzip: listed with a
+    non-zero quality, or matched by `*` when gzip itself is not listed.
+    """
+    qualities = {}
+    for coding in header.split(','):
+        match = _CODING_RE.match(coding)
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+        qualities[match.group(1).lower()] = quality
+    quality = qualities.get('gzip', qualities.get('*', 0.0))
+    return quality > 0
+
+
+def compressible(content_type, content_types):
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return any(media_type.startswith(prefix) for prefix in content_types)
+
+
+def compress(content, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(content) + compressor.flush()
+
+
+def compress_stream(chunks, level):
+    """
+    Compress an iterable of byte strings lazily. zlib buffers small chunks
+    internally, so compressed data is yielded as its blocks fill up.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,171 @@
+"""
+Model fields of the evaluation app.
+
+`CompressedTextField` stores long free text, such as review summaries,
+compressed. Values are stored as bytes behind a one-byte format marker:
+
+* `0x00`: UTF-8 text stored as is, for short values or with compression
+  disabled;
+* `0x01`: zlib-compressed UTF-8 text.
+
+Plain text values, stored before a column was compressed, are read as they
+are. Loaded values are only decompressed when the attribute is first read,
+so rows loaded for other columns never pay for it. On SQLite, the
+`evaluation_text()` SQL function, registered on the connections of the
+application, lets raw queries read the text.
+
+`PackedIPAddressField` stores the address of another field as 16 bytes, so
+that subnets are ranges of its index.
+"""
+import ipaddress
+import zlib
+from django.conf import settings
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from django.utils.functional import Promise
+
+PLAIN = b'\x00'
+ZLIB = b'\x01'
+
+SQL_FUNCTION = 'evaluation_text'
+
+# IPv4 addresses are packed as IPv4-mapped IPv6 addresses, ::ffff:a.b.c.d.
+IPV4_MAPPED = ipaddress.IPv6Network('::ffff:0:0/96')
+
+
+def compress_text(value):
+    """Encode text as stored, following `REVIEWS_SUMMARY_COMPRESSION`."""
+    config = settings.REVIEWS_SUMMARY_COMPRESSION
+    data = value.encode('utf-8')
+    if config['ENABLED'] and len(data) >= config['MIN_SIZE']:
+        compressed = zlib.compress(data, config['LEVEL'])
+        if len(compressed) < len(data):
+            return ZLIB + compressed
+    return PLAIN + data
+
+
+def decompress_text(data):
+    marker, payload = data[:1], data[1:]
+    if marker == ZLIB:
+        payload = zlib.decompress(payload)
+    elif marker != PLAIN:
+        raise ValueError('Unknown compressed text format %r.' % marker)
+    return payload.decode('utf-8')
+
+
+def sql_text(value):
+    """Implementation of the `evaluation_text()` SQL function."""
+    if value is None or isinstance(value, str):
+        return value
+    return decompress_text(bytes(value))
+
+
+class CompressedText:
+    """A stored `CompressedTextField` value, not decompressed yet."""
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        return decompress_text(self.data)
+
+    def __repr__(self):
+        return '<CompressedText: %d bytes>' % len(self.data)
+
+
+def text(value):
+    """The text of a value read with `values()` or `values_list()`."""
+    if isinstance(value, CompressedText):
+        return str(value)
+    return value
+
+
+class CompressedTextAttribute(DeferredAttribute):
+    """
+    Decompress the value on first access and keep the text. Defining
+    `__set__` makes this a data descriptor, so it is consulted even once
+    the value is in the instance `__dict__`.
+    """
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, CompressedText):
+            value = str(value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+
+class CompressedTextField(models.TextField):
+    """
+    A `TextField` stored compressed in a binary column. Filters compare
+    stored bytes, so only `isnull` lookups are meaningful.
+    """
+    descriptor_class = CompressedTextAttribute
+
+    def get_internal_type(self):
+        return 'BinaryField'
+
+    def from_db_value(self, value, expression, connection):
+        if value is None or isinstance(value, str):
+            return value
+        return CompressedText(bytes(value))
+
+    def to_python(self, value):
+        if isinstance(value, CompressedText):
+            return str(value)
+        return super().to_python(value)
+
+    def pre_save(self, model_instance, add):
+        # Values that were never read are saved without a round trip
+        # through decompression, e.g. when copying rows.
+        value = model_instance.__dict__.get(self.attname)
+        if isinstance(value, CompressedText):
+            return value
+        return super().pre_save(model_instance, add)
+
+    def get_prep_value(self, value):
+        if isinstance(value, Promise):
+            value = value._proxy____cast()
+        if value is None:
+            return None
+        if isinstance(value, CompressedText):
+            return value.data
+        return compress_text(str(value))
+
+
+def pack_ip(address):
+    """The 16-byte form of an IPv4 or IPv6 address, or None."""
+    if address is None or address == '':
+        return None
+    address = ipaddress.ip_address(address)
+    if address.version == 4:
+        return IPV4_MAPPED.network_address.packed[:12] + address.packed
+    return address.packed
+
+
+class PackedIPAddressField(models.BinaryField):
+    """
+    The address held by the `source` field of the same model, packed by
+    `pack_ip`. Packed addresses compare in address order. The value is
+    computed whenever the row is saved, bulk creations included.
+    """
+
+    def __init__(self, *args, source, **kwargs):
+        self.source = source
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = pack_ip(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,48 @@
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.filters import BaseFilterBackend
+from evaluation.search import search_reviews
+
+
+class ReviewSearchFilter(BaseFilterBackend):
+    """
+    Full-text filter for the reviews list: `?q=` keeps the reviews whose
+    title, summary or company contain every given word, best match first.
+    """
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, 'action', None) != 'list':
+            return queryset
+
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_reviews(queryset, query)
+
+    def get_schema_fields(self, view):
+        return [
+            coreapi.Field(
+                name=self.search_param,
+                required=False,
+                location='query',
+                schema=coreschema.String(
+                    title='Search',
+                    description='Words to search for in the title, summary '
+                                'and company of the reviews.'
+                )
+            )
+        ]
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.search_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Words to search for in the title, summary '
+                               'and company of the reviews.',
+                'schema': {
+                    'type': 'string',
+                },
+            },
+        ]
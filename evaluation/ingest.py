@@ -0,0 +1,277 @@
+"""
+Write-behind ingestion of reviews.
+
+With `REVIEWS_INGEST['ENABLED']`, `POST /api/reviews/` validates the
+payload, appends it to a spool file and answers 202 with a ticket instead
+of writing to the database. Appending a line never waits on the SQLite
+write lock. The `process_review_queue` command then drains the spool and
+stores many reviews per transaction.
+
+Spool layout in `REVIEWS_INGEST['SPOOL_DIR']`:
+
+* `reviews.spool` receives new records, one JSON document per line;
+* the worker renames it to `reviews.spool.<n>.processing` before reading,
+  so writers start a fresh file;
+* a processing file is removed once every record in it is stored;
+* `tickets/<ab>/<ticket>`, named after the ticket and sharded by its first
+  two digits, holds the id of the user who enqueued it. It is written
+  before the record and removed once the record is stored, so the status
+  of a pending ticket is one file lookup, however long the spool grows.
+
+A record is stored in the same transaction as its `IngestTicket`, and
+records whose ticket already exists are skipped. Re-reading a processing
+file after a crash therefore never creates a review twice.
+"""
+import json
+import os
+import time
+import uuid
+from glob import glob
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from evaluation import services
+from evaluation.models import IngestTicket
+from evaluation.serializers import ReviewWriteSerializer
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+SPOOL_NAME = 'reviews.spool'
+TICKETS_DIR = 'tickets'
+
+
+class WorkerBusy(Exception):
+    pass
+
+
+def is_enabled():
+    return settings.REVIEWS_INGEST['ENABLED']
+
+
+def spool_path():
+    return os.path.join(settings.REVIEWS_INGEST['SPOOL_DIR'], SPOOL_NAME)
+
+
+def _ticket_path(ticket):
+    return os.path.join(
+        settings.REVIEWS_INGEST['SPOOL_DIR'], TICKETS_DIR, ticket[:2], ticket
+    )
+
+
+def _lock(fd, blocking=True):
+    if fcntl is not None:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        fcntl.flock(fd, flags)
+
+
+def _is_current(fd, path):
+    try:
+        return os.fstat(fd).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def enqueue(user, ip_address, validated_data):
+    """Append a validated review to the spool and return its ticket."""
+    ticket = uuid.uuid4().hex
+    record = json.dumps({
+        'ticket': ticket,
+        'user': user.pk,
+        'ip_address': ip_address,
+        'data': validated_data,
+        'enqueued_at': timezone.now(),
+    }, cls=DjangoJSONEncoder) + '\n'
+
+    # Written first, so a stored ticket never gets a marker afterwards.
+    ticket_path = _ticket_path(ticket)
+    os.makedirs(os.path.dirname(ticket_path), exist_ok=True)
+    with open(ticket_path, 'w', encoding='utf-8') as marker:
+        marker.write(str(user.pk))
+
+    path = spool_path()
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            _lock(fd)
+            # The worker may have claimed the file while we waited for the
+            # lock, in which case the record goes to a new spool file.
+            if _is_current(fd, path):
+                os.write(fd, record.encode('utf-8'))
+                if settings.REVIEWS_INGEST['FSYNC']:
+                    os.fsync(fd)
+                return ticket
+        finally:
+            os.close(fd)
+
+
+def claim_spool():
+    """
+    Move the current spool aside for processing and return every processing
+    file, oldest first, including those left behind by a crashed worker.
+    """
+    path = spool_path()
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        pass
+    else:
+        try:
+            _lock(fd)
+            if _is_current(fd, path):
+                os.rename(path, '%s.%d.processing' % (path, time.time_ns()))
+        finally:
+            os.close(fd)
+
+    return sorted(
+        glob(path + '.*.processing'),
+        key=lambda name: int(name.rsplit('.', 2)[-2])
+    )
+
+
+def spooled_ticket_user(ticket):
+    """
+    The id of the user who enqueued a ticket still waiting in the spool,
+    or None.
+    """
+    try:
+        with open(_ticket_path(ticket), encoding='utf-8') as marker:
+            return int(marker.read())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _remove_ticket_markers(records):
+    for record in records:
+        try:
+            os.remove(_ticket_path(record['ticket']))
+        except FileNotFoundError:
+            pass
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as spool:
+        for line in spool:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Only a record cut short by a crash can be malformed.
+                continue
+
+
+def store_records(records):
+    """
+    Store a batch of spooled records in one transaction and return how
+    many reviews were created and rejected.
+    """
+    with transaction.atomic():
+        processed = set(IngestTicket.objects.filter(
+            ticket__in=[record['ticket'] for record in records]
+        ).values_list('ticket', flat=True))
+        users = User.objects.in_bulk({record['user'] for record in records})
+
+        accepted = []
+        tickets = []
+        for record in records:
+            user = users.get(record['user'])
+            if record['ticket'] in processed or user is None:
+                # Already stored, or nobody is left to ask for the ticket.
+                continue
+            processed.add(record['ticket'])
+
+            ticket = IngestTicket(
+                ticket=record['ticket'],
+                user=user,
+                enqueued_at=parse_datetime(record['enqueued_at'])
+            )
+            tickets.append(ticket)
+            if not user.is_active:
+                ticket.status = IngestTicket.REJECTED
+                ticket.errors = json.dumps({
+                    'non_field_errors': ['User is inactive.']
+                })
+                continue
+
+            serializer = ReviewWriteSerializer(data=record['data'])
+            if not serializer.is_valid():
+                ticket.status = IngestTicket.REJECTED
+                ticket.errors = json.dumps(serializer.errors)
+                continue
+
+            ticket.status = IngestTicket.CREATED
+            accepted.append((ticket, services.build_review(
+                user, record['ip_address'], serializer.validated_data
+            )))
+
+        reject = settings.REVIEWS_DUPLICATES['POLICY'] == 'reject'
+        duplicates = services.find_duplicates(
+            [review for _, review in accepted]
+        )
+        reviews = []
+        links = []
+        for (ticket, review), duplicate in zip(accepted, duplicates):
+            if duplicate is None:
+                reviews.append(review)
+                links.append((ticket, review))
+            elif reject:
+                ticket.status = IngestTicket.REJECTED
+                ticket.errors = json.dumps({
+                    'non_field_errors': [services.DUPLICATE_REVIEW]
+                })
+            else:
+                # Collapsed into the review it duplicates, possibly one of
+                # this batch that only gets its id once stored.
+                links.append((ticket, duplicate))
+
+        services.create_reviews(reviews)
+        for ticket, review in links:
+            ticket.review = review
+        IngestTicket.objects.bulk_create(tickets)
+
+    created = sum(
+        ticket.status == IngestTicket.CREATED for ticket in tickets
+    )
+    return created, len(tickets) - created
+
+
+def drain(batch_size=None):
+    """
+    Store every spooled review, `batch_size` records per transaction, and
+    return how many were created and rejected. Raises `WorkerBusy` if
+    another worker is already draining the spool.
+    """
+    batch_size = batch_size or settings.REVIEWS_INGEST['BATCH_SIZE']
+    os.makedirs(settings.REVIEWS_INGEST['SPOOL_DIR'], exist_ok=True)
+    lock_fd = os.open(spool_path() + '.lock', os.O_WRONLY | os.O_CREAT, 0o600)
+    try:
+        try:
+            _lock(lock_fd, blocking=False)
+        except OSError:
+            raise WorkerBusy('Another worker is processing the review queue.')
+
+        totals = [0, 0]
+
+        def flush(batch):
+            for index, count in enumerate(store_records(batch)):
+                totals[index] += count
+            # Once their tickets are committed.
+            _remove_ticket_markers(batch)
+
+        for path in claim_spool():
+            batch = []
+            for record in read_records(path):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+            os.remove(path)
+        return tuple(totals)
+    finally:
+        os.close(lock_fd)
@@ -0,0 +1,48 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from evaluation import archive
+from evaluation.models import Review
+
+
+class Command(BaseCommand):
+    help = (
+        'Move the reviews older than a given age to the archive table, in '
+        'batched transactions. Archived reviews can still be retrieved and '
+        'exported, but are no longer listed or searched.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--age-days', type=int,
+            help='Archive the reviews dated more than this many days ago. '
+                 "Defaults to REVIEWS_ARCHIVE['AGE_DAYS']."
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Reviews moved per transaction. Defaults to '
+                 "REVIEWS_ARCHIVE['BATCH_SIZE']."
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only count the reviews that would be archived.'
+        )
+
+    def handle(self, *args, **options):
+        if options['age_days'] is not None and options['age_days'] < 0:
+            raise CommandError('--age-days cannot be negative.')
+        cutoff = archive.archive_cutoff(options['age_days'])
+
+        if options['dry_run']:
+            self.stdout.write('%d reviews dated before %s would be archived.' % (
+                Review.objects.filter(date__lt=cutoff).count(),
+                cutoff.isoformat()
+            ))
+            return
+
+        started = time.monotonic()
+        moved = archive.archive_reviews(cutoff, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            'Archived %d reviews dated before %s in %.1f s.' % (
+                moved, cutoff.isoformat(), time.monotonic() - started
+            )
+        ))
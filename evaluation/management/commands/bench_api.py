@@ -0,0 +1,200 @@
+import itertools
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from evaluation.benchmark import (
+    SEED_PASSWORD,
+    benchmark_environment,
+    compare_results,
+    measure,
+    seed_dataset,
+    summarize
+)
+from evaluation.models import Review
+
+ENDPOINTS = ('login', 'reviews-list', 'reviews-detail', 'reviews-create')
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure latency, throughput and SQL queries of the review API '
+        'endpoints through the Django test client, on a seeded dataset. '
+        'Optionally save the results as JSON and fail when they regressed '
+        'against a saved baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=100,
+            help='Number of users seeded.'
+        )
+        parser.add_argument(
+            '--reviews', type=int, default=10000,
+            help='Number of reviews seeded, spread over the users.'
+        )
+        parser.add_argument(
+            '--companies', type=int, default=500,
+            help='Number of companies the reviews are spread over.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Seed of the dataset and of the requests.'
+        )
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Number of requests measured per endpoint.'
+        )
+        parser.add_argument(
+            '--login-requests', type=int, default=20,
+            help='Number of login/ requests measured. Password hashing '
+                 'makes them much slower than the others.'
+        )
+        parser.add_argument(
+            '--on-disk', action='store_true',
+            help='Use an on-disk SQLite database instead of an in-memory one.'
+        )
+        parser.add_argument(
+            '--output', help='Write the results to this JSON file.'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON file written by a previous run with --output. The '
+                 'command fails if any endpoint regressed against it.'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Fraction by which latency and throughput may be worse than '
+                 'the baseline.'
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as source:
+                baseline = json.load(source)
+
+        workdir = tempfile.mkdtemp()
+        try:
+            database_file = None
+            if options['on_disk']:
+                database_file = os.path.join(workdir, 'bench.sqlite3')
+            with benchmark_environment(database_file=database_file):
+                results = self.run_benchmark(options)
+        finally:
+            shutil.rmtree(workdir)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+
+        if baseline is None:
+            return
+        if baseline['dataset'] != results['dataset']:
+            self.stderr.write(
+                'The baseline was measured on another dataset: %s'
+                % baseline['dataset']
+            )
+        regressions = compare_results(
+            results['endpoints'], baseline['endpoints'], options['tolerance']
+        )
+        for regression in regressions:
+            self.stderr.write(regression)
+        if regressions:
+            raise CommandError(
+                '%d regressions against %s.'
+                % (len(regressions), options['baseline'])
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'No regression against %s.' % options['baseline']
+        ))
+
+    def run_benchmark(self, options):
+        dataset = {
+            'users': options['users'],
+            'reviews': options['reviews'],
+            'companies': options['companies'],
+            'seed': options['seed'],
+        }
+        started = time.perf_counter()
+        user_ids = seed_dataset(
+            dataset['users'], dataset['reviews'], dataset['companies'],
+            seed=dataset['seed']
+        )
+        self.stdout.write('Seeded %d users and %d reviews in %.1f s' % (
+            dataset['users'], dataset['reviews'],
+            time.perf_counter() - started
+        ))
+
+        rng = random.Random(options['seed'])
+        user_id = user_ids[0]
+        review_ids = list(
+            Review.objects.filter(user_id=user_id).values_list('id', flat=True)
+        )
+        if not review_ids:
+            raise CommandError('The benchmark user has no reviews, seed more.')
+
+        anonymous = Client()
+        client = Client(HTTP_AUTHORIZATION='Bearer %s' % AccessToken.for_user(
+            User.objects.get(pk=user_id)
+        ))
+
+        login_url = reverse('evaluation:token_obtain_pair')
+        list_url = reverse('evaluation:reviews-list')
+        credentials = {
+            'username': 'bench_user_0', 'password': SEED_PASSWORD
+        }
+        titles = itertools.count()
+
+        def payload():
+            # Distinct reviews, so none is rejected as a duplicate.
+            return {
+                'title': 'Benchmark review %d' % next(titles),
+                'summary': 'Benchmark review summary. ' * 20,
+                'rating': 4,
+                'company': 'Company 0'
+            }
+
+        calls = {
+            'login': lambda: anonymous.post(login_url, credentials),
+            'reviews-list': lambda: client.get(list_url),
+            'reviews-detail': lambda: client.get(reverse(
+                'evaluation:reviews-detail', args=[rng.choice(review_ids)]
+            )),
+            'reviews-create': lambda: client.post(
+                list_url, payload(), content_type='application/json'
+            ),
+        }
+
+        endpoints = {}
+        for name in ENDPOINTS:
+            call = calls[name]
+            response = call()  # warm up
+            if response.status_code >= 400:
+                raise CommandError('%s answered %d: %s' % (
+                    name, response.status_code, response.content[:200]
+                ))
+            iterations = options[
+                'login_requests' if name == 'login' else 'requests'
+            ]
+            endpoints[name] = summarize(*measure(call, iterations))
+            self.stdout.write(
+                '%-15s p50 %7.3f ms  p95 %7.3f ms  p99 %7.3f ms  '
+                '%8.1f requests/s  %5.2f queries/request' % (
+                    name,
+                    endpoints[name]['p50_ms'],
+                    endpoints[name]['p95_ms'],
+                    endpoints[name]['p99_ms'],
+                    endpoints[name]['throughput_rps'],
+                    endpoints[name]['queries_per_request']
+                )
+            )
+
+        return {'dataset': dataset, 'endpoints': endpoints}
@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from evaluation.authentication import user_cache
+from evaluation.benchmark import benchmark_environment, measure, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare SQL queries and latency per authenticated request with the '
+        'JWT user cache disabled and enabled.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help='Number of requests measured in each mode.'
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_environment():
+            user = User.objects.create_user(
+                username='bench_user', password='Amvnfr213!'
+            )
+            client = Client(
+                HTTP_AUTHORIZATION='Bearer %s' % AccessToken.for_user(user)
+            )
+            url = reverse('evaluation:reviews-list')
+
+            for enabled in (False, True):
+                config = {'ENABLED': enabled, 'MAX_SIZE': 10000, 'TTL': 60}
+                with override_settings(REVIEWS_AUTH_USER_CACHE=config):
+                    user_cache.clear()
+                    client.get(url)  # warm up
+                    result = summarize(*measure(
+                        lambda: client.get(url), options['requests']
+                    ))
+
+                self.stdout.write(
+                    '%-16s %5.2f queries/request  mean %6.3f ms  '
+                    'p95 %6.3f ms  %8.1f requests/s' % (
+                        'user cache on' if enabled else 'user cache off',
+                        result['queries_per_request'],
+                        result['mean_ms'],
+                        result['p95_ms'],
+                        result['throughput_rps']
+                    )
+                )
@@ -0,0 +1,137 @@
+import json
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from evaluation import compression
+from evaluation.benchmark import benchmark_environment, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the CPU time spent gzipping review API responses against '
+        'the bytes it saves, at several compression levels, on a seeded '
+        'dataset.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reviews', type=int, default=2000,
+            help='Number of reviews seeded for the benchmark user.'
+        )
+        parser.add_argument(
+            '--companies', type=int, default=100,
+            help='Number of companies the reviews are spread over.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Seed of the dataset.'
+        )
+        parser.add_argument(
+            '--levels', default='1,3,6,9',
+            help='Comma-separated zlib compression levels to compare.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Number of times each response is compressed.'
+        )
+        parser.add_argument(
+            '--output', help='Write the results to this JSON file.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['levels'].split(',')]
+        except ValueError:
+            raise CommandError('--levels must be comma-separated integers.')
+        if any(level < 0 or level > 9 for level in levels):
+            raise CommandError('Compression levels go from 0 to 9.')
+
+        with benchmark_environment():
+            responses = self.collect_responses(options)
+        results = self.run_benchmark(responses, levels, options['repeat'])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+
+    def collect_responses(self, options):
+        """
+        The uncompressed bodies of typical responses, as lists of chunks:
+        one for regular responses, one per written line for exports.
+        """
+        user_ids = seed_dataset(
+            1, options['reviews'], options['companies'], seed=options['seed']
+        )
+        client = Client(HTTP_AUTHORIZATION='Bearer %s' % AccessToken.for_user(
+            User.objects.get(pk=user_ids[0])
+        ))
+        list_url = reverse('evaluation:reviews-list')
+        export_url = reverse('evaluation:reviews-export')
+        requests = {
+            'list-100': (list_url, {'page_size': 100}),
+            'list-500': (list_url, {'page_size': 500}),
+            'list-500-titles': (
+                list_url, {'page_size': 500, 'fields': 'id,title,rating'}
+            ),
+            'export-ndjson': (export_url, {'format': 'ndjson'}),
+            'export-csv': (export_url, {'format': 'csv'}),
+        }
+
+        responses = {}
+        disabled = dict(settings.REVIEWS_COMPRESSION, ENABLED=False)
+        with override_settings(REVIEWS_COMPRESSION=disabled):
+            for name, (url, params) in requests.items():
+                response = client.get(url, params)
+                if response.status_code != 200:
+                    raise CommandError('%s answered %d' % (
+                        name, response.status_code
+                    ))
+                if response.streaming:
+                    responses[name] = list(response.streaming_content)
+                else:
+                    responses[name] = [response.content]
+        return responses
+
+    def run_benchmark(self, responses, levels, repeat):
+        results = {}
+        for name, chunks in responses.items():
+            size = sum(len(chunk) for chunk in chunks)
+            results[name] = {'bytes': size, 'levels': {}}
+            self.stdout.write('%s: %d bytes in %d chunks' % (
+                name, size, len(chunks)
+            ))
+            for level in levels:
+                if len(chunks) == 1:
+                    def run():
+                        return compression.compress(chunks[0], level)
+                else:
+                    def run():
+                        return b''.join(
+                            compression.compress_stream(chunks, level)
+                        )
+
+                started = time.process_time()
+                for _ in range(repeat):
+                    compressed = len(run())
+                cpu_ms = (time.process_time() - started) / repeat * 1000
+                result = {
+                    'compressed_bytes': compressed,
+                    'saved_percent': 100.0 * (size - compressed) / size,
+                    'cpu_ms': cpu_ms,
+                    'mb_per_cpu_second': (
+                        size / 1e6 / (cpu_ms / 1000) if cpu_ms else 0.0
+                    ),
+                }
+                results[name]['levels'][level] = result
+                self.stdout.write(
+                    '  level %d  %9d bytes  saved %5.1f%%  %8.3f ms CPU  '
+                    '%7.1f MB/s' % (
+                        level, compressed, result['saved_percent'],
+                        cpu_ms, result['mb_per_cpu_second']
+                    )
+                )
+        return results
@@ -0,0 +1,107 @@
+import logging
+import os
+import shutil
+import tempfile
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from evaluation import ingest
+from evaluation.benchmark import benchmark_environment, run_threads
+from evaluation.models import Review
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the throughput of concurrent POST /api/reviews/ requests '
+        'stored synchronously and through the asynchronous ingestion queue, '
+        'on an on-disk SQLite database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads', type=int, default=8,
+            help='Number of concurrent clients.'
+        )
+        parser.add_argument(
+            '--requests', type=int, default=100,
+            help='Number of reviews posted by each client.'
+        )
+        parser.add_argument(
+            '--no-fsync', action='store_true',
+            help='Do not fsync the spool after every accepted review.'
+        )
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp()
+        try:
+            database_file = os.path.join(workdir, 'bench.sqlite3')
+            # "database is locked" errors are counted, not logged.
+            logging.getLogger('django.request').disabled = True
+            with benchmark_environment(database_file=database_file):
+                self.run_benchmark(workdir, options)
+        finally:
+            logging.getLogger('django.request').disabled = False
+            shutil.rmtree(workdir)
+
+    def run_benchmark(self, workdir, options):
+        threads = options['threads']
+        per_thread = options['requests']
+        total = threads * per_thread
+        clients = []
+        for index in range(threads):
+            user = User.objects.create_user(
+                username='bench_user_%d' % index, password='Amvnfr213!'
+            )
+            clients.append(Client(
+                raise_request_exception=False,
+                HTTP_AUTHORIZATION='Bearer %s' % AccessToken.for_user(user)
+            ))
+
+        url = reverse('evaluation:reviews-list')
+
+        def payload(number):
+            # Distinct reviews, so none is rejected as a duplicate.
+            return {
+                'title': 'Benchmark review %d' % number,
+                'summary': 'Benchmark review summary. ' * 20,
+                'rating': 4,
+                'company': 'Benchmark Company'
+            }
+
+        for enabled in (False, True):
+            config = dict(
+                settings.REVIEWS_INGEST,
+                ENABLED=enabled,
+                SPOOL_DIR=os.path.join(workdir, 'spool'),
+                FSYNC=not options['no_fsync']
+            )
+            failures = []
+
+            def post_reviews(index):
+                for number in range(per_thread):
+                    response = clients[index].post(
+                        url, payload(number), content_type='application/json'
+                    )
+                    if response.status_code not in (201, 202):
+                        failures.append(response.status_code)
+
+            with override_settings(REVIEWS_INGEST=config):
+                Review.objects.all().delete()
+                accept_seconds = run_threads(post_reviews, threads)
+                store_seconds = 0.0
+                if enabled:
+                    store_seconds = run_threads(lambda index: ingest.drain(), 1)
+
+            stored = Review.objects.count()
+            self.stdout.write(
+                '%-6s accepted %6.1f requests/s  end to end %6.1f reviews/s  '
+                'stored %d/%d  failed %d' % (
+                    'async' if enabled else 'sync',
+                    total / accept_seconds,
+                    stored / (accept_seconds + store_seconds),
+                    stored, total, len(failures)
+                )
+            )
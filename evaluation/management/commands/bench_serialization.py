@@ -0,0 +1,107 @@
+import io
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from evaluation.benchmark import benchmark_environment, seed_dataset
+from evaluation.models import Review
+from evaluation.parsers import FastJSONParser, MessagePackParser
+from evaluation.renderers import (
+    FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+)
+from evaluation.serializers import ReviewSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the time to render and parse serialized reviews with the '
+        'stdlib JSON, orjson and MessagePack renderers and parsers, across '
+        'payload sizes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='1,10,100,500',
+            help='Comma-separated numbers of reviews per payload.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=200,
+            help='Number of times each payload is rendered and parsed.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Seed of the dataset.'
+        )
+        parser.add_argument(
+            '--output', help='Write the results to this JSON file.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes must be comma-separated integers.')
+
+        codecs = [('json', JSONRenderer(), JSONParser())]
+        if orjson is not None:
+            codecs.append(('orjson', FastJSONRenderer(), FastJSONParser()))
+        else:
+            self.stderr.write('orjson is not installed, skipping it.')
+        if msgpack is not None:
+            codecs.append(
+                ('msgpack', MessagePackRenderer(), MessagePackParser())
+            )
+        else:
+            self.stderr.write('msgpack is not installed, skipping it.')
+
+        with benchmark_environment():
+            seed_dataset(1, max(sizes), 50, seed=options['seed'])
+            reviews = list(
+                Review.objects.select_related('user', 'company')
+                .order_by('id')
+            )
+        results = self.run_benchmark(
+            reviews, sizes, codecs, options['repeat']
+        )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+
+    def time_per_call(self, call, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            call()
+        return (time.perf_counter() - started) / repeat * 1e6
+
+    def run_benchmark(self, reviews, sizes, codecs, repeat):
+        results = {}
+        for size in sizes:
+            data = ReviewSerializer(reviews[:size], many=True).data
+            serialize_us = self.time_per_call(
+                lambda: ReviewSerializer(reviews[:size], many=True).data,
+                max(repeat // 10, 1)
+            )
+            results[size] = {'serialize_us': serialize_us, 'codecs': {}}
+            self.stdout.write('%d reviews: ReviewSerializer %.1f us' % (
+                size, serialize_us
+            ))
+            for name, renderer, parser in codecs:
+                content = renderer.render(data)
+                render_us = self.time_per_call(
+                    lambda: renderer.render(data), repeat
+                )
+                parse_us = self.time_per_call(
+                    lambda: parser.parse(io.BytesIO(content)), repeat
+                )
+                results[size]['codecs'][name] = {
+                    'bytes': len(content),
+                    'render_us': render_us,
+                    'parse_us': parse_us,
+                }
+                self.stdout.write(
+                    '  %-8s %9d bytes  render %10.1f us  parse %10.1f us'
+                    % (name, len(content), render_us, parse_us)
+                )
+        return results
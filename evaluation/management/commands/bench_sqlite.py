@@ -0,0 +1,143 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+from evaluation import search
+from evaluation.benchmark import percentile, run_threads
+from evaluation.models import Company, Review
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the stock SQLite configuration with the configured default '
+        'database under concurrent readers and writers, each on its own '
+        'on-disk database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument(
+            '--seconds', type=float, default=5.0,
+            help='Duration of each run.'
+        )
+        parser.add_argument(
+            '--reviews', type=int, default=20000,
+            help='Number of reviews seeded before each run.'
+        )
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp()
+        configs = (
+            ('stock', {
+                'ENGINE': 'django.db.backends.sqlite3',
+            }),
+            ('tuned', {
+                'ENGINE': settings.DATABASES['default']['ENGINE'],
+                'CONN_MAX_AGE': settings.DATABASES['default'].get('CONN_MAX_AGE', 0),
+                'OPTIONS': settings.DATABASES['default'].get('OPTIONS', {}),
+            }),
+        )
+        try:
+            for name, config in configs:
+                alias = 'bench_%s' % name
+                connections.databases[alias] = dict(
+                    config, NAME=os.path.join(workdir, '%s.sqlite3' % name)
+                )
+                connections.ensure_defaults(alias)
+                connections.prepare_test_settings(alias)
+                try:
+                    self.run_benchmark(name, alias, options)
+                finally:
+                    connections[alias].close()
+                    del connections.databases[alias]
+        finally:
+            shutil.rmtree(workdir)
+
+    def seed(self, alias, reviews):
+        call_command('migrate', database=alias, verbosity=0)
+        User.objects.using(alias).bulk_create([
+            User(username='bench_user_%d' % index) for index in range(100)
+        ])
+        user_ids = list(User.objects.using(alias).values_list('id', flat=True))
+        Company.objects.using(alias).bulk_create([
+            Company(name='Company %d' % index) for index in range(50)
+        ])
+        self.companies = list(Company.objects.using(alias).order_by('id'))
+        Review.objects.using(alias).bulk_create((
+            Review(
+                user_id=user_ids[index % len(user_ids)],
+                title='Benchmark review %d' % index,
+                summary='Benchmark review summary. ' * 20,
+                rating=index % 5 + 1,
+                company=self.companies[index % 50],
+                ip_address='127.0.0.1'
+            ) for index in range(reviews)
+        ), batch_size=500)
+        search.index_reviews_after(0, using=alias)
+        return user_ids
+
+    def run_benchmark(self, name, alias, options):
+        user_ids = self.seed(alias, options['reviews'])
+        deadline = time.monotonic() + options['seconds']
+        timings = {'read': [], 'write': []}
+        errors = []
+
+        def request_finished():
+            # What Django does at the end of every request.
+            connections[alias].close_if_unusable_or_obsolete()
+
+        def read():
+            user_id = random.choice(user_ids)
+            list(
+                Review.objects.using(alias).filter(user_id=user_id)
+                .order_by('-date', '-id')[:50]
+            )
+
+        def write():
+            with transaction.atomic(using=alias):
+                Review.objects.using(alias).create(
+                    user_id=random.choice(user_ids),
+                    title='Benchmark review',
+                    summary='Benchmark review summary. ' * 20,
+                    rating=4,
+                    company=self.companies[0],
+                    ip_address='127.0.0.1'
+                )
+
+        def worker(index):
+            kind = 'write' if index < options['writers'] else 'read'
+            operation = write if kind == 'write' else read
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    operation()
+                except OperationalError as error:
+                    errors.append(str(error))
+                else:
+                    timings[kind].append(time.perf_counter() - started)
+                request_finished()
+
+        elapsed = run_threads(
+            worker, options['readers'] + options['writers']
+        )
+
+        for kind in ('read', 'write'):
+            durations = timings[kind] or [0.0]
+            self.stdout.write(
+                '%-6s %-5s %8.1f ops/s  p50 %7.3f ms  p95 %7.3f ms  '
+                'p99 %7.3f ms' % (
+                    name, kind,
+                    len(timings[kind]) / elapsed,
+                    percentile(durations, 50) * 1000,
+                    percentile(durations, 95) * 1000,
+                    percentile(durations, 99) * 1000
+                )
+            )
+        self.stdout.write('%-6s errors %d' % (name, len(errors)))
@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from evaluation.benchmark import benchmark_environment, seed_dataset
+from evaluation.models import Review
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare review summaries stored plain and compressed on an on-disk '
+        'database: size of the review table, seeding time and read time.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reviews', type=int, default=50000,
+            help='Number of reviews seeded for each run.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Seed of the dataset.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=3,
+            help='Number of times each read is timed; the best is kept.'
+        )
+        parser.add_argument(
+            '--output', help='Write the results to this JSON file.'
+        )
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp()
+        results = {}
+        try:
+            for name, enabled in (('plain', False), ('compressed', True)):
+                config = dict(
+                    settings.REVIEWS_SUMMARY_COMPRESSION, ENABLED=enabled
+                )
+                database_file = os.path.join(workdir, '%s.sqlite3' % name)
+                with override_settings(REVIEWS_SUMMARY_COMPRESSION=config), \
+                        benchmark_environment(database_file=database_file):
+                    results[name] = self.run_benchmark(options)
+                self.stdout.write(
+                    '%-10s  table %7.2f MB  seed %6.2f s  read %6.3f s  '
+                    'read without summary %6.3f s' % (
+                        name, results[name]['table_bytes'] / 1e6,
+                        results[name]['seed_seconds'],
+                        results[name]['read_seconds'],
+                        results[name]['read_titles_seconds']
+                    )
+                )
+        finally:
+            shutil.rmtree(workdir)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+
+    def run_benchmark(self, options):
+        started = time.perf_counter()
+        seed_dataset(10, options['reviews'], 100, seed=options['seed'])
+        seed_seconds = time.perf_counter() - started
+
+        def read_summaries():
+            for review in Review.objects.iterator(chunk_size=2000):
+                review.summary
+
+        def read_titles():
+            for review in Review.objects.only('id', 'title').iterator(
+                chunk_size=2000
+            ):
+                review.title
+
+        return {
+            'table_bytes': self.table_size('evaluation_review'),
+            'seed_seconds': seed_seconds,
+            'read_seconds': self.best_time(read_summaries, options['repeat']),
+            'read_titles_seconds': self.best_time(
+                read_titles, options['repeat']
+            ),
+        }
+
+    def table_size(self, table):
+        """Bytes used by the table itself, without its indexes."""
+        with connection.cursor() as cursor:
+            cursor.execute('VACUUM')
+            try:
+                cursor.execute(
+                    'SELECT SUM(pgsize) FROM dbstat WHERE name = %s', [table]
+                )
+                return cursor.fetchone()[0]
+            except Exception:
+                # SQLite built without dbstat: fall back to the file size.
+                cursor.execute('PRAGMA page_count')
+                page_count = cursor.fetchone()[0]
+                cursor.execute('PRAGMA page_size')
+                return page_count * cursor.fetchone()[0]
+
+    def best_time(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
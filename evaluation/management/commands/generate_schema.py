@@ -0,0 +1,40 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from evaluation import schema
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate the OpenAPI schema of the API, stamped with the code '
+        'version, into the file served at /api/docs/openapi.json.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=settings.REVIEWS_API_SCHEMA['FILE'],
+            help="Path of the schema file. Defaults to "
+                 "REVIEWS_API_SCHEMA['FILE']."
+        )
+        parser.add_argument(
+            '--format', choices=sorted(schema.CODECS),
+            help='Encoding of the schema. Defaults to the extension of the '
+                 'output file, or json. Only JSON files are served.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['output']
+        format = options['format']
+        if format is None:
+            extension = os.path.splitext(path)[1].lstrip('.').lower()
+            format = 'yaml' if extension in ('yaml', 'yml') else 'json'
+
+        version = schema.code_version()
+        content = schema.encode(schema.generate(), version, format)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Wrote the %s schema of code version %s to %s (%d bytes).'
+            % (format.upper(), version, path, len(content))
+        ))
@@ -0,0 +1,330 @@
+import csv
+import json
+import os
+import time
+from collections import Counter, defaultdict, deque
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from evaluation import companies, search, services
+from evaluation.models import Review
+from evaluation.serializers import ReviewWriteSerializer
+
+FORMATS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+
+class UsernameCache:
+    """
+    Username to user id lookups, resolved with one query per batch of new
+    usernames and kept for the whole run. Unknown usernames map to None.
+    """
+
+    def __init__(self):
+        self.ids = {}
+
+    def load(self, usernames):
+        missing = {
+            name for name in usernames
+            if isinstance(name, str) and name not in self.ids
+        }
+        if not missing:
+            return
+        self.ids.update(dict.fromkeys(missing))
+        missing = list(missing)
+        for start in range(0, len(missing), 500):
+            self.ids.update(User.objects.filter(
+                username__in=missing[start:start + 500]
+            ).values_list('username', 'id'))
+
+    def get(self, username):
+        if not isinstance(username, str):
+            return None
+        return self.ids.get(username)
+
+
+class Command(BaseCommand):
+    help = (
+        'Import reviews from a CSV file with a header line or from an NDJSON '
+        'file. Each row has the username of its author, title, summary, '
+        'rating and company, and optionally ip_address and date. Rows are '
+        'validated like POST /api/reviews/ and stored in batches; rejected '
+        'rows are written to a side file. An interrupted import continues '
+        'from its checkpoint file when run again, without storing the rows '
+        'of an interrupted batch twice.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or NDJSON file to import.')
+        parser.add_argument(
+            '--format', choices=sorted(set(FORMATS.values())),
+            help='Input format. Defaults to the one of the file extension.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of rows stored per transaction.'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Checkpoint file. Defaults to <path>.checkpoint.'
+        )
+        parser.add_argument(
+            '--rejects',
+            help='File receiving the rejected rows as NDJSON. Defaults to '
+                 '<path>.rejects.'
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help='Ignore an existing checkpoint and import from the start.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['format'] or FORMATS.get(
+            os.path.splitext(path)[1].lower()
+        )
+        if input_format is None:
+            raise CommandError(
+                'Cannot tell the format of %s, pass --format.' % path
+            )
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+        if not os.path.exists(path):
+            raise CommandError('%s does not exist.' % path)
+
+        checkpoint_path = options['checkpoint'] or path + '.checkpoint'
+        rejects_path = options['rejects'] or path + '.rejects'
+        state = {'rows': 0, 'created': 0, 'rejected': 0}
+        if not options['restart']:
+            state.update(self.read_checkpoint(checkpoint_path))
+        if state['rows']:
+            self.stdout.write('Resuming after row %d.' % state['rows'])
+        if 'last_id' not in state:
+            state['last_id'] = search.last_review_id()
+            self.write_checkpoint(checkpoint_path, state)
+        # The batch following the checkpoint may have been committed by an
+        # interrupted run, see skip_stored().
+        self.checked_after_id = state['last_id']
+
+        self.serializer = ReviewWriteSerializer()
+        self.usernames = UsernameCache()
+        ip_address_field = Review._meta.get_field('ip_address')
+        self.clean_ip_address = lambda value: ip_address_field.clean(
+            value, None
+        )
+
+        started = time.monotonic()
+        imported = 0
+        mode = 'a' if state['rows'] else 'w'
+        with open(path, newline='', encoding='utf-8') as source, \
+                open(rejects_path, mode, encoding='utf-8') as rejects:
+            batch = []
+            for number, row in self.read_rows(source, input_format):
+                if number <= state['rows']:
+                    continue
+                batch.append((number, row))
+                if len(batch) < options['batch_size']:
+                    continue
+                self.store(batch, state, rejects, checkpoint_path)
+                imported += len(batch)
+                batch = []
+                self.report(state, imported, started)
+            if batch:
+                self.store(batch, state, rejects, checkpoint_path)
+                imported += len(batch)
+                self.report(state, imported, started)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Imported %d reviews, rejected %d (see %s).' % (
+                state['created'], state['rejected'], rejects_path
+            )
+        ))
+
+    def read_rows(self, source, input_format):
+        """Yield `(row number, row)`; rows that cannot be parsed are strings."""
+        if input_format == 'csv':
+            yield from enumerate(csv.DictReader(source), 1)
+            return
+        number = 0
+        for line in source:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = line.rstrip('\n')
+            yield number, row
+
+    def read_checkpoint(self, checkpoint_path):
+        try:
+            with open(checkpoint_path, encoding='utf-8') as checkpoint:
+                return json.load(checkpoint)
+        except FileNotFoundError:
+            return {}
+
+    def write_checkpoint(self, checkpoint_path, state):
+        temporary_path = checkpoint_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as checkpoint:
+            json.dump(state, checkpoint)
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+        os.replace(temporary_path, checkpoint_path)
+
+    def store(self, batch, state, rejects, checkpoint_path):
+        self.usernames.load(
+            row.get('username') for _, row in batch if isinstance(row, dict)
+        )
+        reviews = []
+        for number, row in batch:
+            try:
+                reviews.append(self.build_review(row))
+            except ValidationError as error:
+                rejects.write(json.dumps({
+                    'row': number, 'data': row, 'errors': error.detail
+                }) + '\n')
+        rejects.flush()
+
+        # One lookup for the companies of the whole batch.
+        names = companies.get_companies(
+            review.company_name for review in reviews
+        )
+        for review in reviews:
+            review.company = names[review.company_name]
+
+        accepted = len(reviews)
+        with transaction.atomic():
+            if self.checked_after_id is not None:
+                reviews = self.skip_stored(reviews, self.checked_after_id)
+                self.checked_after_id = None
+            last_id = search.last_review_id()
+            services.bulk_create_reviews(reviews)
+            self.restore_dates(reviews, last_id)
+            state['last_id'] = search.last_review_id()
+
+        state['rows'] = batch[-1][0]
+        state['created'] += accepted
+        state['rejected'] += len(batch) - accepted
+        self.write_checkpoint(checkpoint_path, state)
+
+    def build_review(self, row):
+        if not isinstance(row, dict):
+            raise ValidationError({
+                'non_field_errors': ['Expected a JSON object.']
+            })
+
+        errors = {}
+        try:
+            # One serializer validates every row: building its fields again
+            # for each of millions of rows would dominate the import.
+            validated_data = self.serializer.run_validation(row)
+        except ValidationError as error:
+            validated_data = {}
+            errors.update(error.detail)
+
+        user_id = self.usernames.get(row.get('username'))
+        if user_id is None:
+            errors['username'] = ['Unknown user.']
+
+        ip_address = row.get('ip_address') or None
+        if ip_address is not None:
+            try:
+                ip_address = self.clean_ip_address(ip_address)
+            except DjangoValidationError as error:
+                errors['ip_address'] = error.messages
+
+        date = row.get('date') or None
+        if date is not None:
+            try:
+                date = parse_datetime(date)
+            except (TypeError, ValueError):
+                date = None
+            if date is None:
+                errors['date'] = ['Enter a valid ISO 8601 date and time.']
+            elif timezone.is_naive(date):
+                date = timezone.make_aware(date)
+
+        if errors:
+            raise ValidationError(errors)
+
+        # The company is resolved by store() for the whole batch.
+        company_name = validated_data.pop('company')
+        review = Review(
+            user_id=user_id,
+            ip_address=ip_address,
+            **validated_data
+        )
+        review.company_name = company_name
+        # `date` is set to the current time on insert, see restore_dates().
+        review.imported_date = date
+        return review
+
+    def inserted_ids(self, reviews, last_id):
+        """
+        The ids of `reviews`, inserted after `last_id` in this transaction.
+        bulk_create does not set them on SQLite, so the new rows are
+        matched on their author and content fingerprint; rows sharing both
+        got ascending ids in insertion order.
+        """
+        ids = defaultdict(deque)
+        for review_id, user_id, fingerprint in Review.objects.filter(
+            id__gt=last_id
+        ).order_by('id').values_list('id', 'user_id', 'fingerprint'):
+            ids[user_id, fingerprint].append(review_id)
+        return [
+            ids[review.user_id, review.fingerprint].popleft()
+            for review in reviews
+        ]
+
+    def restore_dates(self, reviews, last_id):
+        """
+        Give the reviews inserted after `last_id` the dates of their rows.
+        `Review.date` has auto_now, so the insert stored the current time;
+        `bulk_update` writes the given values without applying it.
+        """
+        if all(review.imported_date is None for review in reviews):
+            return
+        dated = []
+        for review_id, review in zip(
+            self.inserted_ids(reviews, last_id), reviews
+        ):
+            if review.imported_date is None:
+                continue
+            review.pk = review_id
+            review.date = review.imported_date
+            dated.append(review)
+        Review.objects.bulk_update(dated, ['date'])
+
+    def skip_stored(self, reviews, after_id):
+        """
+        Leave out the reviews an interrupted run already stored: it may
+        have committed the batch after `after_id` without checkpointing it.
+        """
+        stored = Counter(Review.objects.filter(id__gt=after_id).values_list(
+            'user_id', 'fingerprint'
+        ).iterator())
+        remaining = []
+        for review in reviews:
+            review.set_fingerprint()
+            key = review.user_id, review.fingerprint
+            if stored[key]:
+                stored[key] -= 1
+            else:
+                remaining.append(review)
+        return remaining
+
+    def report(self, state, imported, started):
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            'Row %d: imported %d, rejected %d (%.0f rows/s)' % (
+                state['rows'], state['created'], state['rejected'],
+                imported / elapsed if elapsed else 0
+            )
+        )
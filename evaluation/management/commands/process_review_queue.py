@@ -0,0 +1,47 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from evaluation import ingest
+
+
+class Command(BaseCommand):
+    help = (
+        'Store the reviews accepted by the asynchronous ingestion queue, '
+        'in large transactional batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Reviews stored per transaction. Defaults to '
+                 "REVIEWS_INGEST['BATCH_SIZE']."
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the queue once and exit instead of polling it.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Seconds to wait between polls of an empty queue.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            try:
+                created, rejected = ingest.drain(options['batch_size'])
+            except ingest.WorkerBusy as error:
+                raise CommandError(str(error))
+
+            if created or rejected:
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    'Created %d reviews, rejected %d (%.0f reviews/s)' % (
+                        created, rejected,
+                        (created + rejected) / elapsed if elapsed else 0
+                    )
+                )
+
+            if options['once']:
+                return
+            if not created and not rejected:
+                time.sleep(options['interval'])
@@ -0,0 +1,227 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+FIRST_REQUEST_MARKER = 'profile_startup: first request'
+
+# Run in a fresh interpreter under `-X importtime`, which writes one line per
+# imported module to stderr.
+STARTUP_SCRIPT = '''
+import json
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+started = time.perf_counter()
+from ca_arthur_trial.wsgi import application
+loaded = time.perf_counter()
+print(%(marker)r, file=sys.stderr, flush=True)
+
+environ = {'PATH_INFO': %(path)r, 'HTTP_HOST': %(host)r}
+setup_testing_defaults(environ)
+statuses = []
+response = application(
+    environ, lambda status, headers, exc_info=None: statuses.append(status)
+)
+b''.join(response)
+response.close()
+answered = time.perf_counter()
+
+print(json.dumps({
+    'status': statuses[0],
+    'load_ms': (loaded - started) * 1000,
+    'first_request_ms': (answered - loaded) * 1000,
+}))
+'''
+
+
+def parse_import_times(lines):
+    """
+    Parse `-X importtime` output into `{module: (self_us, cumulative_us,
+    phase)}`, where phase is 'load' before FIRST_REQUEST_MARKER and
+    'first_request' after it.
+    """
+    modules = {}
+    phase = 'load'
+    for line in lines:
+        if line == FIRST_REQUEST_MARKER:
+            phase = 'first_request'
+            continue
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # the header line
+        modules[fields[2].strip()] = (self_us, cumulative_us, phase)
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Start the WSGI application in fresh processes and report the time '
+        'to load it, the time to answer its first request and the modules '
+        'that take longest to import. Optionally save the results as JSON '
+        'and fail when they regressed against a saved baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs', type=int, default=5,
+            help='Number of processes started. Times are their median.'
+        )
+        parser.add_argument(
+            '--path', default='/api/reviews/',
+            help='Path of the first request.'
+        )
+        parser.add_argument(
+            '--host', default='localhost',
+            help='Host header of the first request, one of ALLOWED_HOSTS.'
+        )
+        parser.add_argument(
+            '--top', type=int, default=20,
+            help='Number of modules and packages listed.'
+        )
+        parser.add_argument(
+            '--output', help='Write the results to this JSON file.'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON file written by a previous run with --output. The '
+                 'command fails if startup got slower than it.'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Fraction by which the times may be worse than the baseline.'
+        )
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1.')
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as source:
+                baseline = json.load(source)
+
+        runs = [self.start(options) for _ in range(options['runs'])]
+        results = self.summarize(runs)
+        self.report(results, options['top'])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+
+        if baseline is None:
+            return
+        regressions = []
+        for metric in ('load_ms', 'first_request_ms', 'total_ms'):
+            if results[metric] > baseline[metric] * (1 + options['tolerance']):
+                regressions.append('%s %.1f > baseline %.1f' % (
+                    metric, results[metric], baseline[metric]
+                ))
+        for regression in regressions:
+            self.stderr.write(regression)
+        if regressions:
+            raise CommandError(
+                '%d regressions against %s.'
+                % (len(regressions), options['baseline'])
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'No regression against %s.' % options['baseline']
+        ))
+
+    def start(self, options):
+        script = STARTUP_SCRIPT % {
+            'marker': FIRST_REQUEST_MARKER,
+            'path': options['path'],
+            'host': options['host'],
+        }
+        env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE=os.environ.get(
+                'DJANGO_SETTINGS_MODULE', 'ca_arthur_trial.settings'
+            ),
+            PYTHONPATH=os.pathsep.join(
+                [settings.BASE_DIR] + [
+                    path for path in
+                    os.environ.get('PYTHONPATH', '').split(os.pathsep) if path
+                ]
+            ),
+        )
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True
+        )
+        if process.returncode != 0:
+            raise CommandError(
+                'The application failed to start:\n%s' % process.stderr
+            )
+        run = json.loads(process.stdout.strip().splitlines()[-1])
+        run['modules'] = parse_import_times(process.stderr.splitlines())
+        return run
+
+    def summarize(self, runs):
+        modules = defaultdict(list)
+        for run in runs:
+            for name, (self_us, cumulative_us, phase) in run['modules'].items():
+                modules[name].append((self_us, cumulative_us, phase))
+
+        results = {
+            'runs': len(runs),
+            'status': runs[-1]['status'],
+            'load_ms': statistics.median(run['load_ms'] for run in runs),
+            'first_request_ms': statistics.median(
+                run['first_request_ms'] for run in runs
+            ),
+            'modules': {
+                name: {
+                    'self_ms': statistics.median(
+                        times[0] for times in samples
+                    ) / 1000,
+                    'cumulative_ms': statistics.median(
+                        times[1] for times in samples
+                    ) / 1000,
+                    'phase': samples[-1][2],
+                }
+                for name, samples in modules.items()
+            },
+        }
+        results['total_ms'] = results['load_ms'] + results['first_request_ms']
+        return results
+
+    def report(self, results, top):
+        self.stdout.write(
+            'Loaded the application in %.1f ms, answered the first request '
+            '(%s) in %.1f ms: %.1f ms in total, median of %d runs.' % (
+                results['load_ms'], results['status'],
+                results['first_request_ms'], results['total_ms'],
+                results['runs']
+            )
+        )
+
+        modules = results['modules']
+        packages = defaultdict(float)
+        for name, module in modules.items():
+            packages[name.split('.')[0]] += module['self_ms']
+
+        self.stdout.write('\nImport time by top-level package:')
+        for name, self_ms in sorted(
+            packages.items(), key=lambda item: -item[1]
+        )[:top]:
+            self.stdout.write('%9.1f ms  %s' % (self_ms, name))
+
+        self.stdout.write('\nSlowest modules (self, cumulative, imported by):')
+        for name, module in sorted(
+            modules.items(), key=lambda item: -item[1]['self_ms']
+        )[:top]:
+            self.stdout.write('%9.1f ms %9.1f ms  %-13s  %s' % (
+                module['self_ms'], module['cumulative_ms'],
+                module['phase'], name
+            ))
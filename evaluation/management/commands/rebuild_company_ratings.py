@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from evaluation.models import Company, CompanyRatingSummary
+from evaluation.services import RATING_SUMMARY_FIELDS, compute_company_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the per-company rating summaries from the live and '
+        'archived reviews and report any drift from the stored values.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report drift, without rewriting the summaries. '
+                 'Exits with an error if any company drifted.'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            expected = compute_company_ratings()
+            stored = {
+                summary.company_id: summary
+                for summary in CompanyRatingSummary.objects.all()
+            }
+
+            drifted = sorted(
+                company_id for company_id in set(expected) | set(stored)
+                if self.values(expected.get(company_id))
+                != self.values(stored.get(company_id))
+            )
+            companies = Company.objects.in_bulk(drifted)
+            for company_id in drifted:
+                self.stdout.write('%s: stored %s, expected %s' % (
+                    companies[company_id],
+                    self.values(stored.get(company_id)),
+                    self.values(expected.get(company_id))
+                ))
+
+            if options['check']:
+                if drifted:
+                    raise CommandError(
+                        '%d company rating summaries drifted.' % len(drifted)
+                    )
+                self.stdout.write(self.style.SUCCESS(
+                    'All %d company rating summaries are consistent.'
+                    % len(stored)
+                ))
+                return
+
+            CompanyRatingSummary.objects.all().delete()
+            CompanyRatingSummary.objects.bulk_create(
+                expected.values(), batch_size=500
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            'Rebuilt %d company rating summaries (%d had drifted).'
+            % (len(expected), len(drifted))
+        ))
+
+    @staticmethod
+    def values(summary):
+        if summary is None:
+            return None
+        return tuple(getattr(summary, field) for field in RATING_SUMMARY_FIELDS)
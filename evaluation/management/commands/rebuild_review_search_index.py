@@ -0,0 +1,117 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from evaluation import search
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the full-text search index of reviews in batches. Reviews '
+        'saved while it runs are indexed as they are saved. With --check or '
+        '--repair, only compare the index with the reviews, e.g. after '
+        'writing reviews from dbshell or with QuerySet.update().'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of reviews indexed per transaction.'
+        )
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
+            '--check', action='store_true',
+            help='Only report stale and orphaned index entries. Exits with '
+                 'an error if there are any.'
+        )
+        mode.add_argument(
+            '--repair', action='store_true',
+            help='Only rewrite the stale index entries and delete the '
+                 'orphaned ones, instead of rebuilding the whole index.'
+        )
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError(
+                'Full-text search requires the SQLite database backend.'
+            )
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+        if options['check'] or options['repair']:
+            self.compare(batch_size, options['repair'])
+            return
+
+        table = search.FTS_TABLE
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Anything above the current maximum id is indexed when it is
+            # saved, so only rows up to it have to be copied here.
+            cursor.execute('DELETE FROM %s' % table)
+            cursor.execute('SELECT MAX(id) FROM evaluation_review')
+            max_id = cursor.fetchone()[0] or 0
+
+        started = time.monotonic()
+        last_id = 0
+        indexed = 0
+        while last_id < max_id:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT MAX(id), COUNT(*) FROM ('
+                    'SELECT id FROM evaluation_review '
+                    'WHERE id > %s AND id <= %s ORDER BY id LIMIT %s)',
+                    [last_id, max_id, batch_size]
+                )
+                upper_id, rows = cursor.fetchone()
+                if not rows:
+                    break
+                search.index_reviews_after(last_id, upper_id, batch_size)
+
+            last_id = upper_id
+            indexed += rows
+            elapsed = time.monotonic() - started
+            self.stdout.write('Indexed %d reviews (%.0f reviews/s)' % (
+                indexed, indexed / elapsed if elapsed else 0
+            ))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO {table} ({table}) VALUES ('optimize')".format(
+                    table=table
+                )
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            'Search index rebuilt with %d reviews.' % indexed
+        ))
+
+    def compare(self, batch_size, repair):
+        stale = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                last_id, entries = search.find_stale_entries(
+                    last_id, batch_size
+                )
+                if last_id is None:
+                    break
+                if repair:
+                    search.repair_entries(entries)
+            stale += len(entries)
+        with transaction.atomic():
+            orphaned_ids = search.find_orphaned_entries()
+            if repair:
+                search.repair_entries(orphaned_ids=orphaned_ids)
+
+        if repair:
+            self.stdout.write(self.style.SUCCESS(
+                'Repaired %d stale and %d orphaned search index entries.'
+                % (stale, len(orphaned_ids))
+            ))
+        elif stale or orphaned_ids:
+            raise CommandError(
+                '%d search index entries are stale and %d orphaned.'
+                % (stale, len(orphaned_ids))
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                'The search index is consistent.'
+            ))
@@ -0,0 +1,82 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from evaluation import subnets
+
+
+class Command(BaseCommand):
+    help = (
+        'List the reviews sent from a subnet, e.g. 203.0.113.0/24 or '
+        '2001:db8::/64, or with --top the subnets that sent the most '
+        'reviews, over the last --hours hours. Both are answered from the '
+        '(packed_ip, date) index.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'network', nargs='?',
+            help='Subnet to list the reviews of; host bits are ignored.'
+        )
+        parser.add_argument(
+            '--top', type=int,
+            help='List this many subnets with the most reviews instead.'
+        )
+        parser.add_argument(
+            '--hours', type=float, default=24.0,
+            help='Only count reviews from the last this many hours.'
+        )
+        parser.add_argument(
+            '--ipv4-prefix', type=int, default=24,
+            help='Prefix length of the IPv4 subnets listed by --top.'
+        )
+        parser.add_argument(
+            '--ipv6-prefix', type=int, default=64,
+            help='Prefix length of the IPv6 subnets listed by --top.'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=100,
+            help='Most reviews listed for a subnet, newest first.'
+        )
+
+    def handle(self, *args, **options):
+        if (options['network'] is None) == (options['top'] is None):
+            raise CommandError('Pass either a network or --top.')
+        if options['hours'] <= 0:
+            raise CommandError('--hours must be positive.')
+        since = timezone.now() - datetime.timedelta(hours=options['hours'])
+
+        if options['top'] is not None:
+            self.list_top_subnets(since, options)
+        else:
+            self.list_reviews(since, options)
+
+    def list_top_subnets(self, since, options):
+        if options['top'] < 1:
+            raise CommandError('--top must be positive.')
+        try:
+            top = subnets.top_subnets(
+                since, options['top'],
+                options['ipv4_prefix'], options['ipv6_prefix']
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        for network, count in top:
+            self.stdout.write('%8d  %s' % (count, network))
+
+    def list_reviews(self, since, options):
+        try:
+            network = subnets.parse_network(options['network'])
+        except ValueError as error:
+            raise CommandError(error)
+        reviews = subnets.reviews_in_network(network, since)
+        count = reviews.count()
+        for review in reviews.order_by('-date').only(
+            'id', 'user_id', 'ip_address', 'date', 'title'
+        )[:options['limit']]:
+            self.stdout.write('%d\t%s\t%s\tuser %d\t%s' % (
+                review.id, review.date.isoformat(), review.ip_address,
+                review.user_id, review.title
+            ))
+        self.stdout.write('%d reviews from %s since %s.' % (
+            count, network, since.isoformat()
+        ))
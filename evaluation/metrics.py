@@ -0,0 +1,120 @@
+"""
+Prometheus metrics of the service, served at /metrics.
+
+Every WSGI worker process updates its own in-memory values. When
+`REVIEWS_METRICS['MULTIPROCESS_DIR']` is set, prometheus_client keeps
+them in memory-mapped files in that directory instead, and /metrics adds
+up the files of every worker. The directory must be shared by the
+workers and emptied before the server starts.
+"""
+import atexit
+import os
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+if settings.REVIEWS_METRICS['MULTIPROCESS_DIR']:
+    # prometheus_client picks its storage from the environment on import.
+    os.environ.setdefault(
+        'prometheus_multiproc_dir', settings.REVIEWS_METRICS['MULTIPROCESS_DIR']
+    )
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+requests_total = Counter(
+    'reviews_http_requests_total',
+    'HTTP requests by URL name, method and status code.',
+    ['view', 'method', 'status']
+)
+request_duration = Histogram(
+    'reviews_http_request_duration_seconds',
+    'HTTP request latency by URL name and method.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS
+)
+requests_in_flight = Gauge(
+    'reviews_http_requests_in_flight',
+    'HTTP requests being processed.',
+    multiprocess_mode='livesum'
+)
+db_queries_total = Counter(
+    'reviews_db_queries_total',
+    'SQL queries run by HTTP requests, by URL name.',
+    ['view']
+)
+db_query_seconds_total = Counter(
+    'reviews_db_query_seconds_total',
+    'Time spent in SQL queries run by HTTP requests, by URL name.',
+    ['view']
+)
+auth_failures_total = Counter(
+    'reviews_auth_failures_total',
+    'Requests rejected with 401, by URL name.',
+    ['view']
+)
+throttled_total = Counter(
+    'reviews_throttled_total',
+    'Requests rejected with 429, by throttle scope and bucket kind.',
+    ['scope', 'kind']
+)
+reviews_created_total = Counter(
+    'reviews_created_total',
+    'Reviews stored.'
+)
+
+
+def is_enabled():
+    return settings.REVIEWS_METRICS['ENABLED']
+
+
+def is_authorized(request):
+    """
+    Whether a request may read the metrics: it comes from a logged-in staff
+    user, or sends `REVIEWS_METRICS['TOKEN']` as a bearer token.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return True
+    token = settings.REVIEWS_METRICS['TOKEN']
+    scheme, _, credentials = request.META.get(
+        'HTTP_AUTHORIZATION', ''
+    ).partition(' ')
+    if not token or scheme.lower() != 'bearer':
+        return False
+    return constant_time_compare(credentials.strip(), token)
+
+
+def is_multiprocess():
+    return 'prometheus_multiproc_dir' in os.environ
+
+
+def register_worker():
+    """
+    Let the metrics of this worker process's live gauges go when it exits.
+    Called from the WSGI entry point of every worker.
+    """
+    if is_multiprocess():
+        atexit.register(
+            lambda: multiprocess.mark_process_dead(os.getpid())
+        )
+
+
+def render():
+    """Return the exposition of all metrics and its content type."""
+    registry = REGISTRY
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
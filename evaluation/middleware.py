@@ -0,0 +1,249 @@
+import itertools
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from evaluation import compression, metrics, timing
+
+logger = logging.getLogger('evaluation.timing')
+
+# Order of the metrics in the Server-Timing header and the log line.
+METRICS = ('total', 'view', 'auth', 'db', 'serialize', 'render')
+
+# Methods used as metric labels; anything else is counted as `other`.
+HTTP_METHODS = frozenset((
+    'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'
+))
+
+
+class ServerTimingMiddleware:
+    """
+    Measure a sample of the requests, as configured by
+    `REVIEWS_SERVER_TIMING`: total, view, authentication, database,
+    serialization and rendering time plus the number of queries. Report
+    them in a `Server-Timing` header and as a JSON line on the
+    `evaluation.timing` logger.
+
+    Place it second in MIDDLEWARE, right after `MetricsMiddleware`, so
+    `total` covers the other middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = settings.REVIEWS_SERVER_TIMING
+        if not config['ENABLED'] or random.random() >= config['SAMPLE_RATE']:
+            return self.get_response(request)
+
+        timings = timing.Timings()
+        query_timer = timing.QueryTimer(timings)
+        started = time.perf_counter()
+        with timing.recording(timings), ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_timer))
+            response = self.get_response(request)
+            self.view_finished(timings)
+        timings.add('total', time.perf_counter() - started)
+
+        if config['HEADER']:
+            self.set_header(response, timings)
+        if config['LOG']:
+            self.log(request, response, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = timing.current()
+        if timings is not None:
+            timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called between the view and the rendering of its response.
+        timings = timing.current()
+        if timings is None:
+            return response
+        self.view_finished(timings)
+        render_started = time.perf_counter()
+
+        def rendered(response):
+            timings.add('render', time.perf_counter() - render_started)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def view_finished(self, timings):
+        if timings.view_started is not None:
+            timings.add('view', time.perf_counter() - timings.view_started)
+            timings.view_started = None
+
+    def set_header(self, response, timings):
+        metrics = []
+        for name in METRICS:
+            if name not in timings.durations:
+                continue
+            metric = '%s;dur=%.3f' % (name, timings.durations[name] * 1000)
+            if name == 'db':
+                metric += ';desc="%d queries"' % timings.queries
+            metrics.append(metric)
+        if response.has_header('Server-Timing'):
+            metrics.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(metrics)
+
+    def log(self, request, response, timings):
+        match = request.resolver_match
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': timings.queries,
+        }
+        for name in METRICS:
+            record['%s_ms' % name] = round(
+                timings.durations.get(name, 0.0) * 1000, 3
+            )
+        logger.info(json.dumps(record))
+
+
+class MetricsMiddleware:
+    """
+    Count requests, their latency, the SQL queries they run and the
+    requests in flight in the Prometheus metrics of `evaluation.metrics`,
+    labelled by URL name (e.g. `evaluation:reviews-list`).
+
+    Place it first in MIDDLEWARE, before `ServerTimingMiddleware`, so the
+    latency covers the other middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not metrics.is_enabled():
+            return self.get_response(request)
+
+        timings = timing.Timings()
+        query_timer = timing.QueryTimer(timings)
+        metrics.requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(query_timer)
+                    )
+                response = self.get_response(request)
+        finally:
+            metrics.requests_in_flight.dec()
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        method = request.method if request.method in HTTP_METHODS else 'other'
+        metrics.requests_total.labels(
+            view, method, response.status_code
+        ).inc()
+        metrics.request_duration.labels(view, method).observe(duration)
+        if timings.queries:
+            metrics.db_queries_total.labels(view).inc(timings.queries)
+            metrics.db_query_seconds_total.labels(view).inc(
+                timings.durations['db']
+            )
+        if response.status_code == 401:
+            metrics.auth_failures_total.labels(view).inc()
+        return response
+
+
+class CompressionMiddleware:
+    """
+    gzip the responses of clients accepting it, as configured by
+    `REVIEWS_COMPRESSION`: responses of one of its CONTENT_TYPES and of at
+    least MIN_SIZE bytes, compressed at LEVEL. Streaming responses are
+    compressed as they are written; only their first MIN_SIZE bytes are
+    read ahead to decide whether compressing them is worth it. Responses
+    that embed or set a CSRF token are left alone, against BREACH.
+
+    Place it before any middleware that reads or changes the response body.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        config = settings.REVIEWS_COMPRESSION
+        if (
+            not config['ENABLED']
+            or response.has_header('Content-Encoding')
+            or self.uses_csrf_token(request, response)
+            or not compression.compressible(
+                response.get('Content-Type', ''), config['CONTENT_TYPES']
+            )
+        ):
+            return response
+
+        if response.streaming:
+            head, chunks = self.read_ahead(response, config['MIN_SIZE'])
+            if chunks is None:
+                # The whole body is shorter than MIN_SIZE.
+                response.streaming_content = head
+                return response
+            patch_vary_headers(response, ('Accept-Encoding',))
+            if not self.accepts_gzip(request):
+                response.streaming_content = itertools.chain(head, chunks)
+                return response
+            response.streaming_content = compression.compress_stream(
+                itertools.chain(head, chunks), config['LEVEL']
+            )
+            del response['Content-Length']
+        else:
+            if len(response.content) < config['MIN_SIZE']:
+                return response
+            patch_vary_headers(response, ('Accept-Encoding',))
+            if not self.accepts_gzip(request):
+                return response
+            content = compression.compress(response.content, config['LEVEL'])
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+
+        # The compressed body is no longer byte-for-byte the one the view's
+        # ETag was computed for.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = 'gzip'
+        return response
+
+    def uses_csrf_token(self, request, response):
+        # CSRF_COOKIE_USED is set by get_token(), e.g. for a form's token.
+        return (
+            request.META.get('CSRF_COOKIE_USED', False)
+            or settings.CSRF_COOKIE_NAME in response.cookies
+        )
+
+    def accepts_gzip(self, request):
+        return compression.accepts_gzip(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+
+    def read_ahead(self, response, size):
+        """
+        Read the first chunks of a streaming response until they add up to
+        `size` bytes. Return them with the iterator of the remaining chunks,
+        or with None if the body ended first.
+        """
+        chunks = iter(response.streaming_content)
+        head = []
+        length = 0
+        for chunk in chunks:
+            head.append(chunk)
+            length += len(chunk)
+            if length >= size:
+                return head, chunks
+        return head, None
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.6 on 2026-10-18 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluation', '0003_auto_20200601_0108'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'date', 'id'], name='review_user_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 3.0.6 on 2026-10-18 15:33
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_company_ratings(apps, schema_editor):
+    Review = apps.get_model('evaluation', 'Review')
+    CompanyRatingSummary = apps.get_model('evaluation', 'CompanyRatingSummary')
+    db_alias = schema_editor.connection.alias
+
+    summaries = {}
+    rows = Review.objects.using(db_alias).values('company', 'rating').annotate(
+        reviews=Count('id')
+    ).order_by()
+    for row in rows.iterator():
+        summary = summaries.setdefault(
+            row['company'], CompanyRatingSummary(company=row['company'])
+        )
+        summary.count += row['reviews']
+        summary.total += row['rating'] * row['reviews']
+        field = 'rating_%d' % row['rating']
+        setattr(summary, field, getattr(summary, field) + row['reviews'])
+
+    CompanyRatingSummary.objects.using(db_alias).bulk_create(
+        summaries.values(), batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluation', '0004_auto_20261018_1531'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyRatingSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company', models.CharField(max_length=100, unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(
+            populate_company_ratings, migrations.RunPython.noop
+        ),
+    ]
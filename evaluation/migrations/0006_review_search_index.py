@@ -0,0 +1,31 @@
+from django.db import migrations
+from evaluation.migrations._search_triggers import (
+    run_statements, trigger_statements
+)
+
+CREATE_SEARCH_INDEX = (
+    "CREATE VIRTUAL TABLE evaluation_review_fts USING fts5("
+    "title, summary, company, tokenize = 'unicode61 remove_diacritics 2')",
+    *trigger_statements('company'),
+)
+
+DROP_SEARCH_INDEX = (
+    "DROP TRIGGER IF EXISTS evaluation_review_fts_insert",
+    "DROP TRIGGER IF EXISTS evaluation_review_fts_update",
+    "DROP TRIGGER IF EXISTS evaluation_review_fts_delete",
+    "DROP TABLE IF EXISTS evaluation_review_fts",
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluation', '0005_companyratingsummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements(CREATE_SEARCH_INDEX),
+            run_statements(DROP_SEARCH_INDEX)
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.0.6 on 2026-10-18 15:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('evaluation', '0006_review_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestTicket',
+            fields=[
+                ('ticket', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('created', 'Created'), ('rejected', 'Rejected')], max_length=16)),
+                ('errors', models.TextField(blank=True)),
+                ('enqueued_at', models.DateTimeField()),
+                ('processed_at', models.DateTimeField(auto_now_add=True)),
+                ('review', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='evaluation.Review')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ingest_tickets', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
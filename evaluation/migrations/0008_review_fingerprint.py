@@ -0,0 +1,74 @@
+# Generated by Django 3.0.6 on 2026-10-18 15:55
+
+import hashlib
+import unicodedata
+from django.db import migrations, models, transaction
+from evaluation.migrations._search_triggers import create_triggers
+
+BATCH_SIZE = 2000
+
+
+def review_fingerprint(title, summary, company):
+    parts = (
+        ' '.join(unicodedata.normalize('NFKC', part).casefold().split())
+        for part in (title, summary, company)
+    )
+    return hashlib.sha256(
+        '\x1f'.join(parts).encode('utf-8')
+    ).hexdigest()[:32]
+
+
+def populate_fingerprints(apps, schema_editor):
+    """Fingerprint the existing reviews, in batched transactions."""
+    Review = apps.get_model('evaluation', 'Review')
+    db_alias = schema_editor.connection.alias
+    reviews = Review.objects.using(db_alias)
+    last_id = 0
+    while True:
+        with transaction.atomic(using=db_alias):
+            batch = list(
+                reviews.filter(id__gt=last_id).order_by('id').only(
+                    'id', 'title', 'summary', 'company'
+                )[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            for review in batch:
+                review.fingerprint = review_fingerprint(
+                    review.title, review.summary, review.company
+                )
+            reviews.bulk_update(batch, ['fingerprint'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+    # Fingerprints are backfilled in one transaction per batch.
+    atomic = False
+
+    dependencies = [
+        ('evaluation', '0007_ingestticket'),
+    ]
+
+    operations = [
+        # Runs last when unapplying, after RemoveField rebuilt the table.
+        migrations.RunPython(
+            migrations.RunPython.noop, create_triggers('company')
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='fingerprint',
+            field=models.CharField(default='', editable=False, max_length=32),
+        ),
+        migrations.RunPython(
+            populate_fingerprints, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'fingerprint', 'date'], name='review_user_fingerprint_idx'),
+        ),
+        # Rebuilding evaluation_review to add a column dropped its
+        # triggers: create the full-text search triggers of 0006 again.
+        migrations.RunPython(
+            create_triggers('company'), migrations.RunPython.noop
+        ),
+    ]
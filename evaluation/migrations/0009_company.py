@@ -0,0 +1,186 @@
+# Generated by Django 3.0.6 on 2026-10-18 17:02
+
+import unicodedata
+from collections import Counter
+from django.db import migrations, models, transaction
+from django.db.models import Count, OuterRef, Subquery
+import django.db.models.deletion
+from evaluation.migrations._search_triggers import create_triggers
+
+BATCH_SIZE = 2000
+QUERY_CHUNK_SIZE = 500
+
+
+def normalize_name(name):
+    return ' '.join(unicodedata.normalize('NFKC', name).split())
+
+
+def populate_companies(apps, schema_editor):
+    """
+    Point the existing reviews at their companies, created as they are
+    met, in batched transactions.
+    """
+    Company = apps.get_model('evaluation', 'Company')
+    Review = apps.get_model('evaluation', 'Review')
+    db_alias = schema_editor.connection.alias
+    companies = Company.objects.using(db_alias)
+    reviews = Review.objects.using(db_alias)
+
+    company_ids = {}
+    last_id = 0
+    while True:
+        with transaction.atomic(using=db_alias):
+            batch = list(
+                reviews.filter(id__gt=last_id).order_by('id').only(
+                    'id', 'company'
+                )[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            new = list({
+                normalize_name(review.company) for review in batch
+            }.difference(company_ids))
+            if new:
+                companies.bulk_create([Company(name=name) for name in new])
+                for start in range(0, len(new), QUERY_CHUNK_SIZE):
+                    company_ids.update(companies.filter(
+                        name__in=new[start:start + QUERY_CHUNK_SIZE]
+                    ).values_list('name', 'id'))
+            for review in batch:
+                review.company_ref_id = company_ids[
+                    normalize_name(review.company)
+                ]
+            reviews.bulk_update(batch, ['company_ref'])
+        last_id = batch[-1].id
+
+
+def restore_company_names(apps, schema_editor):
+    Company = apps.get_model('evaluation', 'Company')
+    Review = apps.get_model('evaluation', 'Review')
+    db_alias = schema_editor.connection.alias
+    Review.objects.using(db_alias).update(company=Subquery(
+        Company.objects.using(db_alias).filter(
+            id=OuterRef('company_ref_id')
+        ).values('name')[:1]
+    ))
+
+
+def rating_deltas(apps, schema_editor, company_field):
+    Review = apps.get_model('evaluation', 'Review')
+    rows = Review.objects.using(schema_editor.connection.alias).values(
+        company_field, 'rating'
+    ).annotate(reviews=Count('id')).values_list(
+        company_field, 'rating', 'reviews'
+    ).order_by()
+    deltas = {}
+    for company, rating, reviews in rows.iterator():
+        delta = deltas.setdefault(company, Counter())
+        delta['count'] += reviews
+        delta['total'] += rating * reviews
+        delta['rating_%d' % rating] += reviews
+    return deltas
+
+
+def populate_company_ratings(apps, schema_editor):
+    CompanyRatingSummary = apps.get_model('evaluation', 'CompanyRatingSummary')
+    deltas = rating_deltas(apps, schema_editor, 'company')
+    CompanyRatingSummary.objects.using(schema_editor.connection.alias).bulk_create([
+        CompanyRatingSummary(company_id=company_id, **delta)
+        for company_id, delta in deltas.items()
+    ], batch_size=500)
+
+
+def populate_company_name_ratings(apps, schema_editor):
+    CompanyRatingSummary = apps.get_model('evaluation', 'CompanyRatingSummary')
+    deltas = rating_deltas(apps, schema_editor, 'company__name')
+    CompanyRatingSummary.objects.using(schema_editor.connection.alias).bulk_create([
+        CompanyRatingSummary(company=name, **delta)
+        for name, delta in deltas.items()
+    ], batch_size=500)
+
+
+def delete_company_ratings(apps, schema_editor):
+    CompanyRatingSummary = apps.get_model('evaluation', 'CompanyRatingSummary')
+    CompanyRatingSummary.objects.using(
+        schema_editor.connection.alias
+    ).all().delete()
+
+
+class Migration(migrations.Migration):
+    # Companies are backfilled in one transaction per batch.
+    atomic = False
+
+    dependencies = [
+        ('evaluation', '0008_review_fingerprint'),
+    ]
+
+    operations = [
+        # Runs last when unapplying, after evaluation_review was rebuilt:
+        # restores the triggers of 0008.
+        migrations.RunPython(
+            migrations.RunPython.noop, create_triggers('company')
+        ),
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'companies',
+            },
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='company_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='evaluation.Company'),
+        ),
+        migrations.RunPython(populate_companies, restore_company_names),
+        # Lets unapplying the removal add the column back to existing rows,
+        # before restore_company_names fills it in.
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(
+                model_name='review',
+                name='company',
+                field=models.CharField(default='', max_length=100),
+            ),
+        ]),
+        migrations.RemoveField(
+            model_name='review',
+            name='company',
+        ),
+        migrations.RenameField(
+            model_name='review',
+            old_name='company_ref',
+            new_name='company',
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='reviews', to='evaluation.Company'),
+        ),
+        # Summaries are recomputed per company id: names that only differed
+        # before being normalized now belong to the same company.
+        migrations.RunPython(
+            delete_company_ratings, populate_company_name_ratings,
+            atomic=True
+        ),
+        migrations.RemoveField(
+            model_name='companyratingsummary',
+            name='company',
+        ),
+        migrations.AddField(
+            model_name='companyratingsummary',
+            name='company',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rating_summary', to='evaluation.Company'),
+        ),
+        migrations.RunPython(
+            populate_company_ratings, delete_company_ratings, atomic=True
+        ),
+        # Rebuilding evaluation_review dropped its triggers. Now that reviews
+        # point at evaluation_company, the full-text search triggers read
+        # the company name from there.
+        migrations.RunPython(
+            create_triggers('company_id'), migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.0.6 on 2026-10-18 17:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+from evaluation.migrations._search_triggers import create_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluation', '0009_company'),
+    ]
+
+    operations = [
+        # Runs last when unapplying, after AlterField rebuilt the table.
+        migrations.RunPython(
+            migrations.RunPython.noop, create_triggers('company_id')
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='company',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='reviews', to='evaluation.Company'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['date'], name='review_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['company', 'date'], name='review_company_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['rating', 'date'], name='review_rating_date_idx'),
+        ),
+        # Dropping the index of review.company rebuilt evaluation_review,
+        # which dropped its triggers: create those of 0009 again.
+        migrations.RunPython(
+            create_triggers('company_id'), migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.0.6 on 2026-10-18 18:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('evaluation', '0010_review_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedReview',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=64)),
+                ('summary', models.TextField(max_length=10000)),
+                ('rating', models.IntegerField()),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('date', models.DateTimeField()),
+                ('fingerprint', models.CharField(default='', editable=False, max_length=32)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_reviews', to='evaluation.Company')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_reviews', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedreview',
+            index=models.Index(fields=['user', 'date', 'id'], name='archived_user_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 3.0.6 on 2026-10-18 18:47
+
+from django.db import migrations, transaction
+import evaluation.fields
+from evaluation.migrations._search_triggers import create_triggers
+
+TABLES = ('evaluation_review', 'evaluation_archivedreview')
+BATCH_SIZE = 2000
+
+
+def convert_summaries(convert):
+    """
+    Rewrite the summaries of both tables with `convert`, which returns None
+    for values already in the wanted form, in batched transactions.
+    """
+    def run(apps, schema_editor):
+        connection = schema_editor.connection
+        for table in TABLES:
+            table = connection.ops.quote_name(table)
+            last_id = 0
+            while True:
+                with transaction.atomic(using=connection.alias), \
+                        connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT id, summary FROM %s WHERE id > %%s '
+                        'ORDER BY id LIMIT %%s' % table,
+                        [last_id, BATCH_SIZE]
+                    )
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    updates = []
+                    for review_id, summary in rows:
+                        value = convert(summary)
+                        if value is not None:
+                            updates.append((value, review_id))
+                    cursor.executemany(
+                        'UPDATE %s SET summary = %%s WHERE id = %%s' % table,
+                        updates
+                    )
+                last_id = rows[-1][0]
+    return run
+
+
+def compress(summary):
+    if isinstance(summary, str):
+        return evaluation.fields.compress_text(summary)
+    return None
+
+
+def decompress(summary):
+    if summary is None or isinstance(summary, str):
+        return None
+    return evaluation.fields.sql_text(summary)
+
+
+class Migration(migrations.Migration):
+    # Summaries are converted in one transaction per batch.
+    atomic = False
+
+    dependencies = [
+        ('evaluation', '0011_archivedreview'),
+    ]
+
+    operations = [
+        # Runs last when unapplying, after AlterField rebuilt the table:
+        # restores the triggers of 0010.
+        migrations.RunPython(
+            migrations.RunPython.noop, create_triggers('company_id')
+        ),
+        migrations.AlterField(
+            model_name='archivedreview',
+            name='summary',
+            field=evaluation.fields.CompressedTextField(max_length=10000),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='summary',
+            field=evaluation.fields.CompressedTextField(max_length=10000),
+        ),
+        migrations.RunPython(
+            convert_summaries(compress), convert_summaries(decompress)
+        ),
+        # AlterField rebuilt evaluation_review, which dropped its triggers.
+        # Only the one removing deleted reviews is created again: triggers
+        # cannot decompress summaries, so the application writes the index.
+        migrations.RunPython(
+            create_triggers(), migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 3.0.6 on 2026-10-18 18:53
+
+from django.db import migrations, models, transaction
+import evaluation.fields
+from evaluation.migrations._search_triggers import create_triggers
+
+TABLES = ('evaluation_review', 'evaluation_archivedreview')
+BATCH_SIZE = 2000
+
+
+def backfill_packed_ips(apps, schema_editor):
+    """Pack the addresses of existing rows, in batched transactions."""
+    connection = schema_editor.connection
+    for table in TABLES:
+        table = connection.ops.quote_name(table)
+        last_id = 0
+        while True:
+            with transaction.atomic(using=connection.alias), \
+                    connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT id, ip_address FROM %s WHERE id > %%s '
+                    'ORDER BY id LIMIT %%s' % table,
+                    [last_id, BATCH_SIZE]
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                cursor.executemany(
+                    'UPDATE %s SET packed_ip = %%s WHERE id = %%s' % table,
+                    [
+                        (evaluation.fields.pack_ip(ip_address), review_id)
+                        for review_id, ip_address in rows
+                        if ip_address
+                    ]
+                )
+            last_id = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+    # Addresses are backfilled in one transaction per batch.
+    atomic = False
+
+    dependencies = [
+        ('evaluation', '0012_compressed_summary'),
+    ]
+
+    operations = [
+        # Runs last when unapplying, after RemoveField rebuilt the table.
+        migrations.RunPython(
+            migrations.RunPython.noop, create_triggers()
+        ),
+        migrations.AddField(
+            model_name='archivedreview',
+            name='packed_ip',
+            field=evaluation.fields.PackedIPAddressField(max_length=16, null=True, source='ip_address'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='packed_ip',
+            field=evaluation.fields.PackedIPAddressField(max_length=16, null=True, source='ip_address'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['packed_ip', 'date'], name='review_packed_ip_date_idx'),
+        ),
+        migrations.RunPython(
+            backfill_packed_ips, migrations.RunPython.noop
+        ),
+        # Adding the columns rebuilt evaluation_review, which dropped its
+        # triggers: create the one of 0012 again.
+        migrations.RunPython(
+            create_triggers(), migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,71 @@
+"""
+Full-text search triggers of `evaluation_review`, shared by its migrations.
+
+SQLite drops the triggers of a table it rebuilds, e.g. to add or alter a
+column, so the migrations rebuilding `evaluation_review` create them again
+afterwards, and before the rebuild when unapplied. The migration loader
+skips this module, as its name starts with an underscore.
+"""
+
+# How the insert and update triggers read the name of a review's company,
+# by the column holding it.
+COMPANY_NAMES = {
+    'company': 'new.company',
+    'company_id': (
+        '(SELECT name FROM evaluation_company WHERE id = new.company_id)'
+    ),
+}
+
+DELETE_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS evaluation_review_fts_delete "
+    "AFTER DELETE ON evaluation_review "
+    "BEGIN "
+    "DELETE FROM evaluation_review_fts WHERE rowid = old.id; "
+    "END"
+)
+
+
+def trigger_statements(company_column=None):
+    """
+    The statements creating the triggers that copy reviews storing their
+    company in `company_column` into `evaluation_review_fts`. Without a
+    column, only the trigger removing deleted reviews is created: from
+    0012 on, summaries are compressed and the application writes the
+    index, see `evaluation.search`.
+    """
+    statements = []
+    if company_column is not None:
+        company = COMPANY_NAMES[company_column]
+        statements += [
+            "CREATE TRIGGER IF NOT EXISTS evaluation_review_fts_insert "
+            "AFTER INSERT ON evaluation_review "
+            "BEGIN "
+            "INSERT INTO evaluation_review_fts (rowid, title, summary, "
+            "company) "
+            "VALUES (new.id, new.title, new.summary, %s); "
+            "END" % company,
+            "CREATE TRIGGER IF NOT EXISTS evaluation_review_fts_update "
+            "AFTER UPDATE OF title, summary, %s ON evaluation_review "
+            "BEGIN "
+            "UPDATE evaluation_review_fts "
+            "SET title = new.title, summary = new.summary, company = %s "
+            "WHERE rowid = new.id; "
+            "END" % (company_column, company),
+        ]
+    statements.append(DELETE_TRIGGER)
+    return statements
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        # FTS5 is SQLite specific, other backends search with LIKE scans.
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+def create_triggers(company_column=None):
+    """A `RunPython` function creating the triggers of `trigger_statements`."""
+    return run_statements(trigger_statements(company_column))
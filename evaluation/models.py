@@ -1,8 +1,39 @@
+import hashlib
+import unicodedata
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import (
     MinValueValidator, MaxValueValidator
 )
+from evaluation.fields import CompressedTextField, PackedIPAddressField
+
+
+def review_fingerprint(title, summary, company):
+    """
+    Hash of a review's content that ignores case, Unicode normalization
+    form and runs of whitespace, for finding resubmitted reviews.
+    """
+    parts = (
+        ' '.join(unicodedata.normalize('NFKC', part).casefold().split())
+        for part in (title, summary, company)
+    )
+    return hashlib.sha256(
+        '\x1f'.join(parts).encode('utf-8')
+    ).hexdigest()[:32]
+
+
+class Company(models.Model):
+    """
+    A company reviews are about. Its name is stored once, normalized by
+    `evaluation.companies.normalize_name`, and reviews point at it by id.
+    """
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        verbose_name_plural = 'companies'
+
+    def __str__(self):
+        return self.name
 
 
 class Review(models.Model):
@@ -10,16 +41,160 @@ class Review(models.Model):
         User, on_delete=models.CASCADE, related_name='reviews'
     )
     title = models.CharField(max_length=64)
-    summary = models.TextField(max_length=10000)
+    summary = CompressedTextField(max_length=10000)
     rating = models.IntegerField(
         validators=[
             MinValueValidator(1),
             MaxValueValidator(5)
         ]
     )
-    company = models.CharField(max_length=100)
+    # Indexed by review_company_date_idx.
+    company = models.ForeignKey(
+        Company, on_delete=models.PROTECT, related_name='reviews',
+        db_index=False
+    )
     ip_address = models.GenericIPAddressField(blank=True, null=True)
+    # Indexed by review_packed_ip_date_idx, see `evaluation.subnets`.
+    packed_ip = PackedIPAddressField(
+        source='ip_address', max_length=16, null=True
+    )
     date = models.DateTimeField(auto_now=True)
+    fingerprint = models.CharField(max_length=32, editable=False, default='')
+
+    class Meta:
+        indexes = [
+            # Serves keyset pagination of a user's reviews by (date, id).
+            models.Index(
+                fields=['user', 'date', 'id'], name='review_user_date_id_idx'
+            ),
+            # Finds a user's recent reviews with the same content.
+            models.Index(
+                fields=['user', 'fingerprint', 'date'],
+                name='review_user_fingerprint_idx'
+            ),
+            # Serve the admin's filters, each ordered by date.
+            models.Index(fields=['date'], name='review_date_idx'),
+            models.Index(
+                fields=['company', 'date'], name='review_company_date_idx'
+            ),
+            models.Index(
+                fields=['rating', 'date'], name='review_rating_date_idx'
+            ),
+            # Serves subnet queries, see `evaluation.subnets`.
+            models.Index(
+                fields=['packed_ip', 'date'], name='review_packed_ip_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+    def set_fingerprint(self):
+        self.fingerprint = review_fingerprint(
+            self.title, self.summary, self.company.name
+        )
+
+    def save(self, *args, **kwargs):
+        self.set_fingerprint()
+        super().save(*args, **kwargs)
+
+
+class ArchivedReview(models.Model):
+    """
+    A review moved out of `Review` by `evaluation.archive` once it got old.
+    It keeps its id and every column, and is still counted in its company's
+    rating summary.
+    """
+    id = models.IntegerField(primary_key=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='archived_reviews',
+        db_index=False
+    )
+    title = models.CharField(max_length=64)
+    summary = CompressedTextField(max_length=10000)
+    rating = models.IntegerField()
+    company = models.ForeignKey(
+        Company, on_delete=models.PROTECT, related_name='archived_reviews'
+    )
+    ip_address = models.GenericIPAddressField(blank=True, null=True)
+    packed_ip = PackedIPAddressField(
+        source='ip_address', max_length=16, null=True
+    )
+    date = models.DateTimeField()
+    fingerprint = models.CharField(max_length=32, editable=False, default='')
+
+    class Meta:
+        indexes = [
+            # Serves the export of a user's reviews by (date, id).
+            models.Index(
+                fields=['user', 'date', 'id'],
+                name='archived_user_date_id_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class CompanyRatingSummary(models.Model):
+    """
+    Running rating aggregates of a company, maintained on every review
+    insert so reading them never has to scan the reviews table.
+    """
+    company = models.OneToOneField(
+        Company, on_delete=models.CASCADE, related_name='rating_summary'
+    )
+    count = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return str(self.company)
+
+    @property
+    def average(self):
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    @property
+    def histogram(self):
+        return {
+            str(rating): getattr(self, 'rating_%d' % rating)
+            for rating in range(1, 6)
+        }
+
+
+class IngestTicket(models.Model):
+    """
+    Outcome of a review accepted by the asynchronous ingestion queue. A
+    ticket without a row has not been processed yet.
+    """
+    # Reported for tickets that have no row yet.
+    PENDING = 'pending'
+    CREATED = 'created'
+    REJECTED = 'rejected'
+    STATUS_CHOICES = (
+        (CREATED, 'Created'),
+        (REJECTED, 'Rejected'),
+    )
+
+    ticket = models.CharField(max_length=32, primary_key=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='ingest_tickets'
+    )
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES)
+    review = models.ForeignKey(
+        Review, on_delete=models.SET_NULL, blank=True, null=True,
+        related_name='+'
+    )
+    errors = models.TextField(blank=True)
+    enqueued_at = models.DateTimeField()
+    processed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.ticket
@@ -0,0 +1,149 @@
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class ReviewCursorPagination(CursorPagination):
+    """
+    Keyset pagination over a composite, unique ordering.
+
+    DRF's `CursorPagination` seeks on the first ordering field only and
+    falls back to an OFFSET to skip ties. Here the cursor position holds the
+    values of every ordering field of the boundary row, so each page is a
+    single seek on the `(user, date, id)` index no matter how deep it is.
+    """
+    ordering = ('-date', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(_invert(field) for field in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        try:
+            if self.cursor is not None:
+                queryset = queryset.filter(
+                    self.get_seek_filter(ordering, self.cursor.position)
+                )
+
+            # Always fetch an extra row to know whether another page follows.
+            results = list(queryset[:self.page_size + 1])
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Honour an explicit ordering on the queryset (e.g. search ranking),
+        otherwise use the pagination default. The last field must be unique.
+        """
+        if queryset.query.order_by:
+            return tuple(queryset.query.order_by)
+        return tuple(self.ordering)
+
+    def get_seek_filter(self, ordering, position):
+        """
+        Build `(a, b) < (x, y)` as `a <= x AND (a < x OR (a = x AND b < y))`.
+
+        The redundant leading bound lets the database turn the first column
+        into an index range instead of scanning from the start of the index.
+        """
+        equal = {}
+        seek = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            seek |= Q(**equal, **{'%s__%s' % (name, lookup): value})
+            equal[name] = value
+
+        first = ordering[0]
+        bound = Q(**{
+            '%s__%s' % (first.lstrip('-'), 'lte' if first.startswith('-') else 'gte'): position[0]
+        })
+        return bound & seek
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+
+        try:
+            position = json.loads(cursor.position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=cursor.reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        return super().encode_cursor(cursor._replace(
+            position=json.dumps(cursor.position, separators=(',', ':'))
+        ))
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in ordering:
+            name = field.lstrip('-')
+            if isinstance(instance, dict):
+                value = instance[name]
+            else:
+                value = getattr(instance, name)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+
+def _invert(field):
+    return field[1:] if field.startswith('-') else '-' + field
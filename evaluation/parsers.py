@@ -0,0 +1,41 @@
+"""
+Parsers of the review API, the counterparts of `evaluation.renderers`.
+
+Like the renderers, they use the optional orjson and msgpack packages:
+without orjson, JSON is parsed by the standard library, and MessagePack
+request bodies are only accepted when msgpack is installed.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from evaluation.renderers import (
+    FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+)
+
+
+class FastJSONParser(JSONParser):
+    """
+    DRF's `JSONParser`, decoding with orjson when it is installed and the
+    request is UTF-8. orjson rejects NaN and Infinity like strict JSON.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('_', '-') != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
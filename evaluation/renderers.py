@@ -0,0 +1,125 @@
+"""
+Renderers of the review API.
+
+`FastJSONRenderer` and `MessagePackRenderer` render regular responses. The
+optional orjson and msgpack packages back them: without orjson, JSON is
+encoded by the standard library, and MessagePack is only offered when
+msgpack is installed.
+
+The row-oriented renderers stream the review export. Besides DRF's
+`render()`, used for error responses, each of them turns an iterable of
+rows (dicts) into an iterable of encoded lines with `stream()`, so rows can
+be written out as they are read from the database.
+"""
+import csv
+import json
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    DRF's `JSONRenderer`, encoding with orjson when it is installed. Types
+    orjson does not handle natively, and datetimes, are converted by DRF's
+    `JSONEncoder` so the output is the same. Indented output, as requested
+    by the browsable API, is left to the standard library.
+    """
+    options = (
+        (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        if orjson is not None else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or not self.compact or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=self.options
+        )
+        # Like JSONRenderer, escape U+2028 and U+2029 so the output is a
+        # strict JavaScript subset.
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(
+                b'\xe2\x80\xa8', b'\\u2028'
+            ).replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Binary MessagePack encoding of the same data as the JSON renderer."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(
+            data, default=JSONEncoder().default, use_bin_type=True
+        )
+
+
+class RowRenderer(BaseRenderer):
+    charset = 'utf-8'
+
+    def stream(self, rows, fields):
+        raise NotImplementedError
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        return b''.join(self.stream(rows, fields))
+
+
+class NDJSONRenderer(RowRenderer):
+    """One JSON object per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def stream(self, rows, fields):
+        encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        for row in rows:
+            yield (encoder.encode(row) + '\n').encode(self.charset)
+
+
+class CSVRenderer(RowRenderer):
+    """A header line with the field names, then one line per row."""
+    media_type = 'text/csv'
+    format = 'csv'
+
+    class Line:
+        # File-like object handing back what csv.writer writes to it.
+        def write(self, value):
+            return value
+
+    def stream(self, rows, fields):
+        encoder = JSONEncoder()
+        writer = csv.writer(self.Line())
+        yield writer.writerow(fields).encode(self.charset)
+        for row in rows:
+            values = []
+            for field in fields:
+                value = row.get(field)
+                if isinstance(value, (list, dict)):
+                    value = json.dumps(value, cls=JSONEncoder)
+                elif not isinstance(value, (str, int, float, type(None))):
+                    value = encoder.default(value)
+                values.append(value)
+            yield writer.writerow(values).encode(self.charset)
@@ -0,0 +1,159 @@
+"""
+OpenAPI schema of the API, generated once instead of on every request.
+
+drf_yasg builds the schema by introspecting every view and serializer,
+which is too expensive to repeat each time the docs or a tool fetch it.
+The document served at /api/docs/openapi.json is read from
+`REVIEWS_API_SCHEMA['FILE']`, written by `manage.py generate_schema`, or
+else generated on the first request of each process. Either way it is
+stamped with the code version and thrown away when that changes.
+
+This module imports drf_yasg, so the views only import it on first use:
+they are annotated through `evaluation.schema_annotations`, applied here.
+"""
+import hashlib
+import json
+import os
+from collections import namedtuple
+import drf_yasg
+import rest_framework
+from django.conf import settings
+from django.urls import get_resolver
+from django.utils.encoding import force_bytes
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+from evaluation import schema_annotations
+
+API_INFO = openapi.Info(
+    title="Review API",
+    default_version='v1',
+    description="API to manage reviews on this trial app."
+)
+
+VERSION_KEY = 'x-code-version'
+SOURCE_DIRS = ('ca_arthur_trial', 'evaluation')
+CODECS = {'json': OpenAPICodecJson, 'yaml': OpenAPICodecYaml}
+
+SchemaDocument = namedtuple('SchemaDocument', 'content etag version')
+
+_code_version = None
+_document = None
+_ui_view = None
+
+
+def code_version():
+    """
+    `REVIEWS_API_SCHEMA['VERSION']`, e.g. the deployed commit, or a hash of
+    the project's sources and of the versions of the libraries the schema
+    is generated with.
+    """
+    global _code_version
+    if settings.REVIEWS_API_SCHEMA['VERSION']:
+        return settings.REVIEWS_API_SCHEMA['VERSION']
+    if _code_version is None:
+        digest = hashlib.sha256()
+        digest.update(drf_yasg.__version__.encode('utf-8'))
+        digest.update(rest_framework.VERSION.encode('utf-8'))
+        for name in SOURCE_DIRS:
+            for root, dirs, files in os.walk(
+                os.path.join(settings.BASE_DIR, name)
+            ):
+                dirs.sort()
+                for filename in sorted(files):
+                    if filename.endswith('.py'):
+                        with open(os.path.join(root, filename), 'rb') as f:
+                            digest.update(f.read())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def make_parameter(parameter):
+    return openapi.Parameter(
+        parameter.name, openapi.IN_QUERY, type=openapi.TYPE_STRING,
+        description=parameter.description
+    )
+
+
+def annotate_views():
+    """Apply the annotations of the views, see `schema_annotations`."""
+    # Loading the URLconf imports, and so annotates, every view.
+    get_resolver().url_patterns
+    schema_annotations.apply(swagger_auto_schema, make_parameter)
+
+
+def generate():
+    """Introspect the API into an `openapi.Swagger` document."""
+    annotate_views()
+    generator = OpenAPISchemaGenerator(API_INFO)
+    return generator.get_schema(request=None, public=True)
+
+
+def encode(swagger, version, format='json'):
+    codec = CODECS[format](validators=[])
+    spec = codec.generate_swagger_object(swagger)
+    spec[VERSION_KEY] = version
+    return force_bytes(codec._dump_dict(spec))
+
+
+def make_document(content, version):
+    return SchemaDocument(
+        content, hashlib.sha256(content).hexdigest()[:32], version
+    )
+
+
+def read_file(path, version):
+    """The document in `path`, or None if it is missing or stale."""
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+        stored = json.loads(content.decode('utf-8')).get(VERSION_KEY)
+    except (OSError, ValueError):
+        return None
+    if stored != version:
+        return None
+    return make_document(content, version)
+
+
+def get_document():
+    """
+    The schema as a `SchemaDocument`. With `REVIEWS_API_SCHEMA['PRECOMPUTED']`
+    it is loaded or generated once per process and code version; otherwise
+    it is generated on every call.
+    """
+    global _document
+    config = settings.REVIEWS_API_SCHEMA
+    version = code_version()
+    if not config['PRECOMPUTED']:
+        return make_document(encode(generate(), version), version)
+
+    document = _document
+    if document is None or document.version != version:
+        document = read_file(config['FILE'], version) if config['FILE'] else None
+        if document is None:
+            document = make_document(encode(generate(), version), version)
+        _document = document
+    return document
+
+
+def ui_view():
+    """The drf_yasg Swagger UI view, built on first use."""
+    global _ui_view
+    if _ui_view is None:
+        annotate_views()
+        _ui_view = get_schema_view(
+            API_INFO,
+            public=True,
+            permission_classes=(permissions.AllowAny,),
+        ).with_ui('swagger', cache_timeout=0)
+    return _ui_view
+
+
+def clear():
+    """Forget the document and the code version of this process."""
+    global _code_version, _document
+    _code_version = None
+    _document = None
@@ -0,0 +1,38 @@
+"""
+OpenAPI annotations of the views that do not import drf_yasg.
+
+Importing drf_yasg takes a fifth of a second, so the views are annotated
+with the `swagger_auto_schema` of this module, which only records its
+arguments. `evaluation.schema`, imported when the docs are first
+requested, hands them to drf_yasg's decorator of the same name before
+generating the schema. Query parameters are described with
+`QueryParameter` instead of `openapi.Parameter`.
+"""
+from collections import namedtuple
+
+QueryParameter = namedtuple('QueryParameter', 'name description')
+
+_pending = []
+
+
+def swagger_auto_schema(**kwargs):
+    """Record the arguments of drf_yasg's `swagger_auto_schema`."""
+    def decorator(view_method):
+        _pending.append((view_method, kwargs))
+        return view_method
+    return decorator
+
+
+def apply(decorator, make_parameter):
+    """
+    Apply drf_yasg's `decorator` to the view methods annotated so far,
+    turning each `QueryParameter` into a parameter with `make_parameter`.
+    """
+    while _pending:
+        view_method, kwargs = _pending.pop(0)
+        if 'manual_parameters' in kwargs:
+            kwargs = dict(kwargs, manual_parameters=[
+                make_parameter(parameter)
+                for parameter in kwargs['manual_parameters']
+            ])
+        decorator(**kwargs)(view_method)
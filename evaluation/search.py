@@ -0,0 +1,193 @@
+"""
+Full-text search over reviews backed by an SQLite FTS5 index.
+
+`evaluation_review_fts` mirrors the `title` and decompressed `summary`
+columns of `evaluation_review` and the name of the review's company, keyed
+by rowid = review id. Summaries are stored compressed, so the application
+writes the index: `index_reviews` on every save (see `evaluation.signals`)
+and `index_reviews_after` after bulk inserts. A trigger, created by
+migration 0012, removes deleted reviews.
+
+Reviews inserted or changed without going through the application's save
+paths are not indexed: rows written from `dbshell` or another client, and
+changes made with `QuerySet.update()`. `find_stale_entries` and
+`find_orphaned_entries` detect the drift, and the
+`rebuild_review_search_index` management command repairs it.
+"""
+import re
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import FloatField, Max, Q
+from django.db.models.expressions import RawSQL
+from evaluation import fields
+from evaluation.models import Review
+
+FTS_TABLE = 'evaluation_review_fts'
+
+# Relative bm25() weights of the title, summary and company columns.
+COLUMN_WEIGHTS = (4.0, 1.0, 2.0)
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_supported(using=DEFAULT_DB_ALIAS):
+    return connections[using].vendor == 'sqlite'
+
+
+def _write_index(rows, using):
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            'INSERT OR REPLACE INTO {table} (rowid, title, summary, company) '
+            'VALUES (%s, %s, %s, %s)'.format(table=FTS_TABLE),
+            rows
+        )
+
+
+def _delete_index(ids, using):
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            'DELETE FROM {table} WHERE rowid = %s'.format(table=FTS_TABLE),
+            [(review_id,) for review_id in ids]
+        )
+
+
+def index_reviews(reviews, using=DEFAULT_DB_ALIAS):
+    """Add saved reviews to the search index, or refresh their entries."""
+    if not is_supported(using):
+        return
+    _write_index([
+        (review.pk, review.title, review.summary, review.company.name)
+        for review in reviews
+    ], using)
+
+
+def last_review_id(using=DEFAULT_DB_ALIAS):
+    """The id of the newest review, 0 without any."""
+    return Review.objects.using(using).aggregate(
+        last_id=Max('id')
+    )['last_id'] or 0
+
+
+def index_reviews_after(last_id, up_to_id=None, batch_size=2000,
+                        using=DEFAULT_DB_ALIAS):
+    """
+    Index the stored reviews with ids above `last_id`, up to `up_to_id`
+    included, `batch_size` at a time. `bulk_create` does not set the ids
+    of the reviews it inserts on SQLite, so bulk inserts index what follows
+    the `last_review_id()` read in their transaction: writers are
+    serialized, so nothing else can be inserted in between. Return how many
+    reviews were indexed.
+    """
+    if not is_supported(using):
+        return 0
+    reviews = Review.objects.using(using).order_by('id')
+    if up_to_id is not None:
+        reviews = reviews.filter(id__lte=up_to_id)
+
+    indexed = 0
+    while True:
+        rows = list(reviews.filter(id__gt=last_id).values_list(
+            'id', 'title', 'summary', 'company__name'
+        )[:batch_size])
+        if not rows:
+            return indexed
+        _write_index([
+            (review_id, title, fields.text(summary), company)
+            for review_id, title, summary, company in rows
+        ], using)
+        indexed += len(rows)
+        last_id = rows[-1][0]
+
+
+def find_stale_entries(last_id, batch_size=2000, using=DEFAULT_DB_ALIAS):
+    """
+    Compare the `batch_size` reviews following `last_id` with their search
+    index entries. Return the id of the last review compared, None once
+    past the last one, and the entries of those whose entry is missing or
+    out of date, as `repair_entries` takes them.
+    """
+    rows = list(Review.objects.using(using).filter(
+        id__gt=last_id
+    ).order_by('id').values_list(
+        'id', 'title', 'summary', 'company__name'
+    )[:batch_size])
+    if not rows:
+        return None, []
+    rows = [
+        (review_id, title, fields.text(summary), company)
+        for review_id, title, summary, company in rows
+    ]
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT rowid, title, summary, company FROM {table} '
+            'WHERE rowid > %s AND rowid <= %s'.format(table=FTS_TABLE),
+            [last_id, rows[-1][0]]
+        )
+        indexed = {row[0]: tuple(row) for row in cursor.fetchall()}
+    return rows[-1][0], [row for row in rows if indexed.get(row[0]) != row]
+
+
+def find_orphaned_entries(using=DEFAULT_DB_ALIAS):
+    """The ids of the search index entries left without a review."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT rowid FROM {table} WHERE rowid NOT IN '
+            '(SELECT id FROM evaluation_review)'.format(table=FTS_TABLE)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def repair_entries(entries=(), orphaned_ids=(), using=DEFAULT_DB_ALIAS):
+    """
+    Write the entries returned by `find_stale_entries` and delete those of
+    `find_orphaned_entries`.
+    """
+    _write_index(entries, using)
+    _delete_index(orphaned_ids, using)
+
+
+def build_match_expression(query):
+    """
+    Turn free user input into an FTS5 MATCH expression requiring every word,
+    quoting each term so FTS5 operators in the input are not interpreted.
+    """
+    return ' '.join('"%s"' % term for term in _TERM_RE.findall(query))
+
+
+def search_reviews(queryset, query):
+    """
+    Restrict `queryset` to reviews matching `query`, annotated with their
+    `search_rank` and ordered best match first. bm25() scores are lower for
+    better matches.
+    """
+    expression = build_match_expression(query)
+    if not expression:
+        return queryset.none()
+
+    if not is_supported():
+        # Summaries are stored compressed, so only the title and company
+        # can be scanned.
+        words = _TERM_RE.findall(query)
+        for word in words:
+            queryset = queryset.filter(
+                Q(title__icontains=word) | Q(company__name__icontains=word)
+            )
+        return queryset.order_by('-date', '-id')
+
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    return queryset.annotate(
+        search_rank=RawSQL(
+            'SELECT bm25({table}, {weights}) FROM {table} '
+            'WHERE {table} MATCH %s AND rowid = evaluation_review.id'.format(
+                table=FTS_TABLE, weights=weights
+            ),
+            (expression,),
+            output_field=FloatField()
+        )
+    ).filter(
+        id__in=RawSQL(
+            'SELECT rowid FROM {table} WHERE {table} MATCH %s'.format(
+                table=FTS_TABLE
+            ),
+            (expression,)
+        )
+    ).order_by('search_rank', 'id')
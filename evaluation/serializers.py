@@ -1,23 +1,90 @@
+import json
 from rest_framework import serializers
-from evaluation.models import Review, User
+from evaluation import companies, timing
+from evaluation.models import CompanyRatingSummary, IngestTicket, Review, User
 
 
-class UserSerializer(serializers.ModelSerializer):
+class TimedSerializerMixin:
+    """Report the time spent serializing objects as `serialize`."""
+
+    def to_representation(self, instance):
+        with timing.span('serialize'):
+            return super().to_representation(instance)
+
+
+class SparseFieldsetMixin:
+    """
+    Keep only the fields named in the `fields` argument, if given, and drop
+    those named in `exclude`.
+    """
+
+    def __init__(self, *args, fields=None, exclude=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields).difference(fields):
+                self.fields.pop(name)
+        for name in exclude or ():
+            self.fields.pop(name, None)
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetMixin, TimedSerializerMixin,
+                       serializers.ModelSerializer):
     user = UserSerializer()
+    company = serializers.CharField(source='company.name', read_only=True)
 
     class Meta:
         model = Review
-        fields = '__all__'
+        exclude = ('fingerprint', 'packed_ip')
         read_only_fields = ('id', 'date', 'user')
 
 
 class ReviewWriteSerializer(serializers.ModelSerializer):
+    # A company name, resolved to its `Company` by `services.build_review`.
+    company = serializers.CharField(max_length=100)
+
     class Meta:
         model = Review
         fields = ('title', 'summary', 'rating', 'company')
+
+    def validate_company(self, value):
+        return companies.normalize_name(value)
+
+
+class ReviewBulkErrorSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class ReviewBulkResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    errors = ReviewBulkErrorSerializer(many=True)
+
+
+class CompanyRatingSerializer(TimedSerializerMixin,
+                              serializers.ModelSerializer):
+    company = serializers.CharField(source='company.name')
+    sum = serializers.IntegerField(source='total')
+    average = serializers.FloatField()
+    histogram = serializers.DictField(child=serializers.IntegerField())
+
+    class Meta:
+        model = CompanyRatingSummary
+        fields = ('company', 'count', 'sum', 'average', 'histogram')
+
+
+class IngestTicketSerializer(TimedSerializerMixin,
+                             serializers.ModelSerializer):
+    errors = serializers.SerializerMethodField()
+
+    class Meta:
+        model = IngestTicket
+        fields = ('ticket', 'status', 'review', 'errors')
+
+    def get_errors(self, ticket):
+        return json.loads(ticket.errors) if ticket.errors else None
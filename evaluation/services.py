@@ -0,0 +1,257 @@
+import datetime
+import itertools
+from collections import Counter
+from functools import partial
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from evaluation import caching, companies, metrics, search
+from evaluation.models import ArchivedReview, CompanyRatingSummary, Review
+
+DUPLICATE_REVIEW = (
+    'A review with the same title, summary and company was submitted '
+    'recently.'
+)
+
+RATING_SUMMARY_FIELDS = (
+    'count', 'total',
+    'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5'
+)
+
+
+def get_client_ip(request):
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip = x_forwarded_for.split(',')[0]
+    else:
+        ip = request.META.get('REMOTE_ADDR')
+    return ip
+
+
+def build_review(user, ip_address, validated_data):
+    data = dict(validated_data)
+    data['company'] = companies.get_company(data['company'])
+    return Review(user=user, ip_address=ip_address, **data)
+
+
+def create_review(review):
+    return create_reviews([review])[0]
+
+
+def find_duplicates(reviews):
+    """
+    Return, for each of `reviews`, the review it duplicates: one stored by
+    the same user within `REVIEWS_DUPLICATES['WINDOW']` seconds, or an
+    earlier one of `reviews`, with the same fingerprint; None otherwise.
+    Stored reviews are found with a single probe of the (user, fingerprint,
+    date) index. Call it in the transaction that stores the reviews so no
+    duplicate can be committed in between.
+    """
+    window = settings.REVIEWS_DUPLICATES['WINDOW']
+    if not window:
+        return [None] * len(reviews)
+
+    for review in reviews:
+        review.set_fingerprint()
+    stored = Review.objects.filter(
+        user_id__in={review.user_id for review in reviews},
+        fingerprint__in={review.fingerprint for review in reviews},
+        date__gte=timezone.now() - datetime.timedelta(seconds=window)
+    ).order_by('date')
+    seen = {(review.user_id, review.fingerprint): review for review in stored}
+
+    duplicates = []
+    for review in reviews:
+        key = (review.user_id, review.fingerprint)
+        duplicates.append(seen.get(key))
+        seen.setdefault(key, review)
+    return duplicates
+
+
+def create_unique_review(review):
+    """
+    Save a review unless it duplicates a recently stored one, see
+    `find_duplicates`. Return `(review, created)` like `get_or_create`,
+    with the stored duplicate when nothing was created.
+    """
+    with transaction.atomic():
+        duplicate = find_duplicates([review])[0]
+        if duplicate is not None:
+            return duplicate, False
+        return create_review(review), True
+
+
+def create_reviews(reviews):
+    """
+    Save reviews one by one inside a single transaction, so each of them
+    gets its primary key. Use `bulk_create_reviews` when ids are not needed.
+    """
+    # No savepoint when nested: a failure aborts the whole transaction.
+    with transaction.atomic(savepoint=False):
+        for review in reviews:
+            review.save()
+        reviews_inserted(reviews)
+    return reviews
+
+
+def bulk_create_reviews(reviews, batch_size=None):
+    """
+    Insert unsaved reviews in chunks of `batch_size` rows inside a single
+    transaction, so either every chunk is written or none is.
+    """
+    batch_size = batch_size or settings.REVIEWS_BULK_BATCH_SIZE
+    for review in reviews:
+        review.set_fingerprint()
+    with transaction.atomic(savepoint=False):
+        last_id = search.last_review_id()
+        for start in range(0, len(reviews), batch_size):
+            Review.objects.bulk_create(reviews[start:start + batch_size])
+        # bulk_create sends no post_save signal.
+        search.index_reviews_after(last_id)
+        reviews_inserted(reviews)
+    return reviews
+
+
+def reviews_inserted(reviews):
+    """
+    Update everything derived from reviews after inserting them. Must be
+    called in the transaction that inserted them.
+    """
+    update_company_ratings(reviews)
+    invalidate_cached_reviews(reviews)
+    if reviews:
+        transaction.on_commit(
+            partial(metrics.reviews_created_total.inc, len(reviews))
+        )
+
+
+def invalidate_cached_reviews(reviews):
+    """Drop the cached list pages of the reviews' owners once committed."""
+    user_ids = {review.user_id for review in reviews}
+    if user_ids:
+        transaction.on_commit(
+            partial(caching.invalidate_user_reviews, user_ids)
+        )
+
+
+def _rating_deltas(rows):
+    """
+    Fold `(company id, rating, reviews)` rows into per-company increments
+    of the `CompanyRatingSummary` counters.
+    """
+    deltas = {}
+    for company_id, rating, reviews in rows:
+        delta = deltas.setdefault(company_id, Counter())
+        delta['count'] += reviews
+        delta['total'] += rating * reviews
+        delta['rating_%d' % rating] += reviews
+    return deltas
+
+
+def update_company_ratings(reviews):
+    """
+    Add newly stored reviews to their companies' rating summaries. Must be
+    called in the transaction that inserted them.
+    """
+    deltas = _rating_deltas(
+        (review.company_id, review.rating, 1) for review in reviews
+    )
+    for company_id, delta in deltas.items():
+        increments = {
+            field: F(field) + value for field, value in delta.items()
+        }
+        summaries = CompanyRatingSummary.objects.filter(company_id=company_id)
+        if summaries.update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                CompanyRatingSummary.objects.create(
+                    company_id=company_id, **delta
+                )
+        except IntegrityError:
+            # Another request created the row first, add to it instead.
+            summaries.update(**increments)
+
+
+def subtract_company_ratings(rows):
+    """
+    Take `(company id, rating, reviews)` rows of removed reviews out of
+    their companies' rating summaries. Must be called in the transaction
+    that removed them.
+    """
+    for company_id, delta in _rating_deltas(rows).items():
+        CompanyRatingSummary.objects.filter(company_id=company_id).update(**{
+            field: F(field) - value for field, value in delta.items()
+        })
+
+
+def update_review(review):
+    """
+    Save changes to a stored review, moving it to the rating summary of
+    its new company or rating and dropping the cached list pages of its
+    previous and current owners.
+    """
+    with transaction.atomic():
+        user_id, company_id, rating = Review.objects.select_for_update(
+        ).values_list('user', 'company', 'rating').get(pk=review.pk)
+        review.save()
+        if (company_id, rating) != (review.company_id, review.rating):
+            subtract_company_ratings([(company_id, rating, 1)])
+            update_company_ratings([review])
+        transaction.on_commit(partial(
+            caching.invalidate_user_reviews, {user_id, review.user_id}
+        ))
+    return review
+
+
+def delete_reviews(reviews, batch_size=500):
+    """
+    Delete the reviews of a queryset in chunks of `batch_size`, each in its
+    own transaction, and subtract them from their companies' rating
+    summaries. Only ids and counters are read, so memory use and lock time
+    do not grow with the number of reviews. Return how many were deleted.
+    """
+    deleted = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                reviews.filter(id__gt=last_id).order_by('id').values_list(
+                    'id', 'user', 'company', 'rating'
+                )[:batch_size]
+            )
+            if not rows:
+                break
+            ids = [row[0] for row in rows]
+            Review.objects.filter(id__in=ids).only('id').delete()
+
+            subtract_company_ratings(
+                (company_id, rating, 1) for _, _, company_id, rating in rows
+            )
+            transaction.on_commit(partial(
+                caching.invalidate_user_reviews, {row[1] for row in rows}
+            ))
+        deleted += len(rows)
+        last_id = ids[-1]
+    return deleted
+
+
+def compute_company_ratings():
+    """
+    Compute every company's rating summary from scratch with an aggregate
+    query over the reviews table and one over the archived reviews, keyed
+    by company id.
+    """
+    rows = (
+        model.objects.values('company', 'rating').annotate(
+            reviews=Count('id')
+        ).values_list('company', 'rating', 'reviews').order_by().iterator()
+        for model in (Review, ArchivedReview)
+    )
+    return {
+        company_id: CompanyRatingSummary(company_id=company_id, **delta)
+        for company_id, delta in _rating_deltas(
+            itertools.chain.from_iterable(rows)
+        ).items()
+    }
@@ -0,0 +1,48 @@
+from django.contrib.auth.models import User
+from django.core.signals import setting_changed
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from evaluation import search
+from evaluation.authentication import user_cache
+from evaluation.companies import company_cache
+from evaluation.fields import SQL_FUNCTION, sql_text
+from evaluation.models import Review
+
+# Columns copied to the full-text search index.
+SEARCH_FIELDS = {'title', 'summary', 'company'}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(getattr(instance, api_settings.USER_ID_FIELD))
+
+
+@receiver(setting_changed)
+def clear_user_cache(setting, **kwargs):
+    if setting == 'REVIEWS_AUTH_USER_CACHE':
+        user_cache.clear()
+
+
+@receiver(post_migrate)
+def clear_company_cache(**kwargs):
+    # The database was migrated or flushed, companies may have other ids.
+    company_cache.clear()
+
+
+@receiver(post_save, sender=Review)
+def index_saved_review(sender, instance, using, update_fields, **kwargs):
+    # Bulk inserts are indexed by `services.bulk_create_reviews`.
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        search.index_reviews([instance], using)
+
+
+@receiver(connection_created)
+def register_sql_functions(connection, **kwargs):
+    # Lets raw queries read summaries.
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function(
+            SQL_FUNCTION, 1, sql_text, deterministic=True
+        )
@@ -0,0 +1,93 @@
+"""
+Subnet queries over the client addresses of reviews.
+
+`Review.packed_ip` holds `ip_address` as 16 bytes, IPv4 addresses being
+mapped into IPv6 (`::ffff:a.b.c.d`). Byte strings compare in address order,
+so a subnet is a contiguous range of the (packed_ip, date) index and a
+subnet prefix is a leading substring of the packed address.
+"""
+import ipaddress
+from django.db.models import Count, Q
+from django.db.models.functions import Substr
+from evaluation.fields import IPV4_MAPPED, pack_ip
+from evaluation.models import Review
+
+# Bytes in front of the IPv4 address in a packed IPv4-mapped address.
+IPV4_OFFSET = 12
+
+
+def unpack_ip(packed):
+    """The address of a packed one, IPv4-mapped addresses as IPv4."""
+    address = ipaddress.IPv6Address(bytes(packed))
+    return address.ipv4_mapped or address
+
+
+def parse_network(value):
+    """
+    An `ipaddress` network from a string such as `203.0.113.0/24`; host bits
+    are ignored. Raise ValueError when it is not one.
+    """
+    return ipaddress.ip_network(value, strict=False)
+
+
+def packed_range(network):
+    """The first and last packed addresses of a network."""
+    return (
+        pack_ip(network.network_address), pack_ip(network.broadcast_address)
+    )
+
+
+def reviews_in_network(network, since=None):
+    """Reviews sent from `network`, optionally dated from `since` on."""
+    reviews = Review.objects.filter(packed_ip__range=packed_range(network))
+    if since is not None:
+        reviews = reviews.filter(date__gte=since)
+    return reviews
+
+
+def subnet_of(packed, prefix_length):
+    """The network of `prefix_length` bits a packed address belongs to."""
+    address = unpack_ip(packed)
+    return ipaddress.ip_network(
+        '%s/%d' % (address, prefix_length), strict=False
+    )
+
+
+def top_subnets(since, limit, ipv4_prefix=24, ipv6_prefix=64):
+    """
+    The `limit` subnets of `ipv4_prefix` or `ipv6_prefix` bits that sent the
+    most reviews dated from `since` on, as `(network, count)` pairs, most
+    reviews first. Prefix lengths must be multiples of 8, so subnets are
+    grouped by a leading substring of the packed address.
+    """
+    if ipv4_prefix % 8 or not 8 <= ipv4_prefix <= 32:
+        raise ValueError('The IPv4 prefix must be 8, 16, 24 or 32 bits.')
+    if ipv6_prefix % 8 or not 8 <= ipv6_prefix <= 128:
+        raise ValueError(
+            'The IPv6 prefix must be a multiple of 8 bits, up to 128.'
+        )
+
+    ipv4_range = packed_range(IPV4_MAPPED)
+    families = (
+        (Q(packed_ip__range=ipv4_range), ipv4_prefix, IPV4_OFFSET),
+        (
+            Q(packed_ip__lt=ipv4_range[0]) | Q(packed_ip__gt=ipv4_range[1]),
+            ipv6_prefix, 0
+        ),
+    )
+    subnets = []
+    for condition, prefix_length, offset in families:
+        rows = Review.objects.filter(condition, date__gte=since).annotate(
+            subnet=Substr('packed_ip', 1, offset + prefix_length // 8)
+        ).values('subnet').annotate(
+            reviews=Count('id')
+        ).order_by('-reviews')[:limit]
+        subnets.extend(
+            (
+                subnet_of(bytes(row['subnet']).ljust(16, b'\x00'),
+                          prefix_length),
+                row['reviews']
+            ) for row in rows
+        )
+    subnets.sort(key=lambda subnet: -subnet[1])
+    return subnets[:limit]
@@ -0,0 +1,123 @@
+import json
+import unittest
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from evaluation.companies import get_company
+from evaluation.models import Review
+from evaluation.renderers import FastJSONRenderer, msgpack, orjson
+from evaluation.serializers import ReviewSerializer
+
+
+class RenderersTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', first_name='Zoë', password='Amvnfr213!'
+        )
+        for index in range(3):
+            Review.objects.create(
+                user=self.user,
+                rating=4,
+                title='Test Review %02d' % index,
+                summary='Ça va   très bien',
+                company=get_company('Company 01'),
+                ip_address='127.0.0.1'
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_fast_json_matches_json_renderer(self):
+        # Arrange
+        data = ReviewSerializer(Review.objects.all(), many=True).data
+
+        # Act
+        rendered = FastJSONRenderer().render(data)
+
+        # Assert
+        self.assertEquals(rendered, JSONRenderer().render(data))
+
+    def test_json_without_orjson(self):
+        # Arrange
+        data = ReviewSerializer(Review.objects.all(), many=True).data
+
+        # Act
+        with mock.patch('evaluation.renderers.orjson', None):
+            rendered = FastJSONRenderer().render(data)
+
+        # Assert
+        self.assertEquals(rendered, JSONRenderer().render(data))
+
+    def test_indented_json(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-list'),
+            HTTP_ACCEPT='application/json; indent=2'
+        )
+
+        # Assert
+        self.assertIn(b'\n  "results"', response.content)
+
+    def test_invalid_json(self):
+        # Act
+        response = self.client.post(
+            reverse('evaluation:reviews-list'), data=b'{"title": ',
+            content_type='application/json'
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data['detail'].startswith('JSON parse error'))
+
+    @unittest.skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack_list_matches_json(self):
+        # Arrange
+        url = reverse('evaluation:reviews-list')
+        json_response = self.client.get(url, HTTP_ACCEPT='application/json')
+
+        # Act
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response['Content-Type'], 'application/msgpack')
+        self.assertEquals(
+            msgpack.unpackb(response.content, raw=False),
+            json.loads(json_response.content.decode('utf-8'))
+        )
+
+    @unittest.skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack_create(self):
+        # Act
+        response = self.client.post(
+            reverse('evaluation:reviews-list'),
+            data=msgpack.packb({
+                'title': 'Title New',
+                'summary': 'Summary New',
+                'rating': 5,
+                'company': 'New Company'
+            }),
+            content_type='application/msgpack',
+            HTTP_ACCEPT='application/msgpack'
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        data = msgpack.unpackb(response.content, raw=False)
+        self.assertEquals(data['company'], 'New Company')
+        self.assertTrue(Review.objects.filter(title='Title New').exists())
+
+    @unittest.skipIf(msgpack is None, 'msgpack is not installed')
+    def test_invalid_msgpack(self):
+        # Act
+        response = self.client.post(
+            reverse('evaluation:reviews-list'), data=b'\xc1',
+            content_type='application/msgpack'
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,121 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation import schema
+
+
+class APISchemaTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.schema_file = os.path.join(directory, 'openapi.json')
+        self.settings = override_settings(REVIEWS_API_SCHEMA={
+            'PRECOMPUTED': True,
+            'FILE': self.schema_file,
+            'VERSION': 'v1',
+            'MAX_AGE': 3600,
+        })
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+        schema.clear()
+        self.addCleanup(schema.clear)
+        self.client = APIClient()
+
+    def get_schema(self, **extra):
+        return self.client.get(reverse('evaluation:schema-json'), **extra)
+
+    def test_schema_is_generated_once(self):
+        # Arrange
+        with mock.patch(
+            'evaluation.schema.generate', wraps=schema.generate
+        ) as generate:
+            # Act
+            first = self.get_schema()
+            second = self.get_schema()
+
+        # Assert
+        self.assertEquals(generate.call_count, 1)
+        self.assertEquals(first.status_code, status.HTTP_200_OK)
+        self.assertEquals(first.content, second.content)
+        document = json.loads(first.content)
+        self.assertIn('/reviews/', document['paths'])
+        self.assertEquals(document['x-code-version'], 'v1')
+        self.assertEquals(first['Cache-Control'], 'public, max-age=3600')
+
+    def test_schema_is_revalidated_by_etag(self):
+        # Arrange
+        etag = self.get_schema()['ETag']
+
+        # Act
+        response = self.get_schema(HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEquals(response['ETag'], etag)
+
+    def test_generated_file_is_served(self):
+        # Arrange
+        call_command('generate_schema', stdout=io.StringIO())
+        with open(self.schema_file, 'rb') as f:
+            content = f.read()
+
+        # Act
+        with mock.patch('evaluation.schema.generate') as generate:
+            response = self.get_schema()
+
+        # Assert
+        generate.assert_not_called()
+        self.assertEquals(response.content, content)
+
+    def test_stale_file_is_regenerated(self):
+        # Arrange
+        call_command('generate_schema', stdout=io.StringIO())
+        etag = self.get_schema()['ETag']
+        schema.clear()
+
+        # Act
+        with override_settings(REVIEWS_API_SCHEMA={
+            'PRECOMPUTED': True,
+            'FILE': self.schema_file,
+            'VERSION': 'v2',
+            'MAX_AGE': 3600,
+        }):
+            response = self.get_schema(HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(json.loads(response.content)['x-code-version'], 'v2')
+
+    def test_schema_without_precomputing(self):
+        # Arrange
+        with override_settings(REVIEWS_API_SCHEMA={
+            'PRECOMPUTED': False,
+            'FILE': None,
+            'VERSION': 'v1',
+            'MAX_AGE': 3600,
+        }), mock.patch(
+            'evaluation.schema.generate', wraps=schema.generate
+        ) as generate:
+            # Act
+            self.get_schema()
+            response = self.get_schema()
+
+        # Assert
+        self.assertEquals(generate.call_count, 2)
+        self.assertEquals(response['Cache-Control'], 'no-cache')
+
+    def test_docs_load_the_schema(self):
+        # Act
+        response = self.client.get(reverse('evaluation:schema-swagger-ui'))
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, reverse('evaluation:schema-json'))
@@ -0,0 +1,41 @@
+from django.test import SimpleTestCase
+from evaluation.benchmark import compare_results, summarize
+
+
+class CompareResultsTestCase(SimpleTestCase):
+    def setUp(self):
+        self.baseline = {
+            'reviews-list': summarize([0.010] * 10, [2] * 10)
+        }
+
+    def test_results_within_tolerance(self):
+        # Arrange
+        results = {'reviews-list': summarize([0.011] * 10, [2] * 10)}
+
+        # Act
+        regressions = compare_results(results, self.baseline, 0.2)
+
+        # Assert
+        self.assertEquals(regressions, [])
+
+    def test_slower_results_regress(self):
+        # Arrange
+        results = {'reviews-list': summarize([0.015] * 10, [2] * 10)}
+
+        # Act
+        regressions = compare_results(results, self.baseline, 0.2)
+
+        # Assert
+        self.assertEquals(len(regressions), 4)
+        self.assertTrue(regressions[0].startswith('reviews-list p50_ms'))
+
+    def test_more_queries_regress(self):
+        # Arrange
+        results = {'reviews-list': summarize([0.010] * 10, [3] * 10)}
+
+        # Act
+        regressions = compare_results(results, self.baseline, 0.2)
+
+        # Assert
+        self.assertEquals(len(regressions), 1)
+        self.assertIn('queries_per_request', regressions[0])
@@ -0,0 +1,156 @@
+import itertools
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.companies import get_company
+from evaluation.models import CompanyRatingSummary, Review
+
+
+class CompanyRatingServicesTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.titles = itertools.count()
+
+    def review_payload(self, rating, company='Company 01'):
+        return {
+            'title': 'Title New %02d' % next(self.titles),
+            'summary': 'Summary New',
+            'rating': rating,
+            'company': company
+        }
+
+    def test_rating_unauthenticated(self):
+        # Arrange
+        self.client.force_authenticate(None)
+
+        # Act
+        response = self.client.get(
+            reverse('evaluation:company-rating', args=['Company 01'])
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rating_unknown_company(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:company-rating', args=['Company 01'])
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rating_of_unnormalized_name(self):
+        # Arrange
+        self.client.post(
+            reverse('evaluation:reviews-list'), self.review_payload(5)
+        )
+
+        # Act
+        responses = [
+            self.client.get(
+                reverse('evaluation:company-rating', args=[name])
+            ) for name in (' Company   01 ', '\uff23ompany\u00a001')
+        ]
+
+        # Assert
+        for response in responses:
+            self.assertEquals(response.status_code, status.HTTP_200_OK)
+            self.assertEquals(response.data['company'], 'Company 01')
+            self.assertEquals(response.data['count'], 1)
+
+    def test_rating_of_name_with_slash(self):
+        # Arrange
+        self.client.post(
+            reverse('evaluation:reviews-list'),
+            self.review_payload(4, company='AT/T Mobility')
+        )
+
+        # Act
+        responses = [
+            self.client.get(
+                reverse('evaluation:company-rating', args=['AT/T Mobility'])
+            ),
+            self.client.get('/api/companies/AT%2FT%20Mobility/rating/'),
+        ]
+
+        # Assert
+        for response in responses:
+            self.assertEquals(response.status_code, status.HTTP_200_OK)
+            self.assertEquals(response.data['company'], 'AT/T Mobility')
+            self.assertEquals(response.data['count'], 1)
+
+    def test_rating_follows_single_and_bulk_creates(self):
+        # Arrange
+        self.client.post(
+            reverse('evaluation:reviews-list'), self.review_payload(5)
+        )
+        self.client.post(
+            reverse('evaluation:reviews-bulk'),
+            [
+                self.review_payload(4),
+                self.review_payload(4),
+                self.review_payload(1),
+                self.review_payload(3, company='Company 02'),
+                self.review_payload(10)
+            ]
+        )
+        expected_response = {
+            'company': 'Company 01',
+            'count': 4,
+            'sum': 14,
+            'average': 3.5,
+            'histogram': {'1': 1, '2': 0, '3': 0, '4': 2, '5': 1}
+        }
+
+        # Act
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('evaluation:company-rating', args=['Company 01'])
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data, expected_response)
+        self.assertEquals(
+            CompanyRatingSummary.objects.get(
+                company__name='Company 02'
+            ).count,
+            1
+        )
+
+    def test_rebuild_detects_and_fixes_drift(self):
+        # Arrange
+        self.client.post(
+            reverse('evaluation:reviews-list'), self.review_payload(5)
+        )
+        Review.objects.create(
+            user=self.user,
+            rating=2,
+            title='Test Review 01',
+            summary='Test Review 01 Summary',
+            company=get_company('Company 01'),
+            ip_address='127.0.0.1'
+        )
+
+        # Act / Assert
+        with self.assertRaises(CommandError):
+            call_command(
+                'rebuild_company_ratings', '--check', stdout=StringIO()
+            )
+
+        call_command('rebuild_company_ratings', stdout=StringIO())
+        summary = CompanyRatingSummary.objects.get(company__name='Company 01')
+        self.assertEquals((summary.count, summary.total), (2, 7))
+        self.assertEquals(summary.rating_2, 1)
+
+        call_command('rebuild_company_ratings', '--check', stdout=StringIO())
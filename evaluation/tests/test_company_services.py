@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.companies import company_cache, get_companies, get_company
+from evaluation.models import Company, Review
+
+
+class CompanyServicesTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post_review(self, title, company):
+        return self.client.post(reverse('evaluation:reviews-list'), {
+            'title': title,
+            'summary': 'Summary New',
+            'rating': 5,
+            'company': company
+        })
+
+    def test_company_names_are_interned(self):
+        # Act
+        first = self.post_review('Title 01', 'Bean  Bar')
+        second = self.post_review('Title 02', ' Bean Bar\n')
+
+        # Assert
+        self.assertEquals(first.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(first.data['company'], 'Bean Bar')
+        self.assertEquals(second.data['company'], 'Bean Bar')
+        self.assertEquals(Company.objects.count(), 1)
+        self.assertEquals(
+            set(Review.objects.values_list('company__name', flat=True)),
+            {'Bean Bar'}
+        )
+
+    def test_get_companies_creates_missing_ones(self):
+        # Arrange
+        Company.objects.create(name='Bean Bar')
+
+        # Act
+        with self.assertNumQueries(3):
+            companies = get_companies(['Bean Bar', 'Quick  Ship'])
+
+        # Assert
+        self.assertEquals(set(companies), {'Bean Bar', 'Quick Ship'})
+        self.assertEquals(Company.objects.count(), 2)
+
+
+class CompanyCacheTestCase(TransactionTestCase):
+    def test_company_is_cached_once_committed(self):
+        # Arrange
+        company = get_company('Bean Bar')
+
+        # Act
+        with self.assertNumQueries(0):
+            cached = get_company('Bean  Bar')
+
+        # Assert
+        self.assertEquals(cached.pk, company.pk)
+
+    def test_rolled_back_company_is_not_cached(self):
+        # Act
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                get_company('Bean Bar')
+                raise ValueError
+
+        # Assert
+        self.assertIsNone(company_cache.get('Bean Bar'))
+        self.assertFalse(Company.objects.exists())
@@ -0,0 +1,184 @@
+import json
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from evaluation import archive, fields
+from evaluation.companies import get_company
+from evaluation.models import ArchivedReview, Review
+from evaluation.services import bulk_create_reviews
+
+LONG_SUMMARY = 'The espresso was rich and the staff friendly. ' * 20
+
+
+class CompressedSummaryTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.review = self.create_review(LONG_SUMMARY)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_review(self, summary):
+        return Review.objects.create(
+            user=self.user,
+            rating=4,
+            title='Great coffee',
+            summary=summary,
+            company=get_company('Bean Bar'),
+            ip_address='127.0.0.1'
+        )
+
+    def stored_summary(self, review):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT summary FROM evaluation_review WHERE id = %s',
+                [review.pk]
+            )
+            return cursor.fetchone()[0]
+
+    def test_long_summary_is_stored_compressed(self):
+        # Act
+        stored = bytes(self.stored_summary(self.review))
+
+        # Assert
+        self.assertEquals(stored[:1], fields.ZLIB)
+        self.assertLess(len(stored), len(LONG_SUMMARY))
+
+    def test_short_summary_is_stored_plain(self):
+        # Arrange
+        review = self.create_review('Short.')
+
+        # Act
+        stored = bytes(self.stored_summary(review))
+
+        # Assert
+        self.assertEquals(stored, fields.PLAIN + b'Short.')
+
+    def test_disabled_compression(self):
+        # Arrange
+        config = {'ENABLED': False, 'LEVEL': 6, 'MIN_SIZE': 128}
+
+        # Act
+        with override_settings(REVIEWS_SUMMARY_COMPRESSION=config):
+            review = self.create_review(LONG_SUMMARY)
+
+        # Assert
+        self.assertEquals(
+            bytes(self.stored_summary(review))[:1], fields.PLAIN
+        )
+        self.assertEquals(
+            Review.objects.get(pk=review.pk).summary, LONG_SUMMARY
+        )
+
+    def test_summary_is_decompressed_on_first_read(self):
+        # Arrange
+        review = Review.objects.get(pk=self.review.pk)
+        loaded = review.__dict__['summary']
+
+        # Act
+        summary = review.summary
+
+        # Assert
+        self.assertIsInstance(loaded, fields.CompressedText)
+        self.assertEquals(summary, LONG_SUMMARY)
+        self.assertEquals(review.__dict__['summary'], LONG_SUMMARY)
+
+    def test_plain_text_rows_are_readable(self):
+        # Arrange
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'UPDATE evaluation_review SET summary = %s WHERE id = %s',
+                ['Stored before compression.', self.review.pk]
+            )
+
+        # Act
+        review = Review.objects.get(pk=self.review.pk)
+
+        # Assert
+        self.assertEquals(review.summary, 'Stored before compression.')
+
+    def test_search_finds_compressed_summary(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-list'), {'q': 'espresso'}
+        )
+
+        # Assert
+        self.assertEquals(
+            [review['id'] for review in response.data['results']],
+            [self.review.pk]
+        )
+        self.assertEquals(
+            response.data['results'][0]['summary'], LONG_SUMMARY
+        )
+
+    def search(self, query):
+        response = self.client.get(
+            reverse('evaluation:reviews-list'), {'q': query}
+        )
+        return [review['title'] for review in response.data['results']]
+
+    def test_schema_does_not_need_sql_function(self):
+        # Act
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = 'evaluation_review'"
+            )
+            triggers = [row[0] for row in cursor.fetchall()]
+
+        # Assert
+        self.assertTrue(triggers)
+        for sql in triggers:
+            self.assertNotIn(fields.SQL_FUNCTION, sql)
+
+    def test_bulk_created_reviews_are_searchable(self):
+        # Arrange
+        reviews = [
+            Review(
+                user=self.user,
+                rating=3,
+                title='Bulk review %d' % index,
+                summary='Bulk summary about latte art. ' * 10,
+                company=get_company('Bean Bar'),
+                ip_address='127.0.0.1'
+            ) for index in range(3)
+        ]
+
+        # Act
+        bulk_create_reviews(reviews, batch_size=2)
+
+        # Assert
+        self.assertEquals(
+            sorted(self.search('latte')),
+            ['Bulk review 0', 'Bulk review 1', 'Bulk review 2']
+        )
+
+    def test_updated_review_is_reindexed(self):
+        # Arrange
+        review = Review.objects.get(pk=self.review.pk)
+        review.summary = 'The cappuccino was burnt. ' * 10
+
+        # Act
+        review.save()
+
+        # Assert
+        self.assertEquals(self.search('espresso'), [])
+        self.assertEquals(self.search('cappuccino'), ['Great coffee'])
+
+    def test_export_and_archive_keep_summary(self):
+        # Arrange
+        archive.archive_reviews(archive.archive_cutoff(-1))
+
+        # Act
+        response = self.client.get(reverse('evaluation:reviews-export'))
+        body = b''.join(response.streaming_content).decode('utf-8')
+
+        # Assert
+        self.assertEquals(
+            ArchivedReview.objects.get(pk=self.review.pk).summary, LONG_SUMMARY
+        )
+        self.assertEquals(json.loads(body)['summary'], LONG_SUMMARY)
@@ -0,0 +1,165 @@
+import gzip
+import json
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.companies import get_company
+from evaluation.compression import accepts_gzip
+from evaluation.models import Review
+
+
+def compression_settings(min_size=1024, level=3,
+                         content_types=('application/json',
+                                        'application/x-ndjson')):
+    return override_settings(REVIEWS_COMPRESSION={
+        'ENABLED': True,
+        'MIN_SIZE': min_size,
+        'LEVEL': level,
+        'CONTENT_TYPES': content_types,
+    })
+
+
+class AcceptEncodingTestCase(SimpleTestCase):
+    def test_accepts_gzip(self):
+        self.assertTrue(accepts_gzip('gzip, deflate, br'))
+        self.assertTrue(accepts_gzip('br;q=1.0, GZIP;q=0.5'))
+        self.assertTrue(accepts_gzip('*'))
+        self.assertFalse(accepts_gzip(''))
+        self.assertFalse(accepts_gzip('identity'))
+        self.assertFalse(accepts_gzip('gzip;q=0, *'))
+        self.assertFalse(accepts_gzip('gzip;q=invalid'))
+
+
+class CompressionMiddlewareTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        for index in range(20):
+            Review.objects.create(
+                user=self.user,
+                rating=4,
+                title='Test Review %02d' % index,
+                summary='Test Review Summary ' * 10,
+                company=get_company('Company 01'),
+                ip_address='127.0.0.1'
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_compressed(self):
+        # Act
+        with compression_settings():
+            response = self.client.get(
+                reverse('evaluation:reviews-list'),
+                HTTP_ACCEPT_ENCODING='gzip'
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertEquals(
+            int(response['Content-Length']), len(response.content)
+        )
+        data = json.loads(gzip.decompress(response.content).decode('utf-8'))
+        self.assertEquals(len(data['results']), 20)
+
+    def test_list_not_modified_with_weak_etag(self):
+        # Arrange
+        url = reverse('evaluation:reviews-list')
+        with compression_settings():
+            first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+            # Act
+            response = self.client.get(
+                url, HTTP_ACCEPT_ENCODING='gzip',
+                HTTP_IF_NONE_MATCH=first['ETag']
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_not_compressed_without_accept_encoding(self):
+        # Act
+        with compression_settings():
+            response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEquals(len(json.loads(response.content)['results']), 20)
+
+    def test_small_response_is_not_compressed(self):
+        # Act
+        with compression_settings(min_size=100000):
+            response = self.client.get(
+                reverse('evaluation:reviews-list'),
+                HTTP_ACCEPT_ENCODING='gzip'
+            )
+
+        # Assert
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_export_is_compressed_while_streaming(self):
+        # Act
+        with compression_settings(min_size=500):
+            response = self.client.get(
+                reverse('evaluation:reviews-export'),
+                HTTP_ACCEPT_ENCODING='gzip'
+            )
+            content = b''.join(response.streaming_content)
+
+        # Assert
+        self.assertTrue(response.streaming)
+        self.assertEquals(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(content).decode('utf-8').splitlines()
+        self.assertEquals(len(lines), 20)
+        self.assertEquals(json.loads(lines[0])['title'], 'Test Review 00')
+
+    def test_short_export_is_not_compressed(self):
+        # Act
+        with compression_settings(min_size=100000):
+            response = self.client.get(
+                reverse('evaluation:reviews-export'),
+                HTTP_ACCEPT_ENCODING='gzip'
+            )
+            content = b''.join(response.streaming_content)
+
+        # Assert
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEquals(len(content.decode('utf-8').splitlines()), 20)
+
+    def test_html_is_not_compressed(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-list'),
+            HTTP_ACCEPT='text/html', HTTP_ACCEPT_ENCODING='gzip'
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_page_with_csrf_token_is_not_compressed(self):
+        # Arrange
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='Amvnfr213!'
+        )
+        self.client.force_login(admin)
+
+        # Act
+        with compression_settings(min_size=100, content_types=('text/',)):
+            response = self.client.get(
+                reverse('admin:evaluation_review_changelist'),
+                HTTP_ACCEPT_ENCODING='gzip'
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        self.assertFalse(response.has_header('Content-Encoding'))
@@ -0,0 +1,70 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from ca_arthur_trial.backends.sqlite3.base import DatabaseWrapper
+
+
+class DatabaseBackendTestCase(TestCase):
+    def test_pragmas_are_applied(self):
+        # Act
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            busy_timeout = cursor.fetchone()[0]
+            cursor.execute('PRAGMA temp_store')
+            temp_store = cursor.fetchone()[0]
+
+        # Assert
+        self.assertEquals(busy_timeout, 5000)
+        self.assertEquals(temp_store, 2)
+
+
+class DatabaseWrapperTestCase(SimpleTestCase):
+    def make_wrapper(self, options):
+        return DatabaseWrapper({
+            'ENGINE': 'ca_arthur_trial.backends.sqlite3',
+            'NAME': ':memory:',
+            'OPTIONS': options,
+            'AUTOCOMMIT': True,
+            'ATOMIC_REQUESTS': False,
+            'CONN_MAX_AGE': 0,
+            'TIME_ZONE': None,
+            'USER': '',
+            'PASSWORD': '',
+            'HOST': '',
+            'PORT': '',
+            'TEST': {},
+        })
+
+    def test_extra_options_are_not_connect_arguments(self):
+        # Arrange
+        wrapper = self.make_wrapper({
+            'timeout': 10,
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {'journal_mode': 'WAL'}
+        })
+
+        # Act
+        params = wrapper.get_connection_params()
+
+        # Assert
+        self.assertEquals(params['timeout'], 10)
+        self.assertNotIn('pragmas', params)
+        self.assertNotIn('transaction_mode', params)
+
+    def test_invalid_pragma(self):
+        # Arrange
+        wrapper = self.make_wrapper({
+            'pragmas': {'journal_mode': 'WAL; DROP TABLE auth_user'}
+        })
+
+        # Act / Assert
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.get_pragmas()
+
+    def test_invalid_transaction_mode(self):
+        # Arrange
+        wrapper = self.make_wrapper({'transaction_mode': 'LAZY'})
+
+        # Act / Assert
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.get_transaction_mode()
@@ -0,0 +1,144 @@
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.client = APIClient()
+
+    def test_requests_are_counted_by_url_name(self):
+        # Arrange
+        self.client.force_authenticate(self.user)
+        labels = {'view': 'evaluation:reviews-list', 'method': 'GET'}
+        requests = sample(
+            'reviews_http_requests_total', status='200', **labels
+        )
+        observations = sample(
+            'reviews_http_request_duration_seconds_count', **labels
+        )
+        queries = sample(
+            'reviews_db_queries_total', view='evaluation:reviews-list'
+        )
+
+        # Act
+        self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertEquals(
+            sample('reviews_http_requests_total', status='200', **labels),
+            requests + 1
+        )
+        self.assertEquals(
+            sample('reviews_http_request_duration_seconds_count', **labels),
+            observations + 1
+        )
+        self.assertGreater(
+            sample('reviews_db_queries_total', view='evaluation:reviews-list'),
+            queries
+        )
+        self.assertEquals(sample('reviews_http_requests_in_flight'), 0)
+
+    def test_auth_failures_are_counted(self):
+        # Arrange
+        failures = sample(
+            'reviews_auth_failures_total', view='evaluation:token_obtain_pair'
+        )
+
+        # Act
+        response = self.client.post(reverse('evaluation:token_obtain_pair'), {
+            'username': 'first_user', 'password': 'wrong'
+        })
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEquals(
+            sample(
+                'reviews_auth_failures_total',
+                view='evaluation:token_obtain_pair'
+            ),
+            failures + 1
+        )
+
+    @override_settings(REVIEWS_METRICS={
+        'ENABLED': True, 'TOKEN': 's3cret', 'MULTIPROCESS_DIR': None
+    })
+    def test_metrics_endpoint(self):
+        # Act
+        response = self.client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret'
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            b'reviews_http_request_duration_seconds_bucket', response.content
+        )
+        self.assertIn(b'reviews_created_total', response.content)
+
+    @override_settings(REVIEWS_METRICS={
+        'ENABLED': True, 'TOKEN': 's3cret', 'MULTIPROCESS_DIR': None
+    })
+    def test_metrics_require_staff_or_token(self):
+        # Arrange
+        staff = User.objects.create_user(
+            username='staff_user', password='Amvnfr213!', is_staff=True
+        )
+
+        # Act
+        anonymous = self.client.get(reverse('metrics'))
+        wrong_token = self.client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong'
+        )
+        self.client.force_login(self.user)
+        not_staff = self.client.get(reverse('metrics'))
+        self.client.force_login(staff)
+        staff_response = self.client.get(reverse('metrics'))
+
+        # Assert
+        self.assertEquals(anonymous.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEquals(wrong_token.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEquals(not_staff.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEquals(staff_response.status_code, status.HTTP_200_OK)
+
+    @override_settings(REVIEWS_METRICS={
+        'ENABLED': False, 'TOKEN': None, 'MULTIPROCESS_DIR': None
+    })
+    def test_metrics_disabled(self):
+        # Act
+        response = self.client.get(reverse('metrics'))
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ReviewsCreatedMetricTestCase(TransactionTestCase):
+    def test_created_reviews_are_counted(self):
+        # Arrange
+        user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        created = sample('reviews_created_total')
+
+        # Act
+        client.post(reverse('evaluation:reviews-bulk'), [{
+            'title': 'Title New %02d' % index,
+            'summary': 'Summary New',
+            'rating': 5,
+            'company': 'New Company'
+        } for index in range(2)], format='json')
+
+        # Assert
+        self.assertEquals(sample('reviews_created_total'), created + 2)
@@ -0,0 +1,184 @@
+from unittest import mock
+from django.contrib.admin import helpers
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from evaluation.admin import EstimatedCountPaginator
+from evaluation.companies import get_company
+from evaluation.models import CompanyRatingSummary, Review
+from evaluation.services import (
+    RATING_SUMMARY_FIELDS, compute_company_ratings
+)
+
+
+class ReviewAdminTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='Amvnfr213!'
+        )
+        for index in range(6):
+            Review.objects.create(
+                user=self.admin,
+                rating=index % 2 + 4,
+                title='Test Review %02d' % index,
+                summary='Delivery was %s' % ('fast' if index < 2 else 'slow'),
+                company=get_company('Company %02d' % (index % 3)),
+                ip_address='127.0.0.1'
+            )
+        CompanyRatingSummary.objects.bulk_create(
+            compute_company_ratings().values()
+        )
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:evaluation_review_changelist')
+
+    def titles(self, response):
+        return sorted(
+            str(review) for review in response.context['cl'].result_list
+        )
+
+    def test_changelist(self):
+        # Act
+        response = self.client.get(self.url)
+
+        # Assert
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response.context['cl'].result_count, 6)
+        self.assertIsNone(response.context['cl'].full_result_count)
+
+    def test_search_uses_full_text_index(self):
+        # Act
+        response = self.client.get(self.url, {'q': 'fast'})
+
+        # Assert
+        self.assertEquals(
+            self.titles(response), ['Test Review 00', 'Test Review 01']
+        )
+
+    def test_filters(self):
+        # Arrange
+        company = get_company('Company 01')
+
+        # Act
+        by_rating = self.client.get(self.url, {'rating': '5'})
+        by_company = self.client.get(self.url, {'company': company.pk})
+
+        # Assert
+        self.assertEquals(
+            self.titles(by_rating),
+            ['Test Review 01', 'Test Review 03', 'Test Review 05']
+        )
+        self.assertEquals(
+            self.titles(by_company), ['Test Review 01', 'Test Review 04']
+        )
+
+    def test_estimated_count(self):
+        # Arrange
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE evaluation_review')
+
+        # Act
+        with mock.patch.object(EstimatedCountPaginator, 'exact_count_limit', 2):
+            unfiltered = EstimatedCountPaginator(
+                Review.objects.order_by('id'), 100
+            ).count
+            filtered = EstimatedCountPaginator(
+                Review.objects.filter(rating=4).order_by('id'), 100
+            ).count
+
+        # Assert
+        self.assertEquals(unfiltered, 6)
+        self.assertEquals(filtered, 3)
+
+    def rating_summaries(self):
+        return {
+            summary.company_id: [
+                getattr(summary, field) for field in RATING_SUMMARY_FIELDS
+            ] for summary in CompanyRatingSummary.objects.all()
+        }
+
+    def expected_rating_summaries(self):
+        return {
+            summary.company_id: [
+                getattr(summary, field) for field in RATING_SUMMARY_FIELDS
+            ] for summary in compute_company_ratings().values()
+        }
+
+    def test_add_review_updates_rating_summary(self):
+        # Arrange
+        company = get_company('Company 03')
+
+        # Act
+        response = self.client.post(
+            reverse('admin:evaluation_review_add'), {
+                'user': self.admin.pk,
+                'title': 'Added Review',
+                'summary': 'Added from the admin',
+                'rating': 2,
+                'company': company.pk,
+                'ip_address': '',
+            }
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, 302)
+        self.assertEquals(
+            Review.objects.get(title='Added Review').company, company
+        )
+        self.assertEquals(
+            self.rating_summaries(), self.expected_rating_summaries()
+        )
+
+    def test_change_review_moves_rating_summary(self):
+        # Arrange
+        review = Review.objects.get(title='Test Review 00')
+
+        # Act
+        response = self.client.post(
+            reverse('admin:evaluation_review_change', args=[review.pk]), {
+                'user': self.admin.pk,
+                'title': review.title,
+                'summary': review.summary,
+                'rating': 1,
+                'company': get_company('Company 02').pk,
+                'ip_address': review.ip_address,
+            }
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, 302)
+        self.assertEquals(Review.objects.get(pk=review.pk).rating, 1)
+        self.assertEquals(
+            self.rating_summaries(), self.expected_rating_summaries()
+        )
+
+    def test_delete_selected_reviews(self):
+        # Arrange
+        reviews = Review.objects.filter(rating=5)
+        data = {
+            'action': 'delete_selected_reviews',
+            'select_across': '1',
+            helpers.ACTION_CHECKBOX_NAME: [reviews[0].pk],
+        }
+        confirmation = self.client.post(self.url + '?rating=5', data)
+
+        # Act
+        response = self.client.post(
+            self.url + '?rating=5', dict(data, post='yes')
+        )
+
+        # Assert
+        self.assertContains(confirmation, 'delete 3 reviews')
+        self.assertEquals(response.status_code, 302)
+        self.assertEquals(Review.objects.count(), 3)
+        self.assertFalse(Review.objects.filter(rating=5).exists())
+        self.assertEquals(
+            {
+                summary.company_id: (summary.count, summary.rating_5)
+                for summary in CompanyRatingSummary.objects.all()
+            },
+            {
+                summary.company_id: (summary.count, summary.rating_5)
+                for summary in compute_company_ratings().values()
+            }
+        )
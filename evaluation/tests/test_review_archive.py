@@ -0,0 +1,147 @@
+import datetime
+import io
+import json
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation import archive
+from evaluation.companies import get_company
+from evaluation.models import ArchivedReview, CompanyRatingSummary, Review
+from evaluation.services import compute_company_ratings, create_review
+
+
+class ReviewArchiveTestCase(TestCase):
+    def setUp(self):
+        self.first_user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.second_user = User.objects.create_user(
+            username='second_user', password='Amvnfr213!'
+        )
+        now = timezone.now()
+        for index in range(5):
+            review = create_review(Review(
+                user=self.first_user,
+                rating=index + 1,
+                title='Test Review %02d' % index,
+                summary='Archived summary' if index < 3 else 'Live summary',
+                company=get_company('Company 01'),
+                ip_address='127.0.0.1'
+            ))
+            # Reviews 0 and 2 are two years old, 1 is one and a half.
+            age = (730, 550, 720, 10, 0)[index]
+            Review.objects.filter(pk=review.pk).update(
+                date=now - datetime.timedelta(days=age)
+            )
+        self.reviews = list(Review.objects.order_by('id'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.first_user)
+
+    def test_archive_reviews(self):
+        # Act
+        moved = archive.archive_reviews(archive.archive_cutoff(365), 2)
+
+        # Assert
+        self.assertEquals(moved, 3)
+        self.assertEquals(
+            sorted(Review.objects.values_list('title', flat=True)),
+            ['Test Review 03', 'Test Review 04']
+        )
+        archived = ArchivedReview.objects.get(pk=self.reviews[0].pk)
+        self.assertEquals(archived.date, self.reviews[0].date)
+        self.assertEquals(archived.fingerprint, self.reviews[0].fingerprint)
+
+    def test_archived_reviews_keep_their_ratings(self):
+        # Arrange
+        archive.archive_reviews(archive.archive_cutoff(365))
+
+        # Act
+        expected = compute_company_ratings()
+
+        # Assert
+        summary = CompanyRatingSummary.objects.get()
+        self.assertEquals(summary.count, 5)
+        self.assertEquals(expected[summary.company_id].count, 5)
+        self.assertEquals(expected[summary.company_id].total, summary.total)
+
+    def test_list_and_search_skip_archived_reviews(self):
+        # Arrange
+        archive.archive_reviews(archive.archive_cutoff(365))
+
+        # Act
+        listed = self.client.get(reverse('evaluation:reviews-list'))
+        searched = self.client.get(
+            reverse('evaluation:reviews-list'), {'q': 'archived'}
+        )
+
+        # Assert
+        self.assertEquals(
+            [review['title'] for review in listed.data['results']],
+            ['Test Review 04', 'Test Review 03']
+        )
+        self.assertEquals(searched.data['results'], [])
+
+    def test_retrieve_archived_review(self):
+        # Arrange
+        archive.archive_reviews(archive.archive_cutoff(365))
+        url = reverse('evaluation:reviews-detail', args=[self.reviews[1].pk])
+
+        # Act
+        response = self.client.get(url)
+        not_modified = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data['title'], 'Test Review 01')
+        self.assertEquals(response.data['company'], 'Company 01')
+        self.assertEquals(response.data['user']['id'], self.first_user.pk)
+        self.assertEquals(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_archived_review_of_another_user(self):
+        # Arrange
+        archive.archive_reviews(archive.archive_cutoff(365))
+        self.client.force_authenticate(self.second_user)
+
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-detail', args=[self.reviews[1].pk])
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_merges_archived_reviews(self):
+        # Arrange
+        archive.archive_reviews(archive.archive_cutoff(600))
+
+        # Act
+        response = self.client.get(reverse('evaluation:reviews-export'))
+        body = b''.join(response.streaming_content).decode('utf-8')
+
+        # Assert
+        self.assertEquals(
+            [json.loads(line)['title'] for line in body.splitlines()],
+            ['Test Review 00', 'Test Review 02', 'Test Review 01',
+             'Test Review 03', 'Test Review 04']
+        )
+
+    def test_command_dry_run(self):
+        # Arrange
+        output = io.StringIO()
+
+        # Act
+        call_command(
+            'archive_reviews', '--age-days', '365', '--dry-run', stdout=output
+        )
+
+        # Assert
+        self.assertTrue(output.getvalue().startswith('3 reviews dated before'))
+        self.assertEquals(Review.objects.count(), 5)
@@ -0,0 +1,218 @@
+from django.core.cache import cache
+from django.test import (
+    Client, TestCase, TransactionTestCase, override_settings
+)
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.companies import get_company
+from evaluation.models import Review
+
+
+def create_review(user, title='Test Review 01'):
+    return Review.objects.create(
+        user=user,
+        rating=4,
+        title=title,
+        summary='Test Review Summary',
+        company=get_company('Company 01'),
+        ip_address='127.0.0.1'
+    )
+
+
+class ReviewConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.review = create_review(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_sets_validators(self):
+        # Act
+        response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_list_not_modified(self):
+        # Arrange
+        etag = self.client.get(reverse('evaluation:reviews-list'))['ETag']
+
+        # Act
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('evaluation:reviews-list'), HTTP_IF_NONE_MATCH=etag
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEquals(response['ETag'], etag)
+
+    def test_list_modified_after_new_review(self):
+        # Arrange
+        etag = self.client.get(reverse('evaluation:reviews-list'))['ETag']
+        create_review(self.user, title='Test Review 02')
+
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-list'), HTTP_IF_NONE_MATCH=etag
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(len(response.data['results']), 2)
+        self.assertNotEquals(response['ETag'], etag)
+
+    def test_list_etag_depends_on_query(self):
+        # Arrange
+        etag = self.client.get(reverse('evaluation:reviews-list'))['ETag']
+
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-list'),
+            {'page_size': 1},
+            HTTP_IF_NONE_MATCH=etag
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_not_modified(self):
+        # Arrange
+        url = reverse('evaluation:reviews-detail', args=[self.review.id])
+        first_response = self.client.get(url)
+
+        # Act
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=first_response['ETag']
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_if_modified_since(self):
+        # Arrange
+        url = reverse('evaluation:reviews-detail', args=[self.review.id])
+        first_response = self.client.get(url)
+
+        # Act
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=first_response['Last-Modified']
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_unknown_review(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-detail', args=['unknown'])
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(REVIEWS_LIST_CACHE_TIMEOUT=60)
+class ReviewListCacheTestCase(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.other_user = User.objects.create_user(
+            username='second_user', password='Amvnfr213!'
+        )
+        create_review(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_cached_list_skips_database(self):
+        # Arrange
+        first_response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Act
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data, first_response.data)
+        self.assertEquals(response['ETag'], first_response['ETag'])
+
+    def test_cached_list_not_modified(self):
+        # Arrange
+        etag = self.client.get(reverse('evaluation:reviews-list'))['ETag']
+
+        # Act
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('evaluation:reviews-list'), HTTP_IF_NONE_MATCH=etag
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_create_invalidates_cached_list(self):
+        # Arrange
+        self.client.get(reverse('evaluation:reviews-list'))
+
+        # Act
+        self.client.post(reverse('evaluation:reviews-list'), {
+            'title': 'Title New',
+            'summary': 'Summary New',
+            'rating': 5,
+            'company': 'New Company'
+        })
+        response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertEquals(len(response.data['results']), 2)
+
+    def test_admin_change_invalidates_cached_list(self):
+        # Arrange
+        self.client.get(reverse('evaluation:reviews-list'))
+        review = self.user.reviews.get()
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='Amvnfr213!'
+        )
+        admin_client = Client()
+        admin_client.force_login(admin)
+
+        # Act
+        admin_client.post(
+            reverse('admin:evaluation_review_change', args=[review.pk]), {
+                'user': self.user.pk,
+                'title': 'Title Changed',
+                'summary': review.summary,
+                'rating': review.rating,
+                'company': review.company_id,
+                'ip_address': '',
+            }
+        )
+        response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertEquals(
+            response.data['results'][0]['title'], 'Title Changed'
+        )
+
+    def test_cache_is_per_user(self):
+        # Arrange
+        self.client.get(reverse('evaluation:reviews-list'))
+        self.client.force_authenticate(self.other_user)
+
+        # Act
+        response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertEquals(response.data['results'], [])
@@ -0,0 +1,181 @@
+import datetime
+import shutil
+import tempfile
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation import ingest
+from evaluation.models import IngestTicket, Review, review_fingerprint
+
+
+def duplicate_settings(policy='reject', window=3600):
+    return override_settings(REVIEWS_DUPLICATES={
+        'WINDOW': window, 'POLICY': policy
+    })
+
+
+class ReviewDuplicateServicesTestCase(TestCase):
+    def setUp(self):
+        self.first_user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.second_user = User.objects.create_user(
+            username='second_user', password='Amvnfr213!'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.first_user)
+
+    def review_payload(self, title='Title New', summary='Summary New'):
+        return {
+            'title': title,
+            'summary': summary,
+            'rating': 5,
+            'company': 'New Company'
+        }
+
+    def post_review(self, payload=None):
+        return self.client.post(
+            reverse('evaluation:reviews-list'),
+            payload or self.review_payload()
+        )
+
+    def test_fingerprint_ignores_case_and_whitespace(self):
+        self.assertEquals(
+            review_fingerprint('Title  New', 'Summary\nNew ', 'New Company'),
+            review_fingerprint('title new', 'SUMMARY NEW', 'new company')
+        )
+        self.assertNotEqual(
+            review_fingerprint('Title New', 'Summary New', 'New Company'),
+            review_fingerprint('Title New', 'Summary New', 'Old Company')
+        )
+
+    def test_duplicate_is_rejected(self):
+        # Arrange
+        first = self.post_review()
+
+        # Act
+        with duplicate_settings('reject'):
+            response = self.post_review(self.review_payload(
+                title='TITLE   new'
+            ))
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEquals(response.data['review'], first.data['id'])
+        self.assertEquals(1, Review.objects.count())
+
+    def test_duplicate_is_collapsed(self):
+        # Arrange
+        first = self.post_review()
+
+        # Act
+        with duplicate_settings('collapse'):
+            response = self.post_review()
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data['id'], first.data['id'])
+        self.assertNotIn('fingerprint', response.data)
+        self.assertEquals(1, Review.objects.count())
+
+    def test_same_review_of_another_user_is_not_a_duplicate(self):
+        # Arrange
+        self.post_review()
+        self.client.force_authenticate(self.second_user)
+
+        # Act
+        response = self.post_review()
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+
+    def test_duplicate_outside_the_window(self):
+        # Arrange
+        self.post_review()
+        Review.objects.update(
+            date=timezone.now() - datetime.timedelta(hours=2)
+        )
+
+        # Act
+        with duplicate_settings(window=3600):
+            response = self.post_review()
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+
+    def test_duplicate_check_disabled(self):
+        # Arrange
+        self.post_review()
+
+        # Act
+        with duplicate_settings(window=0):
+            response = self.post_review()
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(2, Review.objects.count())
+
+    def test_bulk_duplicates_are_rejected(self):
+        # Arrange
+        self.post_review()
+        payload = [
+            self.review_payload(),
+            self.review_payload(title='Title 01'),
+            self.review_payload(title='Title 01'),
+        ]
+
+        # Act
+        with duplicate_settings('reject'):
+            response = self.client.post(
+                reverse('evaluation:reviews-bulk'), payload
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(response.data['created'], 1)
+        self.assertEquals(
+            [error['index'] for error in response.data['errors']], [0, 2]
+        )
+        self.assertEquals(2, Review.objects.count())
+
+    def test_bulk_duplicates_are_collapsed(self):
+        # Arrange
+        payload = [self.review_payload(), self.review_payload()]
+
+        # Act
+        with duplicate_settings('collapse'):
+            response = self.client.post(
+                reverse('evaluation:reviews-bulk'), payload
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(response.data, {'created': 1, 'errors': []})
+
+    def test_queued_duplicates_are_collapsed(self):
+        # Arrange
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        with override_settings(REVIEWS_INGEST={
+            'ENABLED': True,
+            'SPOOL_DIR': spool_dir,
+            'FSYNC': False,
+            'BATCH_SIZE': 10,
+        }), duplicate_settings('collapse'):
+            tickets = [self.post_review().data['ticket'] for _ in range(2)]
+
+            # Act
+            created, rejected = ingest.drain()
+
+        # Assert
+        self.assertEquals((created, rejected), (2, 0))
+        review = Review.objects.get()
+        self.assertEquals(
+            set(IngestTicket.objects.filter(
+                ticket__in=tickets
+            ).values_list('review', flat=True)),
+            {review.id}
+        )
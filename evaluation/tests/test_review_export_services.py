@@ -0,0 +1,111 @@
+import csv
+import datetime
+import io
+import json
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.companies import get_company
+from evaluation.models import Review
+
+
+class ReviewExportServicesTestCase(TestCase):
+    def setUp(self):
+        self.first_user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.second_user = User.objects.create_user(
+            username='second_user', password='Amvnfr213!'
+        )
+        for index in range(3):
+            self.create_review(self.first_user, 'Test Review %02d' % index)
+        self.create_review(self.second_user, 'Other Review')
+        self.client = APIClient()
+        self.client.force_authenticate(self.first_user)
+
+    def create_review(self, user, title):
+        return Review.objects.create(
+            user=user,
+            rating=4,
+            title=title,
+            summary='Test Review Summary, with "quotes"\nand lines',
+            company=get_company('Company 01'),
+            ip_address='127.0.0.1'
+        )
+
+    def export(self, **params):
+        response = self.client.get(
+            reverse('evaluation:reviews-export'), params
+        )
+        body = b''.join(response.streaming_content).decode('utf-8')
+        return response, body
+
+    def test_export_ndjson(self):
+        # Act
+        response, body = self.export(format='ndjson')
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(
+            response['Content-Type'], 'application/x-ndjson; charset=utf-8'
+        )
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEquals(
+            [row['title'] for row in rows],
+            ['Test Review 00', 'Test Review 01', 'Test Review 02']
+        )
+        self.assertEquals(
+            set(rows[0]),
+            {'id', 'title', 'summary', 'rating', 'company', 'ip_address',
+             'date'}
+        )
+
+    def test_export_csv(self):
+        # Act
+        response, body = self.export(format='csv')
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertIn('reviews.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEquals(3, len(rows))
+        self.assertEquals(
+            rows[0]['summary'], 'Test Review Summary, with "quotes"\nand lines'
+        )
+        self.assertEquals(rows[0]['rating'], '4')
+
+    def test_export_since(self):
+        # Arrange
+        since = timezone.now() + datetime.timedelta(seconds=1)
+        Review.objects.filter(title='Test Review 02').update(
+            date=since + datetime.timedelta(minutes=1)
+        )
+
+        # Act
+        response, body = self.export(since=since.isoformat())
+
+        # Assert
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEquals([row['title'] for row in rows], ['Test Review 02'])
+
+    def test_export_invalid_since(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-export'), {'since': 'yesterday'}
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_unauthenticated(self):
+        # Arrange
+        self.client.force_authenticate(None)
+
+        # Act
+        response = self.client.get(reverse('evaluation:reviews-export'))
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,124 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.companies import get_company
+from evaluation.models import Review
+from evaluation.serializers import ReviewSerializer
+from evaluation.views import ReviewViewSet
+
+
+class ReviewFieldsetsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        for index in range(3):
+            self.review = Review.objects.create(
+                user=self.user,
+                rating=4,
+                title='Test Review %02d' % index,
+                summary='Test Review Summary',
+                company=get_company('Company 01'),
+                ip_address='127.0.0.1'
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def review_query(self, queries):
+        return next(
+            query['sql'] for query in queries
+            if 'FROM "evaluation_review"' in query['sql']
+            and '"evaluation_review"."title"' in query['sql']
+        )
+
+    def test_field_columns_cover_the_serializer(self):
+        self.assertEquals(
+            set(ReviewViewSet.field_columns), set(ReviewSerializer().fields)
+        )
+
+    def test_list_fields(self):
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('evaluation:reviews-list'), {'fields': 'title,rating'}
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(len(response.data['results']), 3)
+        for review in response.data['results']:
+            self.assertEquals(set(review), {'title', 'rating'})
+        sql = self.review_query(queries)
+        self.assertNotIn('"summary"', sql)
+        self.assertNotIn('"ip_address"', sql)
+        self.assertNotIn('evaluation_company', sql)
+
+    def test_list_exclude(self):
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('evaluation:reviews-list'),
+                {'exclude': 'summary,user'}
+            )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(
+            set(response.data['results'][0]),
+            {'id', 'company', 'title', 'rating', 'ip_address', 'date'}
+        )
+        self.assertEquals(
+            response.data['results'][0]['company'], 'Company 01'
+        )
+        self.assertNotIn('"summary"', self.review_query(queries))
+
+    def test_list_fields_keep_pagination(self):
+        # Act
+        first = self.client.get(
+            reverse('evaluation:reviews-list'),
+            {'fields': 'title', 'page_size': 2}
+        )
+        second = self.client.get(first.data['next'])
+
+        # Assert
+        self.assertEquals(
+            [review['title'] for review in
+             first.data['results'] + second.data['results']],
+            ['Test Review 02', 'Test Review 01', 'Test Review 00']
+        )
+
+    def test_retrieve_fields(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-detail', args=[self.review.id]),
+            {'fields': 'id,company'}
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(
+            response.data, {'id': self.review.id, 'company': 'Company 01'}
+        )
+
+    def test_retrieve_etag_depends_on_fields(self):
+        # Act
+        url = reverse('evaluation:reviews-detail', args=[self.review.id])
+        full = self.client.get(url)
+        trimmed = self.client.get(url, {'fields': 'title'})
+
+        # Assert
+        self.assertNotEqual(full['ETag'], trimmed['ETag'])
+
+    def test_unknown_field(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-list'), {'fields': 'title,secret'}
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEquals(response.data['fields'], ['Unknown fields: secret.'])
@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from evaluation.companies import get_company
+from evaluation.models import CompanyRatingSummary, Review
+
+
+class ReviewImportServicesTestCase(TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.first_user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.second_user = User.objects.create_user(
+            username='second_user', password='Amvnfr213!'
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.workdir, name)
+        with open(path, 'w', encoding='utf-8') as source:
+            source.write(content)
+        return path
+
+    def read_rejects(self, path):
+        with open(path + '.rejects', encoding='utf-8') as rejects:
+            return [json.loads(line) for line in rejects]
+
+    def import_reviews(self, path, *args):
+        call_command('import_reviews', path, *args, stdout=StringIO())
+
+    def test_import_csv(self):
+        # Arrange
+        path = self.write_file('reviews.csv', (
+            'username,title,summary,rating,company,ip_address,date\n'
+            'first_user,Title 01,"Summary, quoted",5,Company 01,8.8.8.8,'
+            '2015-06-01T10:00:00Z\n'
+            'second_user,Title 02,Summary 02,3,Company 01,,\n'
+        ))
+
+        # Act
+        self.import_reviews(path)
+
+        # Assert
+        review = self.first_user.reviews.get()
+        self.assertEquals(review.summary, 'Summary, quoted')
+        self.assertEquals(review.ip_address, '8.8.8.8')
+        self.assertEquals(review.date.year, 2015)
+        self.assertEquals(1, self.second_user.reviews.count())
+        self.assertEquals(
+            CompanyRatingSummary.objects.get(
+                company__name='Company 01'
+            ).total,
+            8
+        )
+
+    def test_import_keeps_the_date_of_each_row(self):
+        # Arrange
+        for title in ('Existing', 'Deleted'):
+            Review.objects.create(
+                user=self.first_user, rating=4, title=title,
+                summary='Existing', company=get_company('Company 01')
+            )
+        # SQLite does not reuse the id of the newest review once deleted.
+        Review.objects.get(title='Deleted').delete()
+        rows = [('Title 03', 3), ('Title 01', 1), ('Title 01', 4),
+                ('Title 02', 2)]
+        path = self.write_file('reviews.ndjson', '\n'.join([
+            json.dumps({
+                'username': 'first_user', 'title': title,
+                'summary': 'Summary', 'rating': 4, 'company': 'Company 02',
+                'date': '2016-03-%02dT08:30:00Z' % day
+            }) for title, day in rows
+        ] + [json.dumps({
+            'username': 'second_user', 'title': 'Undated', 'summary': 'x',
+            'rating': 2, 'company': 'Company 02'
+        })]))
+
+        # Act
+        self.import_reviews(path, '--batch-size', '3')
+
+        # Assert
+        self.assertEquals(
+            [(review.title, review.date.day) for review in
+             Review.objects.filter(date__year=2016).order_by('title', 'id')],
+            [('Title 01', 1), ('Title 01', 4), ('Title 02', 2),
+             ('Title 03', 3)]
+        )
+        self.assertEquals(
+            Review.objects.get(title='Undated').date.year,
+            timezone.now().year
+        )
+        self.assertTrue(Review._meta.get_field('date').auto_now)
+
+    def test_invalid_rows_are_rejected(self):
+        # Arrange
+        path = self.write_file('reviews.ndjson', '\n'.join([
+            json.dumps({'username': 'first_user', 'title': 'Title 01',
+                        'summary': 'Summary 01', 'rating': 4,
+                        'company': 'Company 01'}),
+            json.dumps({'username': 'first_user', 'title': 'Title 02',
+                        'summary': 'Summary 02', 'rating': 6,
+                        'company': 'Company 01'}),
+            json.dumps({'username': 'nobody', 'title': 'Title 03',
+                        'summary': 'Summary 03', 'rating': 4,
+                        'company': 'Company 01'}),
+            'not json',
+        ]) + '\n')
+
+        # Act
+        self.import_reviews(path)
+
+        # Assert
+        self.assertEquals(1, Review.objects.count())
+        rejects = self.read_rejects(path)
+        self.assertEquals([reject['row'] for reject in rejects], [2, 3, 4])
+        self.assertIn('rating', rejects[0]['errors'])
+        self.assertIn('username', rejects[1]['errors'])
+
+    def test_import_resumes_from_checkpoint(self):
+        # Arrange
+        path = self.write_file('reviews.csv', 'username,title,summary,rating,'
+                                              'company\n' + ''.join(
+            'first_user,Title %02d,Summary,4,Company 01\n' % index
+            for index in range(5)
+        ))
+        with open(path + '.checkpoint', 'w') as checkpoint:
+            json.dump({'rows': 3, 'created': 3, 'rejected': 0}, checkpoint)
+
+        # Act
+        self.import_reviews(path, '--batch-size', '1')
+
+        # Assert
+        self.assertEquals(
+            ['Title 03', 'Title 04'],
+            list(Review.objects.order_by('id').values_list('title', flat=True))
+        )
+        with open(path + '.checkpoint') as checkpoint:
+            self.assertEquals(
+                json.load(checkpoint),
+                {'rows': 5, 'created': 5, 'rejected': 0,
+                 'last_id': Review.objects.latest('id').id}
+            )
+
+    def test_interrupted_batch_is_not_stored_twice(self):
+        # Arrange
+        path = self.write_file('reviews.csv', 'username,title,summary,rating,'
+                                              'company\n' + ''.join(
+            'first_user,Title %02d,Summary,4,Company 01\n' % index
+            for index in range(4)
+        ))
+        checkpointed = [
+            Review.objects.create(
+                user=self.first_user, rating=4, title='Title %02d' % index,
+                summary='Summary', company=get_company('Company 01')
+            ) for index in range(3)
+        ][0]
+        # Rows 2 and 3 were committed, but not checkpointed.
+        with open(path + '.checkpoint', 'w') as checkpoint:
+            json.dump({'rows': 1, 'created': 1, 'rejected': 0,
+                       'last_id': checkpointed.id}, checkpoint)
+
+        # Act
+        self.import_reviews(path, '--batch-size', '2')
+
+        # Assert
+        self.assertEquals(
+            ['Title 00', 'Title 01', 'Title 02', 'Title 03'],
+            list(Review.objects.order_by('id').values_list('title', flat=True))
+        )
+        with open(path + '.checkpoint') as checkpoint:
+            self.assertEquals(json.load(checkpoint)['created'], 4)
@@ -0,0 +1,176 @@
+import itertools
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation import ingest
+from evaluation.models import CompanyRatingSummary, IngestTicket, Review
+
+
+class ReviewIngestServicesTestCase(TestCase):
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(REVIEWS_INGEST={
+            'ENABLED': True,
+            'SPOOL_DIR': self.spool_dir,
+            'FSYNC': False,
+            'BATCH_SIZE': 2,
+        })
+        self.settings_override.enable()
+
+        self.first_user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.second_user = User.objects.create_user(
+            username='second_user', password='Amvnfr213!'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.first_user)
+        self.titles = itertools.count()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.spool_dir)
+
+    def post_review(self, rating=5):
+        return self.client.post(reverse('evaluation:reviews-list'), {
+            'title': 'Title New %02d' % next(self.titles),
+            'summary': 'Summary New',
+            'rating': rating,
+            'company': 'New Company'
+        }, HTTP_X_FORWARDED_FOR='8.8.8.8')
+
+    def get_ticket(self, ticket):
+        return self.client.get(
+            reverse('evaluation:reviews-ticket', args=[ticket])
+        )
+
+    def test_create_is_accepted_without_writing(self):
+        # Act
+        response = self.post_review()
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEquals(response.data['status'], 'pending')
+        self.assertEquals(
+            response['Location'],
+            reverse('evaluation:reviews-ticket', args=[response.data['ticket']])
+        )
+        self.assertEquals(0, Review.objects.count())
+
+    def test_invalid_review_is_rejected_synchronously(self):
+        # Act
+        response = self.post_review(rating=10)
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(os.path.exists(ingest.spool_path()))
+
+    def test_worker_stores_queued_reviews(self):
+        # Arrange
+        tickets = [self.post_review().data['ticket'] for _ in range(5)]
+        self.assertEquals(self.get_ticket(tickets[0]).data['status'], 'pending')
+
+        # Act
+        call_command('process_review_queue', '--once', stdout=StringIO())
+
+        # Assert
+        self.assertEquals(5, self.first_user.reviews.count())
+        self.assertEquals(
+            {'8.8.8.8'},
+            set(self.first_user.reviews.values_list('ip_address', flat=True))
+        )
+        self.assertEquals(
+            CompanyRatingSummary.objects.get(
+                company__name='New Company'
+            ).count,
+            5
+        )
+        response = self.get_ticket(tickets[0])
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data['status'], 'created')
+        self.assertTrue(
+            self.first_user.reviews.filter(id=response.data['review']).exists()
+        )
+        self.assertEquals(
+            sorted(os.listdir(self.spool_dir)),
+            ['reviews.spool.lock', ingest.TICKETS_DIR]
+        )
+        self.assertEquals(
+            [files for _, _, files in os.walk(
+                os.path.join(self.spool_dir, ingest.TICKETS_DIR)
+            ) if files],
+            []
+        )
+
+    def test_reprocessing_after_crash_does_not_duplicate(self):
+        # Arrange
+        for _ in range(3):
+            self.post_review()
+        processing_file = ingest.claim_spool()[0]
+        records = list(ingest.read_records(processing_file))
+        ingest.store_records(records[:2])
+
+        # Act
+        created, rejected = ingest.drain()
+
+        # Assert
+        self.assertEquals((created, rejected), (1, 0))
+        self.assertEquals(3, Review.objects.count())
+
+    def test_inactive_user_ticket_is_rejected(self):
+        # Arrange
+        ticket = self.post_review().data['ticket']
+        self.first_user.is_active = False
+        self.first_user.save()
+
+        # Act
+        ingest.drain()
+
+        # Assert
+        ticket = IngestTicket.objects.get(ticket=ticket)
+        self.assertEquals(ticket.status, IngestTicket.REJECTED)
+        self.assertEquals(0, Review.objects.count())
+
+    def test_unknown_ticket(self):
+        # Arrange
+        ticket = self.post_review().data['ticket']
+        self.client.force_authenticate(self.second_user)
+
+        # Act
+        unknown = self.get_ticket('0' * 32)
+        other_user = self.get_ticket(ticket)
+
+        # Assert
+        self.assertEquals(unknown.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEquals(other_user.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_pending_ticket_is_found_without_reading_the_spool(self):
+        # Arrange
+        ticket = self.post_review().data['ticket']
+        os.remove(ingest.spool_path())
+
+        # Act
+        response = self.get_ticket(ticket)
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data['status'], 'pending')
+
+    def test_ticket_of_another_user_is_not_visible(self):
+        # Arrange
+        ticket = self.post_review().data['ticket']
+        ingest.drain()
+        self.client.force_authenticate(self.second_user)
+
+        # Act
+        response = self.get_ticket(ticket)
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,4 +1,5 @@
 from django.test import TestCase
+from evaluation.companies import get_company
 from evaluation.models import Review, User
 
 
@@ -13,7 +14,7 @@ class ReviewModelTestCase(TestCase):
             rating=4,
             title='Test Review 01',
             summary='Test Review 01 Summary',
-            company='Company 01',
+            company=get_company('Company 01'),
             ip_address='127.0.0.1'
         )
         self.review2 = Review.objects.create(
@@ -21,7 +22,7 @@ class ReviewModelTestCase(TestCase):
             rating=2,
             title='Test Review 02',
             summary='Test Review 02 Summary',
-            company='Company 02',
+            company=get_company('Company 02'),
             ip_address='127.0.0.1'
         )
 
@@ -0,0 +1,138 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.companies import get_company
+from evaluation.models import Review
+
+
+class ReviewPaginationTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        other_user = User.objects.create_user(
+            username='second_user', password='Amvnfr213!'
+        )
+
+        for index in range(7):
+            Review.objects.create(
+                user=self.user,
+                rating=4,
+                title='Test Review %02d' % index,
+                summary='Test Review Summary',
+                company=get_company('Company 01'),
+                ip_address='127.0.0.1'
+            )
+        Review.objects.create(
+            user=other_user,
+            rating=2,
+            title='Other Review',
+            summary='Other Review Summary',
+            company=get_company('Company 02'),
+            ip_address='127.0.0.1'
+        )
+
+        # Two reviews sharing the same date must still be ordered by id.
+        same_date = timezone.now() - timedelta(days=1)
+        first_ids = list(
+            Review.objects.filter(user=self.user).order_by('id')
+            .values_list('id', flat=True)[:2]
+        )
+        Review.objects.filter(id__in=first_ids).update(date=same_date)
+
+        self.expected_ids = list(
+            Review.objects.filter(user=self.user)
+            .order_by('-date', '-id')
+            .values_list('id', flat=True)
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def collect_pages(self, url):
+        ids = []
+        responses = []
+        while url:
+            response = self.client.get(url)
+            self.assertEquals(response.status_code, status.HTTP_200_OK)
+            responses.append(response)
+            ids.extend(review['id'] for review in response.data['results'])
+            url = response.data['next']
+        return ids, responses
+
+    def test_first_page(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-list'), {'page_size': 3}
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(
+            [review['id'] for review in response.data['results']],
+            self.expected_ids[:3]
+        )
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_walk_forward_through_all_pages(self):
+        # Act
+        ids, responses = self.collect_pages(
+            reverse('evaluation:reviews-list') + '?page_size=3'
+        )
+
+        # Assert
+        self.assertEquals(ids, self.expected_ids)
+        self.assertEquals(len(responses), 3)
+        self.assertIsNone(responses[-1].data['next'])
+
+    def test_walk_backwards_from_last_page(self):
+        # Arrange
+        _, responses = self.collect_pages(
+            reverse('evaluation:reviews-list') + '?page_size=3'
+        )
+
+        # Act
+        response = self.client.get(responses[-1].data['previous'])
+
+        # Assert
+        self.assertEquals(
+            [review['id'] for review in response.data['results']],
+            self.expected_ids[3:6]
+        )
+        self.assertIsNotNone(response.data['previous'])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_page_size_is_capped(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-list'), {'page_size': 100000}
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(len(response.data['results']), 7)
+
+    def test_invalid_cursor(self):
+        # Act
+        response = self.client.get(
+            reverse('evaluation:reviews-list'), {'cursor': 'not-a-cursor'}
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_query_uses_single_seek(self):
+        # Arrange
+        first_page = self.client.get(
+            reverse('evaluation:reviews-list'), {'page_size': 3}
+        )
+
+        # Act / Assert
+        # One query for the ETag version stamp and one for the page.
+        with self.assertNumQueries(2):
+            self.client.get(first_page.data['next'])
@@ -0,0 +1,174 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.companies import get_company
+from evaluation.models import Review
+from evaluation.search import FTS_TABLE
+
+
+class ReviewSearchServicesTestCase(TestCase):
+    def setUp(self):
+        self.first_user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.second_user = User.objects.create_user(
+            username='second_user', password='Amvnfr213!'
+        )
+
+        self.review1 = Review.objects.create(
+            user=self.first_user,
+            rating=4,
+            title='Great coffee',
+            summary='The espresso was rich and the staff friendly.',
+            company=get_company('Bean Bar'),
+            ip_address='127.0.0.1'
+        )
+        self.review2 = Review.objects.create(
+            user=self.first_user,
+            rating=2,
+            title='Slow delivery',
+            summary='My coffee order arrived cold after two hours.',
+            company=get_company('Quick Ship'),
+            ip_address='127.0.0.1'
+        )
+        self.review3 = Review.objects.create(
+            user=self.second_user,
+            rating=5,
+            title='Great coffee again',
+            summary='Coffee coffee coffee.',
+            company=get_company('Bean Bar'),
+            ip_address='127.0.0.1'
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.first_user)
+
+    def search(self, query, **params):
+        params['q'] = query
+        return self.client.get(reverse('evaluation:reviews-list'), params)
+
+    def result_ids(self, response):
+        return [review['id'] for review in response.data['results']]
+
+    def test_search_ranks_title_matches_first(self):
+        # Act
+        response = self.search('coffee')
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(
+            self.result_ids(response), [self.review1.id, self.review2.id]
+        )
+
+    def test_search_requires_every_word(self):
+        # Act
+        response = self.search('coffee cold')
+
+        # Assert
+        self.assertEquals(self.result_ids(response), [self.review2.id])
+
+    def test_search_by_company(self):
+        # Act
+        response = self.search('bean')
+
+        # Assert
+        self.assertEquals(self.result_ids(response), [self.review1.id])
+
+    def test_search_ignores_fts_syntax(self):
+        # Act
+        response = self.search('"coffee* ^(')
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(
+            self.result_ids(response), [self.review1.id, self.review2.id]
+        )
+
+    def test_search_without_words(self):
+        # Act
+        response = self.search('!!!')
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data['results'], [])
+
+    def test_search_is_paginated(self):
+        # Act
+        first_page = self.search('coffee', page_size=1)
+        second_page = self.client.get(first_page.data['next'])
+
+        # Assert
+        self.assertEquals(self.result_ids(first_page), [self.review1.id])
+        self.assertEquals(self.result_ids(second_page), [self.review2.id])
+        self.assertIsNone(second_page.data['next'])
+
+    def test_search_index_follows_deletes(self):
+        # Arrange
+        self.review1.delete()
+
+        # Act
+        response = self.search('coffee')
+
+        # Assert
+        self.assertEquals(self.result_ids(response), [self.review2.id])
+
+    def test_rebuild_search_index(self):
+        # Arrange
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM %s' % FTS_TABLE)
+
+        # Act
+        call_command(
+            'rebuild_review_search_index', '--batch-size', '2',
+            stdout=StringIO()
+        )
+
+        # Assert
+        response = self.search('coffee')
+        self.assertEquals(
+            self.result_ids(response), [self.review1.id, self.review2.id]
+        )
+
+    def test_check_and_repair_search_index(self):
+        # Arrange
+        Review.objects.filter(pk=self.review2.pk).update(title='Lost parcel')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM %s WHERE rowid = %%s' % FTS_TABLE,
+                [self.review3.pk]
+            )
+            cursor.execute(
+                "INSERT INTO %s (rowid, title, summary, company) "
+                "VALUES (1000, 'Orphan coffee', '', '')" % FTS_TABLE
+            )
+
+        # Act
+        with self.assertRaisesMessage(
+            CommandError, '2 search index entries are stale and 1 orphaned.'
+        ):
+            call_command(
+                'rebuild_review_search_index', '--check', '--batch-size', '2',
+                stdout=StringIO()
+            )
+        call_command(
+            'rebuild_review_search_index', '--repair', '--batch-size', '2',
+            stdout=StringIO()
+        )
+
+        # Assert
+        call_command(
+            'rebuild_review_search_index', '--check', stdout=StringIO()
+        )
+        self.assertEquals(
+            self.result_ids(self.search('parcel')), [self.review2.id]
+        )
+        self.assertEquals(
+            self.result_ids(self.search('coffee')),
+            [self.review1.id, self.review2.id]
+        )
@@ -1,4 +1,5 @@
 from django.test import TestCase
+from evaluation.companies import get_company
 from evaluation.serializers import ReviewSerializer
 from evaluation.models import Review, User
 
@@ -15,7 +16,7 @@ class ReviewSerializerTestCase(TestCase):
             rating=4,
             title='Test Review 01',
             summary='Test Review 01 Summary',
-            company='Company 01',
+            company=get_company('Company 01'),
             ip_address='127.0.0.1'
         )
 
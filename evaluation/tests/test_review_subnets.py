@@ -0,0 +1,127 @@
+import datetime
+import io
+import ipaddress
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from evaluation import subnets
+from evaluation.companies import get_company
+from evaluation.models import Review
+from evaluation.services import bulk_create_reviews
+
+
+class ReviewSubnetsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        addresses = (
+            '203.0.113.7', '203.0.113.200', '203.0.113.9', '198.51.100.1',
+            '2001:db8:0:1::1', '2001:db8:0:1::2', '2001:db8:0:2::1', None,
+        )
+        bulk_create_reviews([
+            Review(
+                user=self.user,
+                rating=4,
+                title='Test Review %02d' % index,
+                summary='Test summary %02d' % index,
+                company=get_company('Company 01'),
+                ip_address=address
+            ) for index, address in enumerate(addresses)
+        ])
+        self.since = timezone.now() - datetime.timedelta(days=1)
+
+    def test_packed_ip(self):
+        # Act
+        review = Review.objects.get(title='Test Review 00')
+
+        # Assert
+        self.assertEquals(
+            bytes(review.packed_ip),
+            ipaddress.IPv6Address('::ffff:203.0.113.7').packed
+        )
+        self.assertIsNone(Review.objects.get(title='Test Review 07').packed_ip)
+
+    def test_packed_ip_follows_ip_address(self):
+        # Arrange
+        review = Review.objects.get(title='Test Review 00')
+        review.ip_address = '2001:db8::5'
+
+        # Act
+        review.save()
+
+        # Assert
+        self.assertEquals(
+            bytes(Review.objects.get(pk=review.pk).packed_ip),
+            ipaddress.IPv6Address('2001:db8::5').packed
+        )
+
+    def test_reviews_in_network(self):
+        # Act
+        ipv4 = subnets.reviews_in_network(
+            subnets.parse_network('203.0.113.0/24'), self.since
+        )
+        ipv6 = subnets.reviews_in_network(
+            subnets.parse_network('2001:db8:0:1::/64'), self.since
+        )
+        old = subnets.reviews_in_network(
+            subnets.parse_network('203.0.113.0/24'),
+            timezone.now() + datetime.timedelta(minutes=1)
+        )
+
+        # Assert
+        self.assertEquals(
+            sorted(ipv4.values_list('ip_address', flat=True)),
+            ['203.0.113.200', '203.0.113.7', '203.0.113.9']
+        )
+        self.assertEquals(ipv6.count(), 2)
+        self.assertFalse(old.exists())
+
+    def test_subnet_query_scans_index_range(self):
+        # Arrange
+        reviews = subnets.reviews_in_network(
+            subnets.parse_network('203.0.113.0/24'), self.since
+        ).values('id')
+        sql, params = reviews.query.sql_with_params()
+
+        # Act
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+
+        # Assert
+        self.assertIn('review_packed_ip_date_idx', plan)
+
+    def test_top_subnets(self):
+        # Act
+        top = subnets.top_subnets(self.since, 3)
+
+        # Assert
+        self.assertEquals(top, [
+            (ipaddress.ip_network('203.0.113.0/24'), 3),
+            (ipaddress.ip_network('2001:db8:0:1::/64'), 2),
+            (ipaddress.ip_network('198.51.100.0/24'), 1),
+        ])
+
+    def test_command(self):
+        # Arrange
+        output = io.StringIO()
+
+        # Act
+        call_command('subnet_reviews', '2001:db8:0:1::/64', stdout=output)
+        call_command('subnet_reviews', '--top', '1', stdout=output)
+
+        # Assert
+        lines = output.getvalue().splitlines()
+        self.assertTrue(
+            lines[2].startswith('2 reviews from 2001:db8:0:1::/64')
+        )
+        self.assertEquals(lines[3].split(), ['3', '203.0.113.0/24'])
+
+    def test_command_invalid_network(self):
+        # Act / Assert
+        with self.assertRaises(CommandError):
+            call_command('subnet_reviews', '203.0.113.0/33')
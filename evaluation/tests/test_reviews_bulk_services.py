@@ -0,0 +1,127 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.models import Review
+
+
+class ReviewsBulkServicesTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.client = APIClient()
+
+    def review_payload(self, index, rating=4):
+        return {
+            'title': 'Bulk Review %02d' % index,
+            'summary': 'Bulk Review Summary',
+            'rating': rating,
+            'company': 'Company 01'
+        }
+
+    def test_bulk_unauthenticated(self):
+        # Act
+        response = self.client.post(
+            reverse('evaluation:reviews-bulk'), [self.review_payload(0)]
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_create_success(self):
+        # Arrange
+        self.client.force_authenticate(self.user)
+        payload = [self.review_payload(index) for index in range(5)]
+
+        # Act
+        response = self.client.post(
+            reverse('evaluation:reviews-bulk'),
+            payload,
+            HTTP_X_FORWARDED_FOR='8.8.8.8'
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(response.data, {'created': 5, 'errors': []})
+        self.assertEquals(5, self.user.reviews.count())
+        self.assertEquals(
+            {'8.8.8.8'},
+            set(self.user.reviews.values_list('ip_address', flat=True))
+        )
+
+    def test_bulk_create_partial_errors(self):
+        # Arrange
+        self.client.force_authenticate(self.user)
+        payload = [
+            self.review_payload(0),
+            self.review_payload(1, rating=10),
+            self.review_payload(2),
+            'not a review'
+        ]
+
+        # Act
+        response = self.client.post(reverse('evaluation:reviews-bulk'), payload)
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(response.data['created'], 2)
+        self.assertEquals(
+            [error['index'] for error in response.data['errors']], [1, 3]
+        )
+        self.assertIn('rating', response.data['errors'][0]['errors'])
+        self.assertEquals(2, self.user.reviews.count())
+
+    def test_bulk_create_all_invalid(self):
+        # Arrange
+        self.client.force_authenticate(self.user)
+
+        # Act
+        response = self.client.post(
+            reverse('evaluation:reviews-bulk'),
+            [self.review_payload(0, rating=0)]
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEquals(0, Review.objects.count())
+
+    def test_bulk_create_expects_list(self):
+        # Arrange
+        self.client.force_authenticate(self.user)
+
+        # Act
+        response = self.client.post(
+            reverse('evaluation:reviews-bulk'), self.review_payload(0)
+        )
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEquals(0, Review.objects.count())
+
+    @override_settings(REVIEWS_BULK_MAX_ITEMS=2)
+    def test_bulk_create_too_many_items(self):
+        # Arrange
+        self.client.force_authenticate(self.user)
+        payload = [self.review_payload(index) for index in range(3)]
+
+        # Act
+        response = self.client.post(reverse('evaluation:reviews-bulk'), payload)
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEquals(0, Review.objects.count())
+
+    @override_settings(REVIEWS_BULK_BATCH_SIZE=2)
+    def test_bulk_create_inserts_in_chunks(self):
+        # Arrange
+        self.client.force_authenticate(self.user)
+        payload = [self.review_payload(index) for index in range(5)]
+
+        # Act
+        response = self.client.post(reverse('evaluation:reviews-bulk'), payload)
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(5, self.user.reviews.count())
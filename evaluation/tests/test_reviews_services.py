@@ -4,7 +4,8 @@ from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from evaluation.models import Review
+from evaluation.companies import get_company
+from evaluation.models import Company, Review
 from evaluation.serializers import ReviewSerializer
 
 
@@ -27,7 +28,7 @@ class ReviewsServicesTestCase(TestCase):
             rating=4,
             title='Test Review 01',
             summary='Test Review 01 Summary',
-            company='Company 01',
+            company=get_company('Company 01'),
             ip_address='127.0.0.1'
         )
         self.review2 = Review.objects.create(
@@ -35,7 +36,7 @@ class ReviewsServicesTestCase(TestCase):
             rating=2,
             title='Test Review 02',
             summary='Test Review 02 Summary',
-            company='Company 02',
+            company=get_company('Company 02'),
             ip_address='127.0.0.1'
         )
 
@@ -95,7 +96,7 @@ class ReviewsServicesTestCase(TestCase):
         response = self.client.get(reverse('evaluation:reviews-list'))
 
         # Assert
-        self.assertEquals(response.data, serializer.data)
+        self.assertEquals(response.data['results'], serializer.data)
 
     def test_list_second_user_reviews(self):
         # Arrange
@@ -109,7 +110,7 @@ class ReviewsServicesTestCase(TestCase):
         response = self.client.get(reverse('evaluation:reviews-list'))
 
         # Assert
-        self.assertEquals(response.data, serializer.data)
+        self.assertEquals(response.data['results'], serializer.data)
 
     def test_list_third_user_reviews(self):
         # Arrange
@@ -120,7 +121,7 @@ class ReviewsServicesTestCase(TestCase):
         response = self.client.get(reverse('evaluation:reviews-list'))
 
         # Assert
-        self.assertEquals(response.data, expected_response)
+        self.assertEquals(response.data['results'], expected_response)
 
     def test_retrive_review_first_user_success(self):
         # Arrange
@@ -185,7 +186,7 @@ class ReviewsServicesTestCase(TestCase):
         new_review.title = 'Title New'
         new_review.summary = 'Summary New'
         new_review.rating = 5
-        new_review.company = 'New Company'
+        new_review.company = Company(name='New Company')
 
         serializer = ReviewSerializer(new_review)
 
@@ -211,7 +212,7 @@ class ReviewsServicesTestCase(TestCase):
         new_review.title = 'Title New'
         new_review.summary = 'Summary New'
         new_review.rating = 5
-        new_review.company = 'New Company'
+        new_review.company = Company(name='New Company')
 
         serializer = ReviewSerializer(new_review)
 
@@ -238,7 +239,7 @@ class ReviewsServicesTestCase(TestCase):
         new_review.title = 'Title New'
         new_review.summary = 'Summary New'
         new_review.rating = 10
-        new_review.company = 'New Company'
+        new_review.company = Company(name='New Company')
 
         serializer = ReviewSerializer(new_review)
 
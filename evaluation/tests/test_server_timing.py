@@ -0,0 +1,103 @@
+import json
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from evaluation.companies import get_company
+from evaluation import timing
+from evaluation.models import Review
+
+
+def timing_settings(**config):
+    return override_settings(REVIEWS_SERVER_TIMING=dict({
+        'ENABLED': True,
+        'SAMPLE_RATE': 1.0,
+        'HEADER': True,
+        'LOG': True,
+    }, **config))
+
+
+class ServerTimingTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        Review.objects.create(
+            user=self.user,
+            rating=4,
+            title='Test Review 01',
+            summary='Test Review Summary',
+            company=get_company('Company 01'),
+            ip_address='127.0.0.1'
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer %s' % AccessToken.for_user(self.user)
+        )
+
+    def metrics(self, response):
+        return {
+            metric.split(';')[0]: metric
+            for metric in response['Server-Timing'].split(', ')
+        }
+
+    def test_server_timing_header(self):
+        # Act
+        with timing_settings(LOG=False):
+            response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        metrics = self.metrics(response)
+        self.assertEquals(
+            set(metrics),
+            {'total', 'view', 'auth', 'db', 'serialize', 'render'}
+        )
+        self.assertIn('desc="', metrics['db'])
+
+    def test_timing_log_line(self):
+        # Act
+        with timing_settings(HEADER=False), \
+                self.assertLogs('evaluation.timing', 'INFO') as logs:
+            response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertFalse(response.has_header('Server-Timing'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEquals(record['view'], 'evaluation:reviews-list')
+        self.assertEquals(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['total_ms'], 0)
+
+    def test_requests_outside_the_sample_are_not_measured(self):
+        # Act
+        with timing_settings(SAMPLE_RATE=0.0):
+            response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_disabled(self):
+        # Act
+        response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertFalse(response.has_header('Server-Timing'))
+
+
+class TimingSpanTestCase(SimpleTestCase):
+    def test_nested_spans_of_the_same_name_count_once(self):
+        # Arrange
+        timings = timing.Timings()
+
+        # Act
+        with timing.recording(timings):
+            with timing.span('serialize'):
+                with timing.span('serialize'):
+                    pass
+                with timing.span('db'):
+                    pass
+
+        # Assert
+        self.assertEquals(set(timings.durations), {'serialize', 'db'})
+        self.assertIsNone(timing.current())
@@ -0,0 +1,83 @@
+import importlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, clear_url_caches, reverse
+from ca_arthur_trial import urls as root_urls
+from evaluation import urls
+from evaluation.management.commands.profile_startup import (
+    FIRST_REQUEST_MARKER,
+    parse_import_times
+)
+
+
+class ProfileStartupTestCase(SimpleTestCase):
+    def test_parse_import_times(self):
+        # Arrange
+        lines = [
+            'import time: self [us] | cumulative | imported package',
+            'import time:       120 |        120 |   django.utils',
+            'import time:       310 |        430 | django',
+            FIRST_REQUEST_MARKER,
+            'import time:      1066 |       3906 |     drf_yasg.openapi',
+        ]
+
+        # Act
+        modules = parse_import_times(lines)
+
+        # Assert
+        self.assertEquals(modules, {
+            'django.utils': (120, 120, 'load'),
+            'django': (310, 430, 'load'),
+            'drf_yasg.openapi': (1066, 3906, 'first_request'),
+        })
+
+    def test_profile_startup(self):
+        # Arrange
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, 'startup.json')
+
+        # Act
+        call_command(
+            'profile_startup', runs=1, output=output, stdout=io.StringIO()
+        )
+
+        # Assert
+        with open(output, encoding='utf-8') as source:
+            results = json.load(source)
+        self.assertEquals(results['status'], '401 Unauthorized')
+        self.assertGreater(results['first_request_ms'], 0)
+        self.assertEquals(
+            results['modules']['evaluation.views']['phase'], 'first_request'
+        )
+        for module in ('drf_yasg.openapi', 'drf_yasg.utils', 'drf_yasg.views'):
+            self.assertNotIn(module, results['modules'])
+
+
+class OptionalComponentsTestCase(SimpleTestCase):
+    def reload_urls(self):
+        importlib.reload(urls)
+        importlib.reload(root_urls)
+        clear_url_caches()
+
+    def test_docs_and_admin_can_be_disabled(self):
+        # Arrange
+        self.addCleanup(self.reload_urls)
+
+        # Act
+        with override_settings(
+            REVIEWS_DOCS_ENABLED=False, REVIEWS_ADMIN_ENABLED=False
+        ):
+            self.reload_urls()
+
+        # Assert
+        with self.assertRaises(NoReverseMatch):
+            reverse('evaluation:schema-swagger-ui')
+        with self.assertRaises(NoReverseMatch):
+            reverse('admin:index')
+        reverse('evaluation:reviews-list')
@@ -0,0 +1,172 @@
+import itertools
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from evaluation.throttling import parse_rate
+
+
+def throttle_settings(scope, user=None, ip=None, num_proxies=0):
+    buckets = {}
+    if user is not None:
+        buckets['user'] = user
+    if ip is not None:
+        buckets['ip'] = ip
+    return override_settings(REVIEWS_THROTTLES={
+        'ENABLED': True,
+        'CACHE_ALIAS': 'default',
+        'NUM_PROXIES': num_proxies,
+        'SCOPES': {scope: buckets},
+    })
+
+
+class ThrottlingTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.first_user = User.objects.create_user(
+            username='first_user', password='Amvnfr213!'
+        )
+        self.second_user = User.objects.create_user(
+            username='second_user', password='Amvnfr213!'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.first_user)
+        self.titles = itertools.count()
+
+    def post_review(self, ip='8.8.8.8'):
+        return self.client.post(reverse('evaluation:reviews-list'), {
+            'title': 'Title New %02d' % next(self.titles),
+            'summary': 'Summary New',
+            'rating': 5,
+            'company': 'New Company'
+        }, REMOTE_ADDR=ip)
+
+    def test_user_bucket_allows_a_burst(self):
+        # Arrange
+        with throttle_settings(
+            'reviews_create', user={'RATE': '1/min', 'BURST': 2}
+        ):
+            # Act
+            responses = [self.post_review() for _ in range(3)]
+
+        # Assert
+        self.assertEquals(
+            [response.status_code for response in responses],
+            [status.HTTP_201_CREATED, status.HTTP_201_CREATED,
+             status.HTTP_429_TOO_MANY_REQUESTS]
+        )
+        self.assertEquals(responses[2]['Retry-After'], '60')
+
+    def test_bucket_refills(self):
+        # Arrange
+        with throttle_settings(
+            'reviews_create', user={'RATE': '1/s', 'BURST': 1}
+        ), mock.patch('evaluation.throttling.time.time') as now:
+            now.return_value = 1000.0
+            self.post_review()
+
+            # Act
+            now.return_value = 1001.0
+            response = self.post_review()
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+
+    def test_ip_bucket_is_shared_by_users(self):
+        # Arrange
+        with throttle_settings(
+            'reviews_list', ip={'RATE': '1/min', 'BURST': 1}
+        ):
+            self.client.get(
+                reverse('evaluation:reviews-list'),
+                REMOTE_ADDR='8.8.8.8'
+            )
+            self.client.force_authenticate(self.second_user)
+
+            # Act
+            same_ip = self.client.get(
+                reverse('evaluation:reviews-list'), REMOTE_ADDR='8.8.8.8'
+            )
+            other_ip = self.client.get(
+                reverse('evaluation:reviews-list'), REMOTE_ADDR='8.8.4.4'
+            )
+
+        # Assert
+        self.assertEquals(
+            same_ip.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEquals(other_ip.status_code, status.HTTP_200_OK)
+
+    def test_spoofed_forwarded_for_is_ignored(self):
+        # Arrange
+        self.client.force_authenticate(None)
+        with throttle_settings('token', ip={'RATE': '1/min', 'BURST': 2}):
+            # Act
+            responses = [
+                self.client.post(
+                    reverse('evaluation:token_obtain_pair'),
+                    {'username': 'user_%d' % index, 'password': 'wrong'},
+                    REMOTE_ADDR='10.0.0.1',
+                    HTTP_X_FORWARDED_FOR='203.0.113.%d' % index
+                ) for index in range(3)
+            ]
+
+        # Assert
+        self.assertEquals(
+            [response.status_code for response in responses],
+            [status.HTTP_401_UNAUTHORIZED, status.HTTP_401_UNAUTHORIZED,
+             status.HTTP_429_TOO_MANY_REQUESTS]
+        )
+
+    def test_forwarded_for_behind_trusted_proxies(self):
+        # Arrange
+        with throttle_settings(
+            'reviews_list', ip={'RATE': '1/min', 'BURST': 1}, num_proxies=1
+        ):
+            self.client.get(
+                reverse('evaluation:reviews-list'), REMOTE_ADDR='10.0.0.1',
+                HTTP_X_FORWARDED_FOR='203.0.113.1, 8.8.8.8'
+            )
+
+            # Act
+            same_client = self.client.get(
+                reverse('evaluation:reviews-list'), REMOTE_ADDR='10.0.0.1',
+                HTTP_X_FORWARDED_FOR='203.0.113.2, 8.8.8.8'
+            )
+            other_client = self.client.get(
+                reverse('evaluation:reviews-list'), REMOTE_ADDR='10.0.0.1',
+                HTTP_X_FORWARDED_FOR='8.8.4.4'
+            )
+
+        # Assert
+        self.assertEquals(
+            same_client.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEquals(other_client.status_code, status.HTTP_200_OK)
+
+    def test_login_is_throttled_per_username(self):
+        # Arrange
+        self.client.force_authenticate(None)
+        with throttle_settings('token', user={'RATE': '1/min', 'BURST': 1}):
+            self.client.post(reverse('evaluation:token_obtain_pair'), {
+                'username': 'first_user', 'password': 'wrong'
+            }, REMOTE_ADDR='10.0.0.1')
+
+            # Act
+            response = self.client.post(
+                reverse('evaluation:token_obtain_pair'),
+                {'username': 'first_user', 'password': 'Amvnfr213!'},
+                REMOTE_ADDR='10.0.0.2'
+            )
+
+        # Assert
+        self.assertEquals(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    def test_parse_rate(self):
+        self.assertEquals(parse_rate('120/min'), 2)
+        self.assertEquals(parse_rate('10/s'), 10)
@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from evaluation.authentication import user_cache
+
+
+class CachedJWTAuthenticationTestCase(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            username='test_user', password='Amvnfr213!'
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer %s' % AccessToken.for_user(self.user)
+        )
+
+    def tearDown(self):
+        user_cache.clear()
+
+    def count_user_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('evaluation:reviews-list'))
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        return len([
+            query for query in context.captured_queries
+            if 'auth_user' in query['sql']
+        ])
+
+    def test_user_lookup_is_cached(self):
+        # Act / Assert
+        self.assertEquals(self.count_user_queries(), 1)
+        self.assertEquals(self.count_user_queries(), 0)
+
+    @override_settings(REVIEWS_AUTH_USER_CACHE={
+        'ENABLED': False, 'MAX_SIZE': 10, 'TTL': 60
+    })
+    def test_user_cache_disabled(self):
+        # Act / Assert
+        self.assertEquals(self.count_user_queries(), 1)
+        self.assertEquals(self.count_user_queries(), 1)
+
+    @override_settings(REVIEWS_AUTH_USER_CACHE={
+        'ENABLED': True, 'MAX_SIZE': 10, 'TTL': 0
+    })
+    def test_user_cache_expires(self):
+        # Act / Assert
+        self.assertEquals(self.count_user_queries(), 1)
+        self.assertEquals(self.count_user_queries(), 1)
+
+    def test_deactivated_user_is_rejected(self):
+        # Arrange
+        self.client.get(reverse('evaluation:reviews-list'))
+        self.user.is_active = False
+        self.user.save()
+
+        # Act
+        response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        # Arrange
+        self.client.get(reverse('evaluation:reviews-list'))
+        self.user.delete()
+
+        # Act
+        response = self.client.get(reverse('evaluation:reviews-list'))
+
+        # Assert
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cache_is_bounded(self):
+        # Arrange
+        other_user = User.objects.create_user(
+            username='other_user', password='Amvnfr213!'
+        )
+
+        # Act
+        with self.settings(REVIEWS_AUTH_USER_CACHE={
+            'ENABLED': True, 'MAX_SIZE': 1, 'TTL': 60
+        }):
+            user_cache.set(self.user.id, self.user)
+            user_cache.set(other_user.id, other_user)
+
+            # Assert
+            self.assertIsNone(user_cache.get(self.user.id))
+            self.assertEquals(user_cache.get(other_user.id), other_user)
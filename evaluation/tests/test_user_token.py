@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.test import Client
 from django.contrib.auth.models import User
@@ -9,6 +10,8 @@ class TokenVerificationTestCase(TestCase):
     def setUp(self):
         User.objects.create_user(username='test_user', password='Amvnfr213!')
         self.client = Client()
+        # Start every test with full login throttle buckets.
+        cache.clear()
 
     def test_login_no_data(self):
         expected_response = {
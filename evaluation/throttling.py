@@ -0,0 +1,127 @@
+"""
+Token-bucket throttles keyed on the user and on the client IP.
+
+A view opts in with `throttle_scope`; `REVIEWS_THROTTLES['SCOPES']` gives
+each scope a bucket per user and per IP, holding up to BURST requests and
+refilled at RATE. A bucket is a `(tokens, updated)` pair in the
+`REVIEWS_THROTTLES['CACHE_ALIAS']` cache: a process-local cache throttles
+each worker process on its own, a shared one (e.g. memcached) all of them
+together. Reading and writing it is not atomic, so concurrent requests can
+occasionally get past a nearly empty bucket.
+
+The IP bucket is keyed on `REMOTE_ADDR`. `X-Forwarded-For` is set by the
+client, so it is only read behind `REVIEWS_THROTTLES['NUM_PROXIES']`
+trusted proxies, like DRF's `NUM_PROXIES`.
+"""
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+from evaluation import metrics
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """Turn a rate like `10/min` into requests per second."""
+    requests, period = rate.split('/')
+    return int(requests) / DURATIONS[period[0]]
+
+
+def client_ip(request, num_proxies):
+    """
+    The address of the client: `REMOTE_ADDR`, or behind `num_proxies`
+    trusted proxies the `X-Forwarded-For` entry the outermost one added.
+    Entries left of it come from the client and are ignored.
+    """
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if num_proxies and x_forwarded_for:
+        addresses = x_forwarded_for.split(',')
+        return addresses[-min(num_proxies, len(addresses))].strip()
+    return request.META.get('REMOTE_ADDR')
+
+
+class TokenBucketThrottle(BaseThrottle):
+    kind = None
+
+    def get_key(self, request, view):
+        """Identify the client, or return None not to throttle it."""
+        raise NotImplementedError
+
+    def get_bucket(self, view):
+        config = settings.REVIEWS_THROTTLES
+        if not config['ENABLED']:
+            return None
+        scope = getattr(view, 'throttle_scope', None)
+        return config['SCOPES'].get(scope, {}).get(self.kind)
+
+    def allow_request(self, request, view):
+        bucket = self.get_bucket(view)
+        if bucket is None:
+            return True
+        key = self.get_key(request, view)
+        if key is None:
+            return True
+
+        rate = parse_rate(bucket['RATE'])
+        burst = bucket['BURST']
+        cache_key = 'throttle:%s:%s:%s' % (
+            view.throttle_scope, self.kind,
+            hashlib.md5(str(key).encode('utf-8')).hexdigest()
+        )
+        cache = caches[settings.REVIEWS_THROTTLES['CACHE_ALIAS']]
+
+        now = time.time()
+        tokens, updated = cache.get(cache_key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / rate
+            metrics.throttled_total.labels(
+                view.throttle_scope, self.kind
+            ).inc()
+            return False
+
+        # The entry is worth nothing once the bucket would be full again.
+        cache.set(
+            cache_key, (tokens - 1, now), (burst - tokens + 1) / rate + 1
+        )
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Bucket per authenticated user."""
+    kind = 'user'
+
+    def get_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
+
+
+class UsernameTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Bucket per username sent to the token endpoints, so guessing the
+    password of one account is throttled from any number of addresses.
+    """
+    kind = 'user'
+
+    def get_key(self, request, view):
+        try:
+            username = request.data.get('username')
+        except AttributeError:
+            return None
+        return username or None
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Bucket per client IP address."""
+    kind = 'ip'
+
+    def get_key(self, request, view):
+        return client_ip(
+            request, settings.REVIEWS_THROTTLES['NUM_PROXIES']
+        )
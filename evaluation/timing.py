@@ -0,0 +1,74 @@
+"""
+Per-request timing breakdown, reported by `ServerTimingMiddleware`.
+
+The middleware installs a `Timings` recorder for sampled requests. Code
+on the request path reports the time it spends with `span(name)`, which
+costs a context variable lookup when no recorder is installed. A span
+nested in a span of the same name, like a `UserSerializer` inside a
+`ReviewSerializer`, is only counted once. Spans of different names may
+overlap; queries run while serializing count towards both `db` and
+`serialize`.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('evaluation_timings', default=None)
+
+
+class Timings:
+    def __init__(self):
+        self.durations = {}
+        self.queries = 0
+        self.active = set()
+        self.view_started = None
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def record_query(self, seconds):
+        self.queries += 1
+        self.add('db', seconds)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def recording(timings):
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name):
+    timings = _current.get()
+    if timings is None or name in timings.active:
+        yield
+        return
+
+    timings.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+        timings.active.discard(name)
+
+
+class QueryTimer:
+    """`connection.execute_wrapper` callable counting and timing queries."""
+
+    def __init__(self, timings):
+        self.timings = timings
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.timings.record_query(time.perf_counter() - started)
@@ -1,37 +1,37 @@
+from django.conf import settings
 from django.urls import path
-from rest_framework_simplejwt.views import (
+from evaluation.views import (
+    CompanyRatingView,
+    ReviewViewSet,
+    docs_view,
+    schema_document_view,
     TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView
 )
-from evaluation.views import (
-    ReviewViewSet,
-)
 from rest_framework import routers
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
 app_name = 'evaluation'
 
 router = routers.SimpleRouter()
 router.register(r'reviews', ReviewViewSet, 'reviews')
 
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Review API",
-      default_version='v1',
-      description="API to manage reviews on this trial app."
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-)
-
 urlpatterns = [
     path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('refresh-token/', TokenRefreshView.as_view(), name='token_refresh'),
     path('verify-token/', TokenVerifyView.as_view(), name='token_verify'),
-    path('docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+    # Company names may contain slashes, e.g. "AT/T Mobility".
+    path(
+        'companies/<path:name>/rating/',
+        CompanyRatingView.as_view(),
+        name='company-rating'
+    ),
 ]
 
+if settings.REVIEWS_DOCS_ENABLED:
+    urlpatterns += [
+        path('docs/openapi.json', schema_document_view, name='schema-json'),
+        path('docs/', docs_view, name='schema-swagger-ui'),
+    ]
+
 urlpatterns += router.urls
@@ -1,9 +1,53 @@
-from rest_framework import viewsets, mixins, status
+import datetime
+import heapq
+import operator
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers
+)
+from django.utils.http import http_date, quote_etag
+from rest_framework import generics, viewsets, mixins, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from evaluation.models import Review
-from evaluation.serializers import ReviewSerializer, ReviewWriteSerializer
-from drf_yasg.utils import swagger_auto_schema
+from evaluation import (
+    caching, companies, fields, ingest, metrics, services
+)
+from evaluation.filters import ReviewSearchFilter
+from evaluation.models import CompanyRatingSummary, IngestTicket, Review
+from evaluation.renderers import CSVRenderer, NDJSONRenderer
+from evaluation.throttling import (
+    IPTokenBucketThrottle,
+    UsernameTokenBucketThrottle,
+    UserTokenBucketThrottle
+)
+from evaluation.serializers import (
+    CompanyRatingSerializer,
+    IngestTicketSerializer,
+    ReviewSerializer,
+    ReviewWriteSerializer,
+    ReviewBulkResultSerializer
+)
+from rest_framework_simplejwt import views as jwt_views
+from evaluation.schema_annotations import QueryParameter, swagger_auto_schema
+
+FIELDSET_PARAMETERS = [
+    QueryParameter(
+        'fields',
+        'Comma-separated fields to return, e.g. `title,rating`.'
+    ),
+    QueryParameter(
+        'exclude',
+        'Comma-separated fields to leave out, e.g. `summary`.'
+    ),
+]
 
 
 class ReviewViewSet(mixins.CreateModelMixin,
@@ -11,36 +55,226 @@ class ReviewViewSet(mixins.CreateModelMixin,
                     mixins.ListModelMixin,
                     viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated]
+    filter_backends = [ReviewSearchFilter]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scopes = {
+        'create': 'reviews_create',
+        'bulk': 'reviews_create',
+        'list': 'reviews_list',
+        'export': 'reviews_list',
+    }
+    export_fields = (
+        'id', 'title', 'summary', 'rating', 'company', 'ip_address', 'date'
+    )
+    export_columns = (
+        'id', 'title', 'summary', 'rating', 'company__name', 'ip_address',
+        'date'
+    )
+    # Columns read to serialize each field of `ReviewSerializer`, so that
+    # `?fields=` and `?exclude=` also trim the query.
+    field_columns = {
+        'id': ('id',),
+        'user': ('user',),
+        'company': ('company__name',),
+        'title': ('title',),
+        'summary': ('summary',),
+        'rating': ('rating',),
+        'ip_address': ('ip_address',),
+        'date': ('date',),
+    }
+    # Always read: the pagination cursor is made of id and date, and the
+    # related manager matches reviews to their user by user_id.
+    required_columns = ('id', 'date', 'user')
+
+    @property
+    def throttle_scope(self):
+        return self.throttle_scopes.get(self.action)
 
     def get_queryset(self):
-        if not self.request.user.is_anonymous:
-            return self.request.user.reviews.all()
+        if getattr(self, 'swagger_fake_view', False):
+            # Schema generation, possibly without a request.
+            return Review.objects.none()
+        if self.request.user.is_anonymous:
+            return None
+        return self.select_fieldset(self.request.user.reviews.all())
+
+    def get_archive_queryset(self):
+        """The user's archived reviews, see `evaluation.archive`."""
+        return self.select_fieldset(self.request.user.archived_reviews.all())
+
+    def select_fieldset(self, reviews):
+        """Read only the columns of the fields selected by `get_fieldset`."""
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return reviews.select_related('company')
+
+        if 'company' in fieldset:
+            reviews = reviews.select_related('company')
+        columns = set(self.required_columns)
+        for name in fieldset:
+            columns.update(self.field_columns[name])
+        return reviews.only(*columns)
+
+    def parse_field_names(self, param):
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = sorted(set(names).difference(self.field_columns))
+        if unknown:
+            raise ValidationError({
+                param: ['Unknown fields: %s.' % ', '.join(unknown)]
+            })
+        return names
+
+    def get_fieldset(self):
+        """
+        Names of the `ReviewSerializer` fields selected by `?fields=` and
+        `?exclude=` on `list` and `retrieve`, or None to return all of them.
+        """
+        if getattr(self, 'swagger_fake_view', False):
+            return None
+        if self.action not in ('list', 'retrieve'):
+            return None
+        fields = self.parse_field_names('fields')
+        exclude = self.parse_field_names('exclude')
+        if fields is None and exclude is None:
+            return None
+        return [
+            name for name in self.field_columns
+            if (fields is None or name in fields)
+            and name not in (exclude or ())
+        ]
+
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            kwargs['fields'] = fieldset
+        return super().get_serializer(*args, **kwargs)
 
     def get_serializer_class(self):
-        if self.action == 'create':
+        if self.action in ('create', 'bulk'):
             return ReviewWriteSerializer
         return ReviewSerializer
 
     def get_client_ip(self, request):
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
+        return services.get_client_ip(request)
+
+    def set_validators(self, response, etag, last_modified):
+        response['ETag'] = quote_etag(etag)
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Clients may keep the response but must revalidate it before use.
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+    @swagger_auto_schema(manual_parameters=FIELDSET_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        user_id = request.user.pk
+        use_cache = caching.list_cache_enabled()
+
+        cached = caching.get_cached_list(request, user_id) if use_cache else None
+        if cached is not None:
+            etag, last_modified, data = cached
         else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+            etag, last_modified = caching.list_validators(
+                request, self.get_queryset()
+            )
+            data = None
+
+        not_modified = get_conditional_response(
+            request, etag=quote_etag(etag), last_modified=last_modified
+        )
+        if not_modified is not None:
+            return self.set_validators(not_modified, etag, last_modified)
+
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            if use_cache:
+                caching.set_cached_list(
+                    request, user_id, etag, last_modified, data
+                )
+
+        return self.set_validators(Response(data), etag, last_modified)
+
+    @swagger_auto_schema(manual_parameters=FIELDSET_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        archived = None
+        try:
+            stamp = self.get_queryset().filter(
+                **lookup
+            ).values_list('id', 'date').first()
+            if stamp is None:
+                archived = self.get_archive_queryset().filter(
+                    **lookup
+                ).first()
+        except (TypeError, ValueError):
+            stamp = None
+        if archived is not None:
+            stamp = (archived.id, archived.date)
+        if stamp is None:
+            # Let the regular lookup produce the 404.
+            return super().retrieve(request, *args, **kwargs)
+
+        etag, last_modified = caching.detail_validators(request, *stamp)
+        not_modified = get_conditional_response(
+            request, etag=quote_etag(etag), last_modified=last_modified
+        )
+        if not_modified is not None:
+            return self.set_validators(not_modified, etag, last_modified)
+
+        if archived is not None:
+            response = Response(self.get_serializer(archived).data)
+        else:
+            response = super().retrieve(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
 
     def perform_create(self, serializer):
-        review = Review(**serializer.data)
-        review.user = self.request.user
-        review.ip_address = self.get_client_ip(self.request)
-        review.save()
-        return review
+        review = services.build_review(
+            self.request.user,
+            self.get_client_ip(self.request),
+            serializer.validated_data
+        )
+        return services.create_unique_review(review)
 
-    @swagger_auto_schema(responses={200: ReviewSerializer()})
+    @swagger_auto_schema(responses={
+        200: ReviewSerializer(),
+        202: IngestTicketSerializer()
+    })
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        review = self.perform_create(serializer)
+
+        if ingest.is_enabled():
+            ticket = ingest.enqueue(
+                request.user,
+                self.get_client_ip(request),
+                serializer.validated_data
+            )
+            return Response(
+                {
+                    'ticket': ticket,
+                    'status': IngestTicket.PENDING,
+                    'review': None,
+                    'errors': None
+                },
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': reverse(
+                    'evaluation:reviews-ticket', args=[ticket]
+                )}
+            )
+
+        review, created = self.perform_create(serializer)
+        if not created:
+            if settings.REVIEWS_DUPLICATES['POLICY'] == 'reject':
+                return Response(
+                    {'detail': services.DUPLICATE_REVIEW, 'review': review.pk},
+                    status=status.HTTP_409_CONFLICT
+                )
+            return Response(ReviewSerializer(review).data)
         headers = self.get_success_headers(serializer.data)
 
         return Response(
@@ -48,3 +282,243 @@ class ReviewViewSet(mixins.CreateModelMixin,
             status=status.HTTP_201_CREATED,
             headers=headers
         )
+
+    @swagger_auto_schema(
+        request_body=ReviewWriteSerializer(many=True),
+        responses={201: ReviewBulkResultSerializer()}
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        """
+        Create many reviews at once. Valid items are stored in a single
+        transaction; invalid ones are reported by their index in `errors`.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({
+                'non_field_errors': ['Expected a list of reviews.']
+            })
+        if len(items) > settings.REVIEWS_BULK_MAX_ITEMS:
+            raise ValidationError({
+                'non_field_errors': [
+                    'Ensure this list has no more than %d reviews.'
+                    % settings.REVIEWS_BULK_MAX_ITEMS
+                ]
+            })
+
+        user = request.user
+        ip_address = self.get_client_ip(request)
+        valid = []
+        errors = []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, services.build_review(
+                    user, ip_address, serializer.validated_data
+                )))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        reject = settings.REVIEWS_DUPLICATES['POLICY'] == 'reject'
+        reviews = []
+        with transaction.atomic():
+            duplicates = services.find_duplicates(
+                [review for _, review in valid]
+            )
+            for (index, review), duplicate in zip(valid, duplicates):
+                if duplicate is None:
+                    reviews.append(review)
+                elif reject:
+                    errors.append({'index': index, 'errors': {
+                        'non_field_errors': [services.DUPLICATE_REVIEW]
+                    }})
+            services.bulk_create_reviews(reviews)
+        errors.sort(key=lambda error: error['index'])
+
+        return Response(
+            ReviewBulkResultSerializer({
+                'created': len(reviews),
+                'errors': errors
+            }).data,
+            status=(
+                status.HTTP_201_CREATED if reviews or not errors
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
+    def get_export_since(self, request):
+        value = request.query_params.get('since')
+        if not value:
+            return None
+        try:
+            since = parse_datetime(value)
+            if since is None:
+                date = parse_date(value)
+                if date is not None:
+                    since = datetime.datetime.combine(date, datetime.time())
+        except ValueError:
+            since = None
+        if since is None:
+            raise ValidationError({
+                'since': ['Enter a valid ISO 8601 date or date and time.']
+            })
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    @swagger_auto_schema(
+        manual_parameters=[QueryParameter(
+            'since',
+            'Only export reviews stored or changed at or after this ISO 8601 '
+            'date or date and time.'
+        )],
+        responses={200: 'One review per line, oldest first.'}
+    )
+    @action(detail=False, renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request, *args, **kwargs):
+        """
+        Stream all of the user's reviews, archived ones included, as NDJSON
+        (`?format=ndjson`, the default) or CSV (`?format=csv`), ordered by
+        date. Rows are read in chunks while the response is written, so
+        memory use does not grow with the number of reviews.
+        """
+        since = self.get_export_since(request)
+        sources = []
+        for queryset in (self.get_queryset(), self.get_archive_queryset()):
+            if since is not None:
+                queryset = queryset.filter(date__gte=since)
+            sources.append(queryset.order_by('date', 'id').values_list(
+                *self.export_columns
+            ).iterator(chunk_size=settings.REVIEWS_EXPORT_CHUNK_SIZE))
+        # Both sources are ordered by (date, id): merge them lazily.
+        date_index = self.export_columns.index('date')
+        rows = self.export_rows(heapq.merge(
+            *sources, key=operator.itemgetter(date_index, 0)
+        ))
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(rows, self.export_fields),
+            content_type='%s; charset=%s' % (
+                renderer.media_type, renderer.charset
+            )
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="reviews.%s"' % renderer.format
+        )
+        return response
+
+    def export_rows(self, values):
+        for row in values:
+            row = dict(zip(self.export_fields, row))
+            # Summaries are decompressed as they are written out.
+            row['summary'] = fields.text(row['summary'])
+            yield row
+
+    @swagger_auto_schema(responses={
+        200: IngestTicketSerializer(), 404: 'Unknown ticket.'
+    })
+    @action(detail=False, url_path=r'tickets/(?P<ticket>[0-9a-f]{32})')
+    def ticket(self, request, ticket, *args, **kwargs):
+        """
+        Status of a review accepted for asynchronous ingestion: `pending`
+        while it waits in the spool, then `created` or `rejected` once the
+        queue worker stored it. Unknown tickets, and those of other users,
+        are not found.
+        """
+        tickets = IngestTicket.objects.filter(ticket=ticket, user=request.user)
+        instance = tickets.first()
+        if instance is None:
+            if ingest.spooled_ticket_user(ticket) == request.user.pk:
+                return Response({
+                    'ticket': ticket,
+                    'status': IngestTicket.PENDING,
+                    'review': None,
+                    'errors': None
+                })
+            # The worker stores a ticket before removing its marker, so one
+            # that left the spool since the first query is stored now.
+            instance = tickets.first()
+            if instance is None:
+                raise Http404
+        return Response(IngestTicketSerializer(instance).data)
+
+
+class TokenObtainPairView(jwt_views.TokenObtainPairView):
+    throttle_scope = 'token'
+    throttle_classes = [UsernameTokenBucketThrottle, IPTokenBucketThrottle]
+
+
+class TokenRefreshView(jwt_views.TokenRefreshView):
+    throttle_scope = 'token'
+    throttle_classes = [IPTokenBucketThrottle]
+
+
+class TokenVerifyView(jwt_views.TokenVerifyView):
+    throttle_scope = 'token'
+    throttle_classes = [IPTokenBucketThrottle]
+
+
+class CompanyRatingView(generics.RetrieveAPIView):
+    """
+    Rating count, sum, average and 1-5 star histogram of a company, read
+    from its maintained summary row.
+    """
+    permission_classes = [IsAuthenticated]
+    queryset = CompanyRatingSummary.objects.select_related('company')
+    serializer_class = CompanyRatingSerializer
+    lookup_field = 'company__name'
+    lookup_url_kwarg = 'name'
+
+    def get_object(self):
+        # Resolve the name the way it is when reviews are posted.
+        name = companies.normalize_name(self.kwargs[self.lookup_url_kwarg])
+        summary = generics.get_object_or_404(
+            self.get_queryset(), **{self.lookup_field: name}
+        )
+        self.check_object_permissions(self.request, summary)
+        return summary
+
+
+def metrics_view(request):
+    """Prometheus exposition of the `evaluation.metrics` metrics."""
+    if not metrics.is_enabled():
+        raise Http404
+    if not metrics.is_authorized(request):
+        raise PermissionDenied
+    content, content_type = metrics.render()
+    return HttpResponse(content, content_type=content_type)
+
+
+def schema_document_view(request):
+    """
+    OpenAPI schema of the API from `evaluation.schema`, validated by an ETag
+    and cacheable for `REVIEWS_API_SCHEMA['MAX_AGE']` seconds when it is
+    precomputed.
+    """
+    # evaluation.schema imports drf_yasg, only needed once the docs are read.
+    from evaluation import schema
+
+    document = schema.get_document()
+    etag = quote_etag(document.etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(
+            document.content, content_type='application/json'
+        )
+    response['ETag'] = etag
+    if settings.REVIEWS_API_SCHEMA['PRECOMPUTED']:
+        patch_cache_control(
+            response, public=True,
+            max_age=settings.REVIEWS_API_SCHEMA['MAX_AGE']
+        )
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+def docs_view(request, *args, **kwargs):
+    """Swagger UI of the API, showing the schema of `schema_document_view`."""
+    from evaluation import schema
+
+    return schema.ui_view()(request, *args, **kwargs)